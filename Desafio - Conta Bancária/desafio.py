@@ -1,3 +1,7 @@
+import argparse
+import math
+import sys
+
 # Definindo o menu fora do loop para clareza
 MENU = """
 [d] Depositar
@@ -7,30 +11,54 @@ MENU = """
 
 => """
 
+MENSAGENS_FALHA = {
+    "saldo_insuficiente": "\n@@@ Operação falhou! Você não tem saldo suficiente. @@@",
+    "limite_excedido": "\n@@@ Operação falhou! O valor do saque excede o limite. @@@",
+    "saques_excedidos": "\n@@@ Operação falhou! Número máximo de saques excedido. @@@",
+    "valor_invalido": "\n@@@ Operação falhou! O valor informado é inválido. @@@",
+}
+
+def validar_deposito(valor):
+    """Devolve o código da falha do depósito (chave de MENSAGENS_FALHA), ou None se ele pode ser feito."""
+    if not math.isfinite(valor) or valor <= 0: # NaN e infinito também são recusados
+        return "valor_invalido"
+    return None
+
 def depositar(saldo, valor, extrato, /): # O '/' indica que parâmetros anteriores a ele são somente posicionais
     """Realiza a operação de depósito."""
-    if valor > 0:
+    falha = validar_deposito(valor)
+
+    if falha:
+        print(MENSAGENS_FALHA[falha])
+    else:
         saldo += valor
         extrato += f"Depósito:\tR$ {valor:.2f}\n" # Adicionando uma tabulação para alinhamento
         print("\n=== Depósito realizado com sucesso! ===")
-    else:
-        print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
     return saldo, extrato
 
-def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques): # O '*' indica que parâmetros posteriores a ele são somente nomeados
-    """Realiza a operação de saque."""
+def validar_saque(*, saldo, valor, limite, numero_saques, limite_saques):
+    """Devolve o código da falha do saque (chave de MENSAGENS_FALHA), ou None se ele pode ser feito."""
     excedeu_saldo = valor > saldo
     excedeu_limite = valor > limite
     excedeu_saques = numero_saques >= limite_saques
 
     if excedeu_saldo:
-        print("\n@@@ Operação falhou! Você não tem saldo suficiente. @@@")
+        return "saldo_insuficiente"
     elif excedeu_limite:
-        print("\n@@@ Operação falhou! O valor do saque excede o limite. @@@")
+        return "limite_excedido"
     elif excedeu_saques:
-        print("\n@@@ Operação falhou! Número máximo de saques excedido. @@@")
-    elif valor <= 0: # Adicionado para tratar valor negativo ou zero
-        print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+        return "saques_excedidos"
+    elif not math.isfinite(valor) or valor <= 0: # Valor negativo, zero, NaN ou infinito
+        return "valor_invalido"
+    return None
+
+def sacar(*, saldo, valor, extrato, limite, numero_saques, limite_saques): # O '*' indica que parâmetros posteriores a ele são somente nomeados
+    """Realiza a operação de saque."""
+    falha = validar_saque(saldo=saldo, valor=valor, limite=limite, numero_saques=numero_saques,
+                          limite_saques=limite_saques)
+
+    if falha:
+        print(MENSAGENS_FALHA[falha])
     else:
         saldo -= valor
         extrato += f"Saque:\t\tR$ {valor:.2f}\n" # Adicionando tabulações
@@ -46,6 +74,80 @@ def exibir_extrato(saldo, extrato, /):
     print(f"\nSaldo:\t\tR$ {saldo:.2f}") # Alinhamento para o saldo
     print("==========================================")
 
+CAMPOS_ROTEIRO = ("linha", "comando", "resultado", "valor")
+LINHAS_POR_ESCRITA = 4096
+
+# Comandos do roteiro: cada um recebe o estado da conta e os argumentos da linha. Como há
+# uma única conta, o CPF e a conta da forma d|s <cpf> <conta> <valor> são ignorados.
+def roteiro_deposito(estado, *argumentos):
+    valor = float(argumentos[-1])
+    falha = validar_deposito(valor)
+    if falha:
+        return falha
+    estado["saldo"] += valor
+    return "deposito_realizado"
+
+def roteiro_saque(estado, *argumentos):
+    valor = float(argumentos[-1])
+    falha = validar_saque(saldo=estado["saldo"], valor=valor, limite=estado["limite"],
+                          numero_saques=estado["numero_saques"], limite_saques=estado["limite_saques"])
+    if falha:
+        return falha
+    estado["saldo"] -= valor
+    estado["numero_saques"] += 1
+    return "saque_realizado"
+
+def roteiro_extrato(estado, *argumentos):
+    return "ok"
+
+# comando -> (função, quantidades de argumentos aceitas)
+COMANDOS_ROTEIRO = {
+    "d": (roteiro_deposito, (1, 3)),
+    "s": (roteiro_saque, (1, 3)),
+    "e": (roteiro_extrato, (0, 2)),
+}
+
+def executar_roteiro(entrada, saida, limite=500, limite_saques=3):
+    """Executa comandos de texto, um por linha, sem menu nem prompts; devolve quantos executou.
+
+    Comandos: d <valor>, s <valor>, e e q (encerra); d|s <cpf> <conta> <valor> e e <cpf> <conta>
+    também são aceitos. A saída é TSV (CAMPOS_ROTEIRO), uma linha por comando, com o saldo
+    após a operação.
+    """
+    estado = {"saldo": 0, "numero_saques": 0, "limite": limite, "limite_saques": limite_saques}
+    pendentes = ["\t".join(CAMPOS_ROTEIRO) + "\n"]
+    executados = 0
+
+    for numero_linha, linha in enumerate(entrada, 1):
+        argumentos = linha.split()
+        if not argumentos or argumentos[0].startswith("#"):
+            continue
+        comando = argumentos.pop(0)
+        if comando == "q":
+            break
+
+        despacho = COMANDOS_ROTEIRO.get(comando)
+        if despacho is None:
+            resultado = "comando_invalido"
+        else:
+            funcao, quantidades = despacho
+            try:
+                if len(argumentos) not in quantidades:
+                    raise ValueError
+                resultado = funcao(estado, *argumentos)
+            except ValueError:
+                resultado = "argumentos_invalidos"
+        pendentes.append(f"{numero_linha}\t{comando}\t{resultado}\t{estado['saldo']:.2f}\n")
+        executados += 1
+
+        if len(pendentes) >= LINHAS_POR_ESCRITA:
+            saida.writelines(pendentes)
+            pendentes.clear()
+
+    saida.writelines(pendentes)
+    saida.flush()
+    return executados
+
 def main():
     """Função principal que gerencia o fluxo do sistema bancário."""
     saldo = 0
@@ -88,6 +190,20 @@ def main():
         else:
             print("\n@@@ Operação inválida, por favor selecione novamente a operação desejada. @@@")
 
+def argumentos():
+    parser = argparse.ArgumentParser(description="Sistema bancário (uma conta)")
+    parser.add_argument("--roteiro", metavar="ARQUIVO",
+                        help="executa os comandos do arquivo (- para a entrada padrão) em vez de abrir o menu")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="resultados do roteiro (padrão: saída padrão)")
+    return parser.parse_args()
+
 # Para garantir que a função main() seja chamada quando o script for executado
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = argumentos()
+    if args.roteiro:
+        entrada = sys.stdin if args.roteiro == "-" else open(args.roteiro, encoding="utf-8")
+        saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+        with entrada, saida:
+            executar_roteiro(entrada, saida)
+    else:
+        main()
\ No newline at end of file
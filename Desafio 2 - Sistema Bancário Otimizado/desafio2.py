@@ -1,7 +1,79 @@
+import csv
+import argparse
+import shlex
+import sys
 import textwrap
-
-def menu():
-    menu_text = """\n
+import time
+from datetime import date
+from itertools import count, islice
+
+AGENCIA = "0001"
+TAMANHO_PAGINA_EXTRATO = 50
+TAMANHO_PAGINA_LISTAGEM = 50
+TIPO_CONTA = "corrente"
+LIMITE_SAQUE = 500
+LIMITE_SAQUES = 3
+# Maior valor aceito em depósitos e saques (o mesmo teto do script POO)
+VALOR_MAXIMO = 2**53 / 100
+
+# Limites de saque por tipo de conta; None desliga o limite. O valor vale para as últimas 24 horas
+# corridas (janela em fatias de uma hora) e a velocidade, para o último minuto (token bucket).
+# A velocidade vem desligada: abaixo de LIMITE_SAQUES ela tornaria o limite diário inalcançável.
+POLITICAS_LIMITES = {
+    "corrente": {"valor_por_24h": 1500.0, "saques_por_minuto": None, "fatias_janela": 24},
+}
+
+# O extrato guarda tuplas (tipo, valor); o texto só é montado quando o extrato é exibido
+ROTULOS_EXTRATO = {"Depósito": "Depósito:\t", "Saque": "Saque:\t\t"}
+
+# Códigos devolvidos por depositar/sacar; o texto de cada um só é montado pelo notificador de console
+DEPOSITO_REALIZADO = "deposito_realizado"
+SAQUE_REALIZADO = "saque_realizado"
+SALDO_INSUFICIENTE = "saldo_insuficiente"
+LIMITE_EXCEDIDO = "limite_excedido"
+SAQUES_EXCEDIDOS = "saques_excedidos"
+VALOR_DIARIO_EXCEDIDO = "valor_diario_excedido"
+VELOCIDADE_EXCEDIDA = "velocidade_excedida"
+VALOR_INVALIDO = "valor_invalido"
+SUCESSOS = {DEPOSITO_REALIZADO, SAQUE_REALIZADO}
+
+MENSAGENS = {
+    DEPOSITO_REALIZADO: "\n=== Depósito realizado com sucesso! ===",
+    SAQUE_REALIZADO: "\n=== Saque realizado com sucesso! ===",
+    SALDO_INSUFICIENTE: "\n@@@ Operação falhou! Você não tem saldo suficiente. @@@",
+    LIMITE_EXCEDIDO: "\n@@@ Operação falhou! O valor do saque excede o limite (R$ {limite:.2f}). @@@",
+    SAQUES_EXCEDIDOS: "\n@@@ Operação falhou! Número máximo de saques diários ({limite_saques}) excedido para esta conta. @@@",
+    VALOR_DIARIO_EXCEDIDO: "\n@@@ Operação falhou! O total sacado nas últimas 24 horas excede o limite (R$ {limite:.2f}). @@@",
+    VELOCIDADE_EXCEDIDA: "\n@@@ Operação falhou! Limite de {limite} saques por minuto atingido; aguarde. @@@",
+    VALOR_INVALIDO: "\n@@@ Operação falhou! O valor informado é inválido. @@@",
+}
+MENSAGENS_POR_ESCRITA = 256
+
+# Modelos das listagens, já sem a indentação (dedent feito uma vez, na carga do módulo)
+MODELO_CONTA = "-" * 40 + "\n" + textwrap.dedent("""\
+    Agência:\t{agencia}
+    C/C:\t\t{numero_conta}
+    Titular:\t{nome}
+    CPF Titular:\t{cpf}
+    Saldo:\t\tR$ {saldo:.2f}
+
+""")
+MODELO_USUARIO = "-" * 40 + "\n" + textwrap.dedent("""\
+    Nome:\t\t{nome}
+    CPF:\t\t{cpf}
+    Data Nasc.:\t{data_nascimento}
+    Endereço:\t{endereco}
+
+""")
+
+ORDENS_CONTAS = {
+    "agencia": lambda conta: (conta["agencia"], conta["numero_conta"]),
+    "titular": lambda conta: (conta["usuario"]["nome"], conta["agencia"], conta["numero_conta"]),
+    "saldo": lambda conta: (conta["saldo"], conta["agencia"], conta["numero_conta"]),
+}
+
+# Texto do menu já sem indentação (dedent feito uma vez, na carga do módulo)
+MENU = textwrap.dedent("""\n
     ================ MENU ================
     [d]\tDepositar
     [s]\tSacar
@@ -10,9 +82,12 @@ def menu():
     [nc]\tNova conta
     [lc]\tListar contas
     [lu]\tListar usuários
+    [iu]\tImportar usuários
     [q]\tSair
-    => """
-    return input(textwrap.dedent(menu_text))
+    => """)
+
+def menu():
+    return input(MENU)
 
 # --- Funções Auxiliares de Validação de Entrada ---
 
@@ -38,42 +113,190 @@ def ler_numero_int(mensagem):
         except ValueError:
             print("\n@@@ Operação falhou! Entrada inválida. Digite um número inteiro. @@@")
 
+# --- Notificação dos resultados ---
+
+mensagens_pendentes = []
+
+def notificador_console(codigo, detalhes):
+    # Acumula as mensagens; a escrita é feita em bloco por descarregar_mensagens
+    mensagens_pendentes.append(MENSAGENS[codigo].format(**detalhes) + "\n")
+    if len(mensagens_pendentes) >= MENSAGENS_POR_ESCRITA:
+        descarregar_mensagens()
+
+def notificador_nulo(codigo, detalhes):
+    pass
+
+notificador = notificador_console
+
+def definir_notificador(funcao):
+    global notificador
+    descarregar_mensagens()
+    anterior, notificador = notificador, funcao
+    return anterior
+
+def descarregar_mensagens(saida=None):
+    if mensagens_pendentes:
+        saida = saida or sys.stdout
+        saida.write("".join(mensagens_pendentes))
+        saida.flush()
+        mensagens_pendentes.clear()
+
+def notificar(codigo, **detalhes):
+    notificador(codigo, detalhes)
+    return codigo
+
 # --- Funções para operações bancárias ---
 
 def depositar(conta, valor, /):
-    if valor > 0:
+    if 0 < valor <= VALOR_MAXIMO: # também recusa NaN e infinito
         conta["saldo"] += valor
-        conta["extrato"] += f"Depósito:\tR$ {valor:.2f}\n"
-        print("\n=== Depósito realizado com sucesso! ===")
+        conta["extrato"].append(("Depósito", valor))
+        return notificar(DEPOSITO_REALIZADO)
     else:
         # Esta validação já é feita em ler_valor_float, mas mantida por redundância ou clareza.
-        print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+        return notificar(VALOR_INVALIDO)
+
+# O contador de saques guarda só o dia corrente; na virada do dia ele recomeça do zero (O(1), sem varreduras)
+def contar_saques_hoje(conta):
+    saques_hoje = conta["saques_hoje"]
+    return saques_hoje["quantidade"] if saques_hoje["dia"] == date.today() else 0
+
+def registrar_saque_hoje(conta):
+    saques_hoje = conta["saques_hoje"]
+    hoje = date.today()
+    if saques_hoje["dia"] != hoje:
+        saques_hoje["dia"] = hoje
+        saques_hoje["quantidade"] = 0
+    saques_hoje["quantidade"] += 1
+
+# Janela deslizante: anel de fatias de tempo; cada saque só zera as fatias vencidas desde o anterior.
+# Um valor conta por pelo menos `duracao` segundos e no máximo uma fatia a mais (nunca subestima).
+def nova_janela(fatias, duracao=86_400.0):
+    return {"largura": duracao / fatias, "fatias": [0] * (fatias + 1), "fatia": None, "total": 0}
+
+def avancar_janela(janela, agora):
+    fatia = int(agora // janela["largura"])
+    fatias = janela["fatias"]
+    if janela["fatia"] is None or fatia - janela["fatia"] >= len(fatias):
+        fatias[:] = [0] * len(fatias)
+        janela["total"] = 0
+    elif fatia > janela["fatia"]:
+        for vencida in range(janela["fatia"] + 1, fatia + 1):
+            janela["total"] -= fatias[vencida % len(fatias)]
+            fatias[vencida % len(fatias)] = 0
+    else:
+        return # relógio parado ou voltando: continua na fatia atual
+    janela["fatia"] = fatia
+
+def adicionar_janela(janela, valor, agora):
+    avancar_janela(janela, agora)
+    janela["fatias"][janela["fatia"] % len(janela["fatias"])] += valor
+    janela["total"] += valor
+
+# Token bucket: até `capacidade` saques, repostos continuamente ao longo de `periodo` segundos
+def novo_balde(capacidade, periodo=60.0):
+    return {"capacidade": capacidade, "taxa": capacidade / periodo, "fichas": float(capacidade), "atualizado": None}
+
+def repor_balde(balde, agora):
+    if balde["atualizado"] is not None and agora > balde["atualizado"]:
+        balde["fichas"] = min(balde["capacidade"], balde["fichas"] + (agora - balde["atualizado"]) * balde["taxa"])
+    if balde["atualizado"] is None or agora > balde["atualizado"]:
+        balde["atualizado"] = agora
+
+def limites_conta(conta):
+    # Estado criado no primeiro saque, conforme a política do tipo da conta
+    if conta.get("limites") is None:
+        politica = POLITICAS_LIMITES[conta.get("tipo", TIPO_CONTA)]
+        conta["limites"] = {
+            "politica": politica,
+            "janela": nova_janela(politica["fatias_janela"]) if politica["valor_por_24h"] else None,
+            "balde": novo_balde(politica["saques_por_minuto"]) if politica["saques_por_minuto"] else None,
+        }
+    return conta["limites"]
+
+def verificar_limites(limites, valor, agora):
+    # Código de falha com os detalhes da mensagem, ou None se o saque cabe nos limites
+    politica, janela, balde = limites["politica"], limites["janela"], limites["balde"]
+    if balde:
+        repor_balde(balde, agora)
+        if balde["fichas"] < 1:
+            return VELOCIDADE_EXCEDIDA, {"limite": politica["saques_por_minuto"]}
+    if janela:
+        avancar_janela(janela, agora)
+        if janela["total"] + round(valor * 100) > round(politica["valor_por_24h"] * 100):
+            return VALOR_DIARIO_EXCEDIDO, {"limite": politica["valor_por_24h"]}
+    return None
+
+def registrar_limites(limites, valor, agora):
+    if limites["janela"]:
+        adicionar_janela(limites["janela"], round(valor * 100), agora)
+    if limites["balde"]:
+        limites["balde"]["fichas"] = max(0.0, limites["balde"]["fichas"] - 1)
 
 def sacar(*, conta, valor, limite, limite_saques):
     excedeu_saldo = valor > conta["saldo"]
     excedeu_limite = valor > limite
-    excedeu_saques = conta["numero_saques_hoje"] >= limite_saques
+    excedeu_saques = contar_saques_hoje(conta) >= limite_saques
 
     if excedeu_saldo:
-        print("\n@@@ Operação falhou! Você não tem saldo suficiente. @@@")
+        return notificar(SALDO_INSUFICIENTE)
     elif excedeu_limite:
-        print("\n@@@ Operação falhou! O valor do saque excede o limite (R$ %.2f). @@@" % limite)
+        return notificar(LIMITE_EXCEDIDO, limite=limite)
     elif excedeu_saques:
-        print(f"\n@@@ Operação falhou! Número máximo de saques diários ({limite_saques}) excedido para esta conta. @@@")
-    elif valor > 0:
+        return notificar(SAQUES_EXCEDIDOS, limite_saques=limite_saques)
+    elif 0 < valor <= VALOR_MAXIMO:
+        agora = time.time()
+        limites = limites_conta(conta)
+        falha = verificar_limites(limites, valor, agora)
+        if falha:
+            codigo, detalhes = falha
+            return notificar(codigo, **detalhes)
         conta["saldo"] -= valor
-        conta["extrato"] += f"Saque:\t\tR$ {valor:.2f}\n"
-        conta["numero_saques_hoje"] += 1
-        print("\n=== Saque realizado com sucesso! ===")
+        conta["extrato"].append(("Saque", valor))
+        registrar_saque_hoje(conta)
+        registrar_limites(limites, valor, agora)
+        return notificar(SAQUE_REALIZADO)
     else:
         # Esta validação já é feita em ler_valor_float, mas mantida por redundância ou clareza.
-        print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
+        return notificar(VALOR_INVALIDO)
+
+def linhas_extrato(conta, cursor=0, tamanho_pagina=None):
+    """Gera as linhas de uma página do extrato a partir do cursor (índice da movimentação)."""
+    extrato = conta["extrato"]
+    fim = len(extrato) if tamanho_pagina is None else min(len(extrato), cursor + tamanho_pagina)
+
+    if cursor == 0:
+        yield "\n================ EXTRATO ================\n"
+        if not extrato:
+            yield "Não foram realizadas movimentações.\n"
+    for indice in range(cursor, fim):
+        tipo, valor = extrato[indice]
+        yield f"{ROTULOS_EXTRATO[tipo]}R$ {valor:.2f}\n"
+    if fim == len(extrato):
+        yield f"\nSaldo:\t\tR$ {conta['saldo']:.2f}\n"
+        yield "==========================================\n"
+
+def escrever_linhas(linhas, saida=None, linhas_por_escrita=1000):
+    # Uma escrita por bloco de linhas, em vez de um print por linha
+    saida = saida or sys.stdout
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= linhas_por_escrita:
+            saida.write("".join(bloco))
+            bloco.clear()
+    if bloco:
+        saida.write("".join(bloco))
 
 def exibir_extrato(conta, /):
-    print("\n================ EXTRATO ================")
-    print("Não foram realizadas movimentações." if not conta["extrato"] else conta["extrato"])
-    print(f"\nSaldo:\t\tR$ {conta['saldo']:.2f}")
-    print("==========================================")
+    cursor = 0
+    while True:
+        escrever_linhas(linhas_extrato(conta, cursor, TAMANHO_PAGINA_EXTRATO))
+        cursor += TAMANHO_PAGINA_EXTRATO
+        if cursor >= len(conta["extrato"]):
+            break
+        if input("\n[Enter] Próxima página | [q] Voltar ao menu: ").strip() == "q":
+            break
 
 # --- Funções para Gerenciamento de Usuários e Contas ---
 
@@ -95,16 +318,63 @@ def criar_usuario(usuarios):
     data_nascimento = input("Informe a data de nascimento (dd-mm-aaaa): ")
     endereco = input("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
 
-    usuarios.append({"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco})
+    usuarios[cpf] = {"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco}
     print("=== Usuário criado com sucesso! ===")
 
+def cpf_valido(cpf):
+    # Formato (11 dígitos, não todos iguais) e os dois dígitos verificadores
+    if len(cpf) != 11 or not (cpf.isascii() and cpf.isdigit()) or cpf == cpf[0] * 11:
+        return False
+    digitos = [int(digito) for digito in cpf]
+    for posicao in (9, 10):
+        soma = sum(digito * peso for digito, peso in zip(digitos, range(posicao + 1, 1, -1)))
+        if soma * 10 % 11 % 10 != digitos[posicao]:
+            return False
+    return True
+
+def importar_usuarios(caminho, usuarios, rejeitados=None):
+    """Importa usuários de um CSV (cpf, nome, data_nascimento, endereco), linha a linha.
+
+    CPFs inválidos ou repetidos (no arquivo ou já cadastrados) são recusados; a checagem de
+    repetição é feita pelo próprio dicionário de usuários. Devolve (importados, recusas).
+    """
+    importados = 0
+    recusas = []
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(csv.DictReader(arquivo), 2):
+            cpf = (linha.get("cpf") or "").strip().replace(".", "").replace("-", "")
+            if not cpf_valido(cpf):
+                recusas.append((numero, cpf, "cpf inválido"))
+            elif cpf in usuarios:
+                recusas.append((numero, cpf, "cpf já cadastrado"))
+            else:
+                usuarios[cpf] = {"nome": linha.get("nome") or "", "data_nascimento": linha.get("data_nascimento") or "",
+                                 "cpf": cpf, "endereco": linha.get("endereco") or ""}
+                importados += 1
+
+    if rejeitados:
+        with open(rejeitados, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["linha", "cpf", "motivo"])
+            escritor.writerows(recusas)
+    return importados, recusas
+
+# Uma sequência por agência: next() de itertools.count é atômico sob o GIL, sem trava,
+# e não depende do tamanho de contas (que muda com exclusões e não existe entre processos)
+sequencias_contas = {}
+
+def proximo_numero_conta(agencia=AGENCIA):
+    sequencia = sequencias_contas.get(agencia)
+    if sequencia is None:
+        sequencia = sequencias_contas.setdefault(agencia, count(1))
+    return next(sequencia)
+
+# usuarios e contas são dicionários indexados (CPF e (agência, número)), então as buscas são O(1)
 def filtrar_usuario(cpf, usuarios):
-    usuarios_filtrados = [usuario for usuario in usuarios if usuario["cpf"] == cpf]
-    return usuarios_filtrados[0] if usuarios_filtrados else None
+    return usuarios.get(cpf)
 
-def filtrar_conta(numero_conta, contas):
-    contas_filtradas = [conta for conta in contas if conta["numero_conta"] == numero_conta]
-    return contas_filtradas[0] if contas_filtradas else None
+def filtrar_conta(numero_conta, contas, agencia=AGENCIA):
+    return contas.get((agencia, numero_conta))
 
 def criar_conta(agencia, numero_conta, usuarios):
     cpf = input("Informe o CPF do usuário para vincular a conta: ")
@@ -114,62 +384,219 @@ def criar_conta(agencia, numero_conta, usuarios):
         print("\n@@@ Usuário não encontrado! Fluxo de criação de conta encerrado. Retornando ao menu. @@@")
         return None # Retorna None para indicar que a conta não foi criada
 
-    conta = {
+    conta = nova_conta(agencia, numero_conta, usuario)
+    print("\n=== Conta criada com sucesso! ===")
+    return conta
+
+def nova_conta(agencia, numero_conta, usuario):
+    return {
         "agencia": agencia,
         "numero_conta": numero_conta,
         "usuario": usuario,
         "saldo": 0.0,
-        "extrato": "",
-        "numero_saques_hoje": 0
+        "extrato": [],
+        "saques_hoje": {"dia": None, "quantidade": 0},
+        "tipo": TIPO_CONTA,
+        "limites": None, # criado no primeiro saque (limites_conta)
     }
-    print("\n=== Conta criada com sucesso! ===")
-    return conta
+
+def paginar(itens, tamanho_pagina=TAMANHO_PAGINA_LISTAGEM, filtro=None, chave=None, decrescente=False):
+    """Gera as páginas (listas) da listagem, uma por vez, até a última.
+
+    O próprio gerador é a continuação: cada página segue de onde a anterior parou, em
+    O(tamanho_pagina), sem voltar ao início da coleção. Sem chave, a ordem é a de cadastro;
+    com chave, a coleção é ordenada uma única vez, quando a listagem começa.
+    """
+    if filtro is not None:
+        itens = filter(filtro, itens)
+    if chave is not None:
+        itens = sorted(itens, key=chave, reverse=decrescente)
+    itens = iter(itens)
+    while pagina := list(islice(itens, tamanho_pagina)):
+        yield pagina
+
+def paginas_contas(contas, tamanho_pagina=TAMANHO_PAGINA_LISTAGEM, agencia=None, titular=None,
+                   saldo_minimo=None, saldo_maximo=None, ordem=None, decrescente=False):
+    """Páginas de contas filtradas por agência, titular (trecho do nome) e faixa de saldo.
+
+    ordem: None (ordem de cadastro), "agencia", "titular" ou "saldo".
+    """
+    titular = titular.casefold() if titular else None
+
+    def filtro(conta):
+        return ((agencia is None or conta["agencia"] == agencia)
+                and (titular is None or titular in conta["usuario"]["nome"].casefold())
+                and (saldo_minimo is None or conta["saldo"] >= saldo_minimo)
+                and (saldo_maximo is None or conta["saldo"] <= saldo_maximo))
+
+    sem_filtro = agencia is None and titular is None and saldo_minimo is None and saldo_maximo is None
+    return paginar(contas.values(), tamanho_pagina, None if sem_filtro else filtro,
+                   ORDENS_CONTAS[ordem] if ordem else None, decrescente)
+
+def paginas_usuarios(usuarios, tamanho_pagina=TAMANHO_PAGINA_LISTAGEM, nome=None, ordenar=False):
+    nome = nome.casefold() if nome else None
+    filtro = (lambda usuario: nome in usuario["nome"].casefold()) if nome else None
+    chave = (lambda usuario: (usuario["nome"], usuario["cpf"])) if ordenar else None
+    return paginar(usuarios.values(), tamanho_pagina, filtro, chave)
+
+def exibir_paginas(paginas, renderizar, cabecalho, rodape, saida=None):
+    # Uma escrita por página; entre as páginas, o mesmo aviso do extrato. A página seguinte
+    # é lida antes do aviso, para saber se o rodapé já vai na atual
+    saida = saida or sys.stdout
+    pagina = next(paginas, [])
+    saida.write(cabecalho)
+    while True:
+        proxima = next(paginas, None)
+        saida.write("".join(map(renderizar, pagina)) + (rodape if proxima is None else ""))
+        if proxima is None or input("\n[Enter] Próxima página | [q] Voltar ao menu: ").strip() == "q":
+            return
+        pagina = proxima
+
+def renderizar_conta(conta):
+    usuario = conta["usuario"]
+    return MODELO_CONTA.format(agencia=conta["agencia"], numero_conta=conta["numero_conta"],
+                               nome=usuario["nome"], cpf=usuario["cpf"], saldo=conta["saldo"])
+
+def renderizar_usuario(usuario):
+    return MODELO_USUARIO.format_map(usuario)
 
 def listar_contas(contas):
     if not contas:
         print("\n@@@ Nenhuma conta cadastrada. @@@")
         return
 
-    print("\n============== CONTAS BANCÁRIAS ==============")
-    for conta in contas:
-        linha = f"""\
-            Agência:\t{conta['agencia']}
-            C/C:\t\t{conta['numero_conta']}
-            Titular:\t{conta['usuario']['nome']}
-            CPF Titular:\t{conta['usuario']['cpf']}
-            Saldo:\t\tR$ {conta['saldo']:.2f}
-            """
-        print("-" * 40)
-        print(textwrap.dedent(linha))
-    print("==============================================")
+    exibir_paginas(paginas_contas(contas), renderizar_conta,
+                   "\n============== CONTAS BANCÁRIAS ==============\n",
+                   "==============================================\n")
 
 def listar_usuarios(usuarios):
     if not usuarios:
         print("\n@@@ Nenhum usuário cadastrado. @@@")
         return
 
-    print("\n============== USUÁRIOS CADASTRADOS ==============")
-    for usuario in usuarios:
-        linha = f"""\
-            Nome:\t\t{usuario['nome']}
-            CPF:\t\t{usuario['cpf']}
-            Data Nasc.:\t{usuario['data_nascimento']}
-            Endereço:\t{usuario['endereco']}
-            """
-        print("-" * 40)
-        print(textwrap.dedent(linha))
-    print("==================================================")
-
+    exibir_paginas(paginas_usuarios(usuarios), renderizar_usuario,
+                   "\n============== USUÁRIOS CADASTRADOS ==============\n",
+                   "==================================================\n")
+
+
+# --- Modo roteiro (não interativo) ---
+
+CAMPOS_ROTEIRO = ("linha", "comando", "resultado", "valor")
+LINHAS_POR_ESCRITA = 4096
+
+def conta_do_usuario(contas, cpf, numero_conta):
+    # (conta, None) ou (None, código do erro): a conta precisa pertencer ao usuário do CPF
+    conta = filtrar_conta(int(numero_conta), contas)
+    if conta is None or conta["usuario"]["cpf"] != cpf:
+        return None, "conta_nao_encontrada"
+    return conta, None
+
+def roteiro_deposito(usuarios, contas, cpf, numero_conta, valor):
+    conta, erro = conta_do_usuario(contas, cpf, numero_conta)
+    if erro:
+        return erro, ""
+    return depositar(conta, float(valor)), f"{conta['saldo']:.2f}"
+
+def roteiro_saque(usuarios, contas, cpf, numero_conta, valor):
+    conta, erro = conta_do_usuario(contas, cpf, numero_conta)
+    if erro:
+        return erro, ""
+    codigo = sacar(conta=conta, valor=float(valor), limite=LIMITE_SAQUE, limite_saques=LIMITE_SAQUES)
+    return codigo, f"{conta['saldo']:.2f}"
+
+def roteiro_extrato(usuarios, contas, cpf, numero_conta):
+    conta, erro = conta_do_usuario(contas, cpf, numero_conta)
+    return (erro, "") if erro else ("ok", f"{conta['saldo']:.2f}")
+
+def roteiro_novo_usuario(usuarios, contas, cpf, nome, data_nascimento, endereco):
+    if not cpf.isdigit() or len(cpf) != 11:
+        return "cpf_invalido", ""
+    if cpf in usuarios:
+        return "usuario_existente", ""
+    usuarios[cpf] = {"nome": nome, "data_nascimento": data_nascimento, "cpf": cpf, "endereco": endereco}
+    return "usuario_criado", ""
+
+def roteiro_nova_conta(usuarios, contas, cpf):
+    usuario = filtrar_usuario(cpf, usuarios)
+    if not usuario:
+        return "usuario_nao_encontrado", ""
+    conta = nova_conta(AGENCIA, proximo_numero_conta(AGENCIA), usuario)
+    contas[(conta["agencia"], conta["numero_conta"])] = conta
+    return "conta_criada", str(conta["numero_conta"])
+
+# comando -> (função, quantidade de argumentos, divisão dos argumentos); nu aceita aspas (nome, endereço)
+COMANDOS_ROTEIRO = {
+    "d": (roteiro_deposito, 3, str.split),
+    "s": (roteiro_saque, 3, str.split),
+    "e": (roteiro_extrato, 2, str.split),
+    "nu": (roteiro_novo_usuario, 4, shlex.split),
+    "nc": (roteiro_nova_conta, 1, str.split),
+}
+
+def executar_roteiro(entrada, saida, usuarios=None, contas=None):
+    """Executa comandos de texto, um por linha, sem menu nem prompts; devolve quantos executou.
+
+    Comandos: d|s <cpf> <conta> <valor>, e <cpf> <conta>, nu <cpf> "<nome>" <data_nascimento>
+    "<endereço>", nc <cpf> e q (encerra). Linhas vazias e iniciadas por # são ignoradas. A saída
+    é TSV (CAMPOS_ROTEIRO), uma linha por comando; o valor é o saldo ou o número da conta criada.
+    """
+    usuarios = {} if usuarios is None else usuarios
+    contas = {} if contas is None else contas
+    pendentes = ["\t".join(CAMPOS_ROTEIRO) + "\n"]
+    executados = 0
+    anterior = definir_notificador(notificador_nulo)
+    try:
+        for numero_linha, linha in enumerate(entrada, 1):
+            partes = linha.split(None, 1)
+            if not partes or partes[0].startswith("#"):
+                continue
+            comando = partes[0]
+            if comando == "q":
+                break
+
+            despacho = COMANDOS_ROTEIRO.get(comando)
+            if despacho is None:
+                resultado, valor = "comando_invalido", ""
+            else:
+                funcao, quantidade, dividir = despacho
+                try:
+                    argumentos = dividir(partes[1]) if len(partes) > 1 else [] # shlex: aspas sem par
+                    if len(argumentos) != quantidade:
+                        raise ValueError
+                    resultado, valor = funcao(usuarios, contas, *argumentos)
+                except ValueError:
+                    resultado, valor = "argumentos_invalidos", ""
+            pendentes.append(f"{numero_linha}\t{comando}\t{resultado}\t{valor}\n")
+            executados += 1
+
+            if len(pendentes) >= LINHAS_POR_ESCRITA:
+                saida.writelines(pendentes)
+                pendentes.clear()
+    finally:
+        definir_notificador(anterior)
+    saida.writelines(pendentes)
+    saida.flush()
+    return executados
+
+def executar_roteiro_arquivo(caminho, destino=None):
+    # caminho "-" lê da entrada padrão; sem destino, os resultados vão para a saída padrão
+    entrada = sys.stdin if caminho == "-" else open(caminho, encoding="utf-8")
+    saida = open(destino, "w", encoding="utf-8") if destino else sys.stdout
+    try:
+        executar_roteiro(entrada, saida)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
 
 # --- Função principal para execução do programa ---
 def main():
-    LIMITE_SAQUES = 3
-    AGENCIA = "0001"
-
-    usuarios = []
-    contas = []
+    usuarios = {}
+    contas = {}
 
     while True:
+        descarregar_mensagens() # mensagens da operação anterior, antes do menu
         opcao = menu()
 
         if opcao == "d":
@@ -204,7 +631,7 @@ def main():
             if valor is None:
                 continue
 
-            sacar(conta=conta, valor=valor, limite=500, limite_saques=LIMITE_SAQUES)
+            sacar(conta=conta, valor=valor, limite=LIMITE_SAQUE, limite_saques=LIMITE_SAQUES)
 
         elif opcao == "e":
             numero_conta = ler_numero_int("Informe o número da conta para extrato: ")
@@ -223,11 +650,11 @@ def main():
             criar_usuario(usuarios) # A função criar_usuario já gerencia o retorno para o menu
 
         elif opcao == "nc":
-            numero_conta = len(contas) + 1
+            numero_conta = proximo_numero_conta(AGENCIA)
             conta = criar_conta(AGENCIA, numero_conta, usuarios)
 
             if conta: # Apenas adiciona se a conta foi realmente criada
-                contas.append(conta)
+                contas[(conta["agencia"], conta["numero_conta"])] = conta
 
         elif opcao == "lc":
             listar_contas(contas)
@@ -235,12 +662,33 @@ def main():
         elif opcao == "lu":
             listar_usuarios(usuarios)
 
+        elif opcao == "iu":
+            caminho = input("Informe o arquivo de usuários (.csv): ")
+            rejeitados = input("Informe o arquivo de rejeitados (.csv, vazio para não gravar): ").strip()
+            try:
+                importados, recusas = importar_usuarios(caminho, usuarios, rejeitados or None)
+            except OSError as erro:
+                print(f"\n@@@ Não foi possível importar os usuários: {erro} @@@")
+                continue
+            print(f"\n=== {importados} usuário(s) importado(s), {len(recusas)} rejeitado(s). ===")
+
         elif opcao == "q":
             break
 
         else:
             print("\n@@@ Operação inválida, por favor selecione novamente a operação desejada. @@@")
 
+def argumentos():
+    parser = argparse.ArgumentParser(description="Sistema bancário otimizado")
+    parser.add_argument("--roteiro", metavar="ARQUIVO",
+                        help="executa os comandos do arquivo (- para a entrada padrão) em vez de abrir o menu")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="resultados do roteiro (padrão: saída padrão)")
+    return parser.parse_args()
+
 # Ponto de entrada do programa
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = argumentos()
+    if args.roteiro:
+        executar_roteiro_arquivo(args.roteiro, args.saida)
+    else:
+        main()
\ No newline at end of file
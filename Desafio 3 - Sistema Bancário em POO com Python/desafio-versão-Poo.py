@@ -1,27 +1,254 @@
+import argparse
+import asyncio
+import bisect
+import contextlib
+import csv
+import json
+import mmap
+import multiprocessing
+import os
+import queue
+import shlex
+import signal
+import struct
+import sys
 import textwrap
+import threading
+import time
 from abc import ABC, abstractmethod # Usamos abstractmethod para tudo, pois abstractproperty foi depreciado
-from datetime import datetime
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from enum import Enum
+from functools import partial, wraps
+from itertools import accumulate, islice
+
+try:
+    import fcntl
+except ImportError: # sem fcntl (Windows), a reserva de blocos só é segura entre threads do mesmo processo
+    fcntl = None
+
+
+AGENCIA = "0001"
+FORMATO_DATA = "%d-%m-%Y %H:%M:%S"
+TAMANHO_PAGINA_EXTRATO = 50
+TAMANHO_PAGINA_CONTAS = 50
+TAMANHO_LOTE = 10_000
+# Maior valor aceito em uma transação: centavos exatos em float e dentro de array("q")
+VALOR_MAXIMO = 2**53 / 100
+DIRETORIO_DADOS = os.environ.get("BANCO_DADOS", "dados")
+INSTRUMENTAR = os.environ.get("BANCO_INSTRUMENTACAO") == "1"
+# Modelo compacto: clientes, contas, históricos e transações com __slots__ (sem __dict__ por instância)
+MODELO_COMPACTO = os.environ.get("BANCO_MODELO_COMPACTO", "1") != "0"
+
+# Códigos numéricos gravados na coluna de tipo do Historico (e o efeito de cada tipo no saldo)
+TIPOS_TRANSACAO = ("Deposito", "Saque", "Transferencia enviada", "Transferencia recebida")
+SINAIS_TRANSACAO = (1, -1, -1, 1)
+CODIGOS_TRANSACAO = {nome: codigo for codigo, nome in enumerate(TIPOS_TRANSACAO)}
+
+# Modelo da conta já sem indentação (dedent feito uma vez, na carga do módulo)
+MODELO_CONTA = textwrap.dedent("""\
+    Agência:\t{agencia}
+    C/C:\t\t{numero}
+    Titular:\t{titular}
+""")
+
+
+# ==================== RESULTADOS E NOTIFICAÇÕES ====================
+
+class Resultado(Enum):
+    """Código devolvido por Conta.sacar/depositar e Transacao.registrar; verdadeiro só nos sucessos."""
+
+    SAQUE_REALIZADO = "saque_realizado"
+    DEPOSITO_REALIZADO = "deposito_realizado"
+    TRANSFERENCIA_REALIZADA = "transferencia_realizada"
+    SALDO_INSUFICIENTE = "saldo_insuficiente"
+    VALOR_INVALIDO = "valor_invalido"
+    LIMITE_EXCEDIDO = "limite_excedido"
+    SAQUES_EXCEDIDOS = "saques_excedidos"
+    VALOR_DIARIO_EXCEDIDO = "valor_diario_excedido"
+    VELOCIDADE_EXCEDIDA = "velocidade_excedida"
+    TRANSACAO_INVALIDA = "transacao_invalida"
+    DESTINO_INVALIDO = "destino_invalido"
+
+    def __bool__(self):
+        return self in (Resultado.SAQUE_REALIZADO, Resultado.DEPOSITO_REALIZADO, Resultado.TRANSFERENCIA_REALIZADA)
+
+
+MENSAGENS_RESULTADO = {
+    Resultado.SAQUE_REALIZADO: "\n=== Saque realizado com sucesso! ===",
+    Resultado.DEPOSITO_REALIZADO: "\n=== Depósito realizado com sucesso! ===",
+    Resultado.TRANSFERENCIA_REALIZADA: "\n=== Transferência realizada com sucesso! ===",
+    Resultado.SALDO_INSUFICIENTE: "\n@@@ Operação falhou! Você não tem saldo suficiente. @@@",
+    Resultado.VALOR_INVALIDO: "\n@@@ Operação falhou! O valor informado é inválido. @@@",
+    Resultado.LIMITE_EXCEDIDO: "\n@@@ Operação falhou! O valor do saque excede o limite. @@@",
+    Resultado.SAQUES_EXCEDIDOS: "\n@@@ Operação falhou! Número máximo de saques excedido. @@@",
+    Resultado.VALOR_DIARIO_EXCEDIDO: "\n@@@ Operação falhou! O total sacado nas últimas 24 horas excede o limite. @@@",
+    Resultado.VELOCIDADE_EXCEDIDA: "\n@@@ Operação falhou! Muitos saques em sequência; aguarde um minuto. @@@",
+    Resultado.TRANSACAO_INVALIDA: "\n@@@ Transação inválida. Objeto de transação não reconhecido. @@@",
+    Resultado.DESTINO_INVALIDO: "\n@@@ Operação falhou! A conta de destino é inválida. @@@",
+}
+
+
+class Notificador(ABC):
+    @abstractmethod
+    def notificar(self, resultado, conta=None):
+        pass
+
+    def descarregar(self):
+        pass
+
+
+class NotificadorNulo(Notificador):
+    # Lotes, serviço e shards: nenhuma E/S por transação
+    def notificar(self, resultado, conta=None):
+        pass
+
+
+class NotificadorConsole(Notificador):
+    """Acumula as mensagens e escreve um bloco por vez (no limite do buffer ou em descarregar())."""
+
+    def __init__(self, saida=None, mensagens_por_escrita=256):
+        self._saida = saida
+        self._mensagens_por_escrita = mensagens_por_escrita
+        self._pendentes = []
+        self._trava = threading.Lock()
+
+    def notificar(self, resultado, conta=None):
+        with self._trava:
+            self._pendentes.append(MENSAGENS_RESULTADO[resultado] + "\n")
+            if len(self._pendentes) < self._mensagens_por_escrita:
+                return
+            bloco = self._retirar()
+        self._escrever(bloco)
+
+    def descarregar(self):
+        with self._trava:
+            bloco = self._retirar()
+        self._escrever(bloco)
+
+    def _retirar(self):
+        bloco, self._pendentes = "".join(self._pendentes), []
+        return bloco
+
+    def _escrever(self, bloco):
+        if bloco:
+            saida = self._saida or sys.stdout
+            saida.write(bloco)
+            saida.flush()
+
+
+class NotificadorFila(Notificador):
+    """Enfileira os eventos e os entrega ao destino em uma thread própria.
+
+    Quem opera a conta só paga o put() na fila; descarregar() espera a fila esvaziar.
+    """
+
+    def __init__(self, destino=None, capacidade=100_000):
+        self._destino = destino or NotificadorConsole()
+        self._fila = queue.Queue(capacidade)
+        self._thread = threading.Thread(target=self._consumir, name="notificador", daemon=True)
+        self._thread.start()
+
+    def notificar(self, resultado, conta=None):
+        self._fila.put((resultado, conta))
+
+    def _consumir(self):
+        while True:
+            evento = self._fila.get()
+            try:
+                if evento is None:
+                    return
+                self._destino.notificar(*evento)
+                if self._fila.empty():
+                    self._destino.descarregar()
+            finally:
+                self._fila.task_done()
+
+    def descarregar(self):
+        self._fila.join()
+        self._destino.descarregar()
+
+    def fechar(self):
+        self._fila.put(None)
+        self._thread.join()
+        self._destino.descarregar()
+
+
+NOTIFICADOR = NotificadorConsole()
+
+
+def definir_notificador(notificador):
+    """Troca o notificador global e devolve o anterior (já descarregado)."""
+    global NOTIFICADOR
+    anterior, NOTIFICADOR = NOTIFICADOR, notificador
+    anterior.descarregar()
+    return anterior
+
+
+@contextlib.contextmanager
+def usando_notificador(notificador):
+    anterior = definir_notificador(notificador)
+    try:
+        yield notificador
+    finally:
+        definir_notificador(anterior)
+
+
+def notificar(resultado, conta=None):
+    NOTIFICADOR.notificar(resultado, conta)
+    return resultado
 
 
 # ==================== CLASSES DO MODELO UML ====================
 
+def _slots(*atributos, raiz=False):
+    """__slots__ das classes do modelo: só os atributos declarados no modelo compacto.
+
+    Com BANCO_MODELO_COMPACTO=0 as classes voltam a ter __dict__ (declarado na raiz da hierarquia).
+    """
+    if MODELO_COMPACTO:
+        return atributos
+    return ("__dict__", "__weakref__") if raiz else ()
+
+
 class Cliente:
+    __slots__ = _slots("endereco", "contas", raiz=True)
+
     def __init__(self, endereco):
         self.endereco = endereco
         self.contas = []
 
     def realizar_transacao(self, conta, transacao):
         # Adicionei a validação para garantir que é uma Transacao
-        if isinstance(transacao, Transacao):
-            transacao.registrar(conta)
-        else:
-            print("\n@@@ Transação inválida. Objeto de transação não reconhecido. @@@")
+        if not isinstance(transacao, Transacao):
+            return notificar(Resultado.TRANSACAO_INVALIDA, conta)
+        if transacao.chave is None:
+            return transacao.registrar(conta)
+
+        # Com chave de idempotência: uma repetição devolve o resultado original sem reaplicar
+        chave = (conta.agencia, conta.numero, transacao.chave)
+        destino = getattr(transacao, "destino", None)
+        contas = (conta, destino) if isinstance(destino, Conta) else (conta,)
+
+        def aplicar():
+            # Efeito e chave entram no diário no mesmo grupo, ainda sob as travas das contas
+            with travas_em_ordem(contas), grupo_diario():
+                resultado = transacao.registrar(conta)
+                IDEMPOTENCIA.anotar(chave, resultado)
+                return resultado
+
+        return IDEMPOTENCIA.executar(chave, aplicar)
 
     def adicionar_conta(self, conta):
         self.contas.append(conta)
 
 
 class PessoaFisica(Cliente):
+    __slots__ = _slots("nome", "data_nascimento", "cpf")
+
     def __init__(self, nome, data_nascimento, cpf, endereco):
         super().__init__(endereco)
         self.nome = nome
@@ -29,13 +256,24 @@ class PessoaFisica(Cliente):
         self.cpf = cpf
 
 
+_TRAVA_CONTAS = threading.Lock() # criação preguiçosa da trava de cada conta
+
+
 class Conta:
-    def __init__(self, numero, cliente):
+    __slots__ = _slots("_saldo", "_numero", "_agencia", "_cliente", "_historico", "_saques_hoje", "_trava",
+                       "_cache_extrato", raiz=True)
+
+    def __init__(self, numero, cliente, agencia=AGENCIA, historico=None):
         self._saldo = 0
         self._numero = numero
-        self._agencia = "0001"
+        self._agencia = sys.intern(agencia) # milhões de contas compartilham um punhado de strings
         self._cliente = cliente
-        self._historico = Historico()
+        # Histórico, contador de saques e trava só são criados no primeiro uso: uma conta parada
+        # não carrega nenhum deles (o histórico vazio é um marcador compartilhado)
+        self._historico = HISTORICO_VAZIO if historico is None else historico # ou HistoricoPendente (snapshot)
+        self._saques_hoje = None
+        self._trava = None
+        self._cache_extrato = None # mantido por CacheExtratos
 
     @classmethod
     def nova_conta(cls, cliente, numero):
@@ -59,38 +297,237 @@ class Conta:
 
     @property
     def historico(self):
-        return self._historico
+        historico = self._historico
+        if historico.__class__ in HISTORICOS_NAO_CARREGADOS:
+            # Primeiro acesso: o segmento do snapshot é lido (ou o histórico vazio é criado) agora
+            with self.trava:
+                if self._historico.__class__ in HISTORICOS_NAO_CARREGADOS:
+                    self._historico = self._historico.carregar(self)
+                historico = self._historico
+        return historico
+
+    @property
+    def historico_carregado(self):
+        return self._historico.__class__ not in HISTORICOS_NAO_CARREGADOS
+
+    @property
+    def saques_hoje(self):
+        contador = self._saques_hoje
+        if contador is None:
+            with self.trava:
+                if self._saques_hoje is None:
+                    self._saques_hoje = ContadorDiario()
+                contador = self._saques_hoje
+        return contador
+
+    @property
+    def trava(self):
+        # Reentrante: Transacao.registrar segura a trava e chama sacar/depositar, que também a usam
+        trava = self._trava
+        if trava is None:
+            with _TRAVA_CONTAS: # duas threads no primeiro uso não podem criar travas diferentes
+                if self._trava is None:
+                    self._trava = threading.RLock()
+                trava = self._trava
+        return trava
+
+    def saldo_em(self, momento):
+        """Saldo ao final do momento informado (datetime ou timestamp epoch)."""
+        # Os pontos de saldo são gravados no histórico na primeira consulta: sem a trava, duas
+        # consultas (ou uma consulta e um lançamento) gravariam pontos repetidos ou fora de ordem
+        with self.trava:
+            return self.historico.saldo_em(_timestamp(momento))
+
+    def extrato_entre(self, inicio, fim):
+        """Linhas do extrato das transações entre inicio e fim (inclusive)."""
+        return self.historico.linhas_entre(_timestamp(inicio), _timestamp(fim))
+
+    def mapear_historico(self, caminho, quantidade=None):
+        """Troca o histórico em memória por um HistoricoMapeado (contas de alto volume).
+
+        Se o arquivo ainda não tiver registros, as transações atuais são copiadas para ele.
+        """
+        atual = self.historico
+        historico = HistoricoMapeado(caminho, quantidade)
+        if not len(historico):
+            for registro in atual.registros():
+                historico.restaurar(*registro)
+        historico._observadores = atual._observadores
+        self._historico = historico
 
     def sacar(self, valor):
-        saldo = self.saldo
-        excedeu_saldo = valor > saldo
+        with self.trava: # leitura, verificação e escrita do saldo sem intercalação
+            saldo = self.saldo
+            excedeu_saldo = valor > saldo
+
+            if not 0 < valor <= VALOR_MAXIMO: # também recusa NaN e infinito
+                return notificar(Resultado.VALOR_INVALIDO, self)
+            elif excedeu_saldo:
+                return notificar(Resultado.SALDO_INSUFICIENTE, self)
+            else:
+                self._saldo -= valor
+                return notificar(Resultado.SAQUE_REALIZADO, self)
 
-        if excedeu_saldo:
-            print("\n@@@ Operação falhou! Você não tem saldo suficiente. @@@")
-            return False # Adicionado retorno False para consistência
-        elif valor > 0:
+    def depositar(self, valor):
+        with self.trava:
+            if 0 < valor <= VALOR_MAXIMO:
+                self._saldo += valor
+                return notificar(Resultado.DEPOSITO_REALIZADO, self)
+            else:
+                return notificar(Resultado.VALOR_INVALIDO, self)
+
+    def transferir(self, valor, destino):
+        # Chamado por Transferencia.registrar, com as travas das duas contas já adquiridas
+        if destino is self or not isinstance(destino, Conta):
+            return notificar(Resultado.DESTINO_INVALIDO, self)
+        elif not 0 < valor <= VALOR_MAXIMO:
+            return notificar(Resultado.VALOR_INVALIDO, self)
+        elif valor > self.saldo:
+            return notificar(Resultado.SALDO_INSUFICIENTE, self)
+        else:
             self._saldo -= valor
-            print("\n=== Saque realizado com sucesso! ===")
-            return True
+            destino._saldo += valor
+            return notificar(Resultado.TRANSFERENCIA_REALIZADA, self)
+
+    def restaurar_transacao(self, codigo, centavos, timestamp):
+        # Reaplica uma transação já aceita (recuperação do diário), sem validações nem mensagens
+        with self.trava:
+            self._saldo += SINAIS_TRANSACAO[codigo] * centavos / 100
+            self.historico.restaurar(codigo, centavos, timestamp)
+            if TIPOS_TRANSACAO[codigo] == "Saque":
+                self.saques_hoje.incrementar(date.fromtimestamp(timestamp))
+
+
+class JanelaDeslizante:
+    """Soma dos valores das últimas `duracao` segundos, em um anel de fatias de tempo.
+
+    Cada operação só zera as fatias vencidas desde a anterior (no máximo o anel inteiro), então
+    o custo é O(1) e nenhuma varredura periódica é necessária. Um valor conta por pelo menos
+    `duracao` segundos e por no máximo uma fatia a mais (a janela nunca subestima o total).
+    """
+
+    __slots__ = _slots("_largura", "_fatias", "_fatia", "_total", raiz=True)
+
+    def __init__(self, duracao=86_400.0, fatias=24):
+        self._largura = duracao / fatias
+        self._fatias = array("q", bytes(8 * (fatias + 1)))
+        self._fatia = None # número absoluto da fatia mais recente
+        self._total = 0
+
+    def _avancar(self, agora):
+        fatia = int(agora // self._largura)
+        if self._fatia is None or fatia - self._fatia >= len(self._fatias):
+            self._fatias = array("q", bytes(8 * len(self._fatias)))
+            self._total = 0
+        elif fatia > self._fatia:
+            for vencida in range(self._fatia + 1, fatia + 1):
+                posicao = vencida % len(self._fatias)
+                self._total -= self._fatias[posicao]
+                self._fatias[posicao] = 0
         else:
-            print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
-            return False # Adicionado retorno False para consistência
+            return # relógio parado ou voltando: continua na fatia atual
+        self._fatia = fatia
 
-    def depositar(self, valor):
-        if valor > 0:
-            self._saldo += valor
-            print("\n=== Depósito realizado com sucesso! ===")
-            return True
-        else:
-            print("\n@@@ Operação falhou! O valor informado é inválido. @@@")
-            return False
+    def total(self, agora):
+        self._avancar(agora)
+        return self._total
+
+    def adicionar(self, valor, agora):
+        self._avancar(agora)
+        self._fatias[self._fatia % len(self._fatias)] += valor
+        self._total += valor
+
+
+class BaldeFichas:
+    """Token bucket: até `capacidade` operações, repostas continuamente ao longo de `periodo` segundos."""
+
+    __slots__ = _slots("_capacidade", "_taxa", "_fichas", "_atualizado", raiz=True)
+
+    def __init__(self, capacidade, periodo=60.0):
+        self._capacidade = capacidade
+        self._taxa = capacidade / periodo
+        self._fichas = float(capacidade)
+        self._atualizado = None
+
+    def _repor(self, agora):
+        if self._atualizado is not None and agora > self._atualizado:
+            self._fichas = min(self._capacidade, self._fichas + (agora - self._atualizado) * self._taxa)
+        if self._atualizado is None or agora > self._atualizado:
+            self._atualizado = agora
+
+    def disponivel(self, agora):
+        self._repor(agora)
+        return self._fichas >= 1
+
+    def consumir(self, agora):
+        self._repor(agora)
+        self._fichas = max(0.0, self._fichas - 1)
+
+
+class PoliticaLimites:
+    """Limites de saque de um tipo de conta (atributo POLITICA_LIMITES da classe); None desliga o limite.
+
+    saques_por_dia é o padrão de limite_saques (dia do calendário); valor_por_24h vale para as
+    últimas 24 horas corridas e saques_por_minuto é a velocidade máxima.
+    """
+
+    __slots__ = ("saques_por_dia", "valor_por_24h", "saques_por_minuto", "fatias_janela")
+
+    def __init__(self, saques_por_dia=3, valor_por_24h=None, saques_por_minuto=None, fatias_janela=24):
+        self.saques_por_dia = saques_por_dia
+        self.valor_por_24h = valor_por_24h
+        self.saques_por_minuto = saques_por_minuto
+        self.fatias_janela = fatias_janela
+
+
+class LimitesConta:
+    """Estado dos limites de valor em 24h e de velocidade de uma conta.
+
+    Criado no primeiro saque da conta no processo, a partir dos saques das últimas 24 horas
+    do histórico (busca binária por data): os limites valem também depois de um reinício.
+    """
+
+    __slots__ = _slots("_politica", "_janela", "_balde", raiz=True)
+
+    def __init__(self, politica, historico, agora):
+        self._politica = politica
+        self._janela = JanelaDeslizante(86_400.0, politica.fatias_janela) if politica.valor_por_24h else None
+        self._balde = BaldeFichas(politica.saques_por_minuto) if politica.saques_por_minuto else None
+        saque = CODIGOS_TRANSACAO["Saque"]
+        for codigo, centavos, timestamp in historico.registros(*historico.intervalo_datas(agora - 86_400.0, agora)):
+            if codigo == saque:
+                self._anotar(centavos, timestamp)
+
+    def verificar(self, valor, agora):
+        # Resultado de falha, ou None se o saque cabe nos limites
+        if self._balde and not self._balde.disponivel(agora):
+            return Resultado.VELOCIDADE_EXCEDIDA
+        if self._janela and self._janela.total(agora) + round(valor * 100) > round(self._politica.valor_por_24h * 100):
+            return Resultado.VALOR_DIARIO_EXCEDIDO
+        return None
+
+    def registrar(self, valor, agora):
+        self._anotar(round(valor * 100), agora)
+
+    def _anotar(self, centavos, agora):
+        if self._janela:
+            self._janela.adicionar(centavos, agora)
+        if self._balde:
+            self._balde.consumir(agora)
 
 
 class ContaCorrente(Conta):
-    def __init__(self, numero, cliente, limite=500, limite_saques=3):
-        super().__init__(numero, cliente)
+    __slots__ = _slots("_limite", "_limite_saques", "_limites")
+
+    # Velocidade desligada: abaixo de saques_por_dia ela tornaria o limite diário inalcançável
+    POLITICA_LIMITES = PoliticaLimites(saques_por_dia=3, valor_por_24h=1_500)
+
+    def __init__(self, numero, cliente, limite=500, limite_saques=None, agencia=AGENCIA, historico=None):
+        super().__init__(numero, cliente, agencia, historico)
         self._limite = limite # Usei _limite para manter a convenção de atributo interno
-        self._limite_saques = limite_saques # Usei _limite_saques para manter a convenção de atributo interno
+        # Usei _limite_saques para manter a convenção de atributo interno; o padrão vem da política do tipo
+        self._limite_saques = self.POLITICA_LIMITES.saques_por_dia if limite_saques is None else limite_saques
+        self._limites = None # LimitesConta, criado no primeiro saque
 
     # Adicionando properties para limite e limite_saques para acesso consistente
     @property
@@ -101,51 +538,320 @@ class ContaCorrente(Conta):
     def limite_saques(self):
         return self._limite_saques
 
+    def limites(self, agora=None):
+        if self._limites is None:
+            agora = time.time() if agora is None else agora
+            self._limites = LimitesConta(self.POLITICA_LIMITES, self.historico, agora)
+        return self._limites
+
     def sacar(self, valor):
-        # A sua lógica de contar saques pelo histórico é mais robusta para limite geral/sem reset diário
-        numero_saques = len(
-            [transacao for transacao in self.historico.transacoes if transacao["tipo"] == Saque.__name__]
-        )
+        with self.trava:
+            # Contagem O(1) do dia corrente, mantida por Saque.registrar (zera sozinha na virada do dia)
+            numero_saques = self.saques_hoje.quantidade()
+
+            excedeu_limite = valor > self.limite # Acessando via property
+            excedeu_saques = numero_saques >= self.limite_saques # Acessando via property
+
+            if excedeu_limite:
+                return notificar(Resultado.LIMITE_EXCEDIDO, self)
+            elif excedeu_saques:
+                return notificar(Resultado.SAQUES_EXCEDIDOS, self)
+
+            # Valor em 24h corridas e velocidade: janela e token bucket da conta, sem varrer nada
+            agora = time.time()
+            limites = self.limites(agora)
+            falha = limites.verificar(valor, agora) if valor > 0 else None
+            if falha is not None: # Resultado de falha é falso: compara com None
+                return notificar(falha, self)
+
+            resultado = super().sacar(valor) # Chama o sacar da classe pai (Conta)
+            if resultado:
+                limites.registrar(valor, agora)
+            return resultado
 
-        excedeu_limite = valor > self.limite # Acessando via property
-        excedeu_saques = numero_saques >= self.limite_saques # Acessando via property
+    def __str__(self): # Excelente método para representação da conta
+        return MODELO_CONTA.format(agencia=self.agencia, numero=self.numero, titular=self.cliente.nome)
 
-        if excedeu_limite:
-            print("\n@@@ Operação falhou! O valor do saque excede o limite. @@@")
-            return False
-        elif excedeu_saques:
-            print("\n@@@ Operação falhou! Número máximo de saques excedido. @@@")
-            return False
-        else:
-            return super().sacar(valor) # Chama o sacar da classe pai (Conta)
 
-    def __str__(self): # Excelente método para representação da conta
-        return f"""\
-            Agência:\t{self.agencia}
-            C/C:\t\t{self.numero}
-            Titular:\t{self.cliente.nome}
-        """
+class ContadorDiario:
+    # Um único "balde" para o dia corrente: ao mudar a data a contagem recomeça do zero,
+    # sem precisar varrer o histórico nem as demais contas.
+    __slots__ = _slots("_dia", "_quantidade", raiz=True)
+
+    def __init__(self):
+        self._dia = None
+        self._quantidade = 0
+
+    def quantidade(self, dia=None):
+        dia = dia or date.today()
+        return self._quantidade if self._dia == dia else 0
+
+    def incrementar(self, dia=None):
+        dia = dia or date.today()
+        if self._dia != dia:
+            self._dia = dia
+            self._quantidade = 0
+        self._quantidade += 1
+
+
+def _timestamp(momento):
+    return momento.timestamp() if isinstance(momento, datetime) else float(momento)
 
 
 class Historico:
+    # Armazenamento em colunas paralelas (array): código do tipo, valor em centavos e
+    # timestamp epoch. Cada transação ocupa 17 bytes; a data só é formatada na leitura.
+    # Os timestamps são mantidos em ordem crescente, o que permite busca binária por data.
+
+    INTERVALO_PONTOS = 256 # um ponto de saldo acumulado a cada N transações
+    FORMATO = struct.Struct("<Bqd") # codigo, centavos, timestamp
+
+    __slots__ = _slots("_tipos", "_valores", "_datas", "_pontos", "_observadores", raiz=True)
+
     def __init__(self):
-        self._transacoes = []
+        self._tipos = array("B")
+        self._valores = array("q")
+        self._datas = array("d")
+        self._pontos = array("q") # saldo (centavos) após cada bloco completo de INTERVALO_PONTOS
+        self._observadores = []
+
+    def __len__(self):
+        return len(self._tipos)
 
     @property
     def transacoes(self):
-        return self._transacoes
-
-    def adicionar_transacao(self, transacao):
-        self._transacoes.append(
-            {
-                "tipo": transacao.__class__.__name__,
-                "valor": transacao.valor,
-                "data": datetime.now().strftime("%d-%m-%Y %H:%M:%S"), # Correção: %S para segundos
-            }
-        )
+        return TransacoesView(self)
+
+    def observar(self, observador):
+        # observador(codigo, centavos, timestamp) é chamado a cada transação adicionada
+        self._observadores.append(observador)
+
+    def adicionar_transacao(self, transacao, codigo=None):
+        # O código sai do nome da classe; Transferencia informa o seu (enviada ou recebida)
+        codigo = CODIGOS_TRANSACAO[transacao.__class__.__name__] if codigo is None else codigo
+        centavos = round(transacao.valor * 100)
+        timestamp = time.time()
+        if len(self):
+            # Um relógio que volta atrás não pode desordenar o índice de datas
+            timestamp = max(timestamp, self.registro(-1)[2])
+        self.restaurar(codigo, centavos, timestamp)
+        for observador in self._observadores:
+            observador(codigo, centavos, timestamp)
+
+    def restaurar(self, codigo, centavos, timestamp):
+        # Valida os três campos antes do primeiro append: um valor fora do intervalo não
+        # pode deixar as colunas com tamanhos diferentes
+        self.FORMATO.pack(codigo, centavos, timestamp)
+        self._tipos.append(codigo)
+        self._valores.append(centavos)
+        self._datas.append(timestamp)
+
+    def registro(self, indice):
+        return self._tipos[indice], self._valores[indice], self._datas[indice]
+
+    def registros(self, inicio=0, fim=None):
+        # Tuplas (codigo, centavos, timestamp) do intervalo [inicio, fim)
+        return zip(self._tipos[inicio:fim], self._valores[inicio:fim], self._datas[inicio:fim])
+
+    def transacao(self, indice):
+        codigo, centavos, timestamp = self.registro(indice)
+        return {
+            "tipo": TIPOS_TRANSACAO[codigo],
+            "valor": centavos / 100,
+            "data": datetime.fromtimestamp(timestamp).strftime(FORMATO_DATA),
+        }
+
+    def linhas(self, inicio=0, fim=None):
+        # Formata as transações [inicio, fim) uma a uma, direto do armazenamento
+        segundo_anterior, data = None, ""
+        for codigo, centavos, timestamp in self.registros(inicio, fim):
+            segundo = int(timestamp)
+            if segundo != segundo_anterior: # transações no mesmo segundo reaproveitam a data formatada
+                segundo_anterior = segundo
+                data = datetime.fromtimestamp(segundo).strftime(FORMATO_DATA)
+            yield f"{TIPOS_TRANSACAO[codigo]}:\tR$ {centavos / 100:.2f} ({data})\n"
+
+    def _posicao_data(self, timestamp, depois=False):
+        # Índice da primeira transação com data >= timestamp (ou > timestamp, se depois)
+        return (bisect.bisect_right if depois else bisect.bisect_left)(self._datas, timestamp)
+
+    def _atualizar_pontos(self):
+        # Os pontos são estendidos sob demanda, só pelos blocos completados desde a última consulta
+        intervalo = self.INTERVALO_PONTOS
+        inicio = len(self._pontos) * intervalo
+        alvo = len(self) // intervalo * intervalo
+        if inicio >= alvo:
+            return
+        saldo = self._pontos[-1] if self._pontos else 0
+        for posicao, (codigo, centavos, _) in enumerate(self.registros(inicio, alvo), inicio + 1):
+            saldo += SINAIS_TRANSACAO[codigo] * centavos
+            if posicao % intervalo == 0:
+                self._pontos.append(saldo)
+
+    def saldo_em(self, timestamp):
+        """Saldo após todas as transações com data <= timestamp: busca binária + no máximo um bloco."""
+        self._atualizar_pontos()
+        quantidade = self._posicao_data(timestamp, depois=True)
+        bloco = min(quantidade // self.INTERVALO_PONTOS, len(self._pontos))
+        saldo = self._pontos[bloco - 1] if bloco else 0
+        for codigo, centavos, _ in self.registros(bloco * self.INTERVALO_PONTOS, quantidade):
+            saldo += SINAIS_TRANSACAO[codigo] * centavos
+        return saldo / 100
+
+    def intervalo_datas(self, inicio, fim):
+        """Índices [i, j) das transações com inicio <= data <= fim."""
+        return self._posicao_data(inicio), self._posicao_data(fim, depois=True)
+
+    def linhas_entre(self, inicio, fim):
+        return self.linhas(*self.intervalo_datas(inicio, fim))
+
+
+class HistoricoMapeado(Historico):
+    """Historico gravado em um arquivo de registros de tamanho fixo, mapeado com mmap.
+
+    Os acréscimos escrevem direto no mapeamento (pack_into) e as leituras de intervalo
+    acessam a posição do registro, sem carregar o arquivo para a memória do processo.
+    """
+
+    ASSINATURA = b"HISTBCO1"
+    CABECALHO = struct.Struct("<8sQ") # assinatura, quantidade de registros
+    REGISTROS_POR_LEITURA = 4096
+
+    __slots__ = _slots("_caminho", "_arquivo", "_mapa", "_quantidade")
+
+    def __init__(self, caminho, quantidade=None, capacidade_inicial=4096):
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        self._caminho = caminho
+        self._arquivo = open(caminho, "w+b" if novo else "r+b")
+        if novo:
+            self._arquivo.truncate(self.CABECALHO.size + capacidade_inicial * self.FORMATO.size)
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0)
+
+        if novo:
+            self.CABECALHO.pack_into(self._mapa, 0, self.ASSINATURA, 0)
+        assinatura, gravados = self.CABECALHO.unpack_from(self._mapa, 0)
+        if assinatura != self.ASSINATURA:
+            raise ValueError(f"{caminho} não é um arquivo de histórico")
+
+        # quantidade (vinda de um snapshot) descarta registros gravados depois dele
+        self._quantidade = gravados if quantidade is None else min(quantidade, gravados)
+        self._pontos = array("q")
+        self._observadores = []
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    def __len__(self):
+        return self._quantidade
+
+    def _posicao(self, indice):
+        return self.CABECALHO.size + indice * self.FORMATO.size
+
+    def restaurar(self, codigo, centavos, timestamp):
+        posicao = self._posicao(self._quantidade)
+        if posicao + self.FORMATO.size > len(self._mapa):
+            self._mapa.resize(len(self._mapa) * 2)
+        self.FORMATO.pack_into(self._mapa, posicao, codigo, centavos, timestamp)
+        self._quantidade += 1
+        self.CABECALHO.pack_into(self._mapa, 0, self.ASSINATURA, self._quantidade)
+
+    def registro(self, indice):
+        if indice < 0:
+            indice += self._quantidade
+        if not 0 <= indice < self._quantidade:
+            raise IndexError("índice de transação fora do intervalo")
+        return self.FORMATO.unpack_from(self._mapa, self._posicao(indice))
+
+    def registros(self, inicio=0, fim=None):
+        inicio, fim, _ = slice(inicio, fim).indices(self._quantidade)
+        for bloco_inicio in range(inicio, fim, self.REGISTROS_POR_LEITURA):
+            bloco_fim = min(fim, bloco_inicio + self.REGISTROS_POR_LEITURA)
+            # A visão é liberada antes de devolver o bloco: um acréscimo pode redimensionar o mapa
+            with memoryview(self._mapa)[self._posicao(bloco_inicio):self._posicao(bloco_fim)] as bloco:
+                registros = list(self.FORMATO.iter_unpack(bloco))
+            yield from registros
+
+    def _posicao_data(self, timestamp, depois=False):
+        buscar = bisect.bisect_right if depois else bisect.bisect_left
+        return buscar(range(self._quantidade), timestamp, key=lambda indice: self.registro(indice)[2])
+
+    def sincronizar(self):
+        self._mapa.flush()
+
+    def fechar(self):
+        self._mapa.flush()
+        self._mapa.close()
+        self._arquivo.close()
+
+
+class HistoricoPendente:
+    """Posição do histórico de uma conta no snapshot binário, ainda não lido.
+
+    Conta.historico troca este marcador pelo Historico (ou HistoricoMapeado) no primeiro acesso.
+    """
+
+    __slots__ = _slots("snapshot", "posicao", "quantidade", "mapeado", raiz=True)
+
+    def __init__(self, snapshot, posicao, quantidade, mapeado):
+        self.snapshot = snapshot
+        self.posicao = posicao
+        self.quantidade = quantidade
+        self.mapeado = mapeado
+
+    def carregar(self, conta):
+        return self.snapshot.carregar_historico(conta, self)
+
+
+class HistoricoVazio:
+    """Histórico de uma conta sem transações, um só para todas as contas.
+
+    Conta.historico troca este marcador por um Historico próprio no primeiro acesso;
+    ao_carregar(conta, historico) é chamado com o histórico criado (a Persistencia usa a
+    sua cópia do marcador para acompanhar a conta só a partir daí).
+    """
+
+    __slots__ = _slots("ao_carregar", raiz=True)
+
+    mapeado = 0
+    quantidade = 0
+
+    def __init__(self, ao_carregar=None):
+        self.ao_carregar = ao_carregar
+
+    def carregar(self, conta):
+        historico = Historico()
+        if self.ao_carregar:
+            self.ao_carregar(conta, historico)
+        return historico
+
+
+HISTORICO_VAZIO = HistoricoVazio()
+HISTORICOS_NAO_CARREGADOS = (HistoricoPendente, HistoricoVazio)
+
+
+class TransacoesView(Sequence):
+    # Visão somente leitura que monta o dicionário de cada transação sob demanda
+    def __init__(self, historico):
+        self._historico = historico
+
+    def __len__(self):
+        return len(self._historico)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._historico.transacao(i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice de transação fora do intervalo")
+        return self._historico.transacao(indice)
 
 
 class Transacao(ABC):
+    # Registros leves: só valor, chave (e destino), sem __dict__ no modelo compacto
+    __slots__ = _slots(raiz=True)
+
     @property
     @abstractmethod # Correção: usar abstractmethod para propriedades abstratas
     def valor(self):
@@ -155,72 +861,2281 @@ class Transacao(ABC):
     def registrar(self, conta):
         pass
 
+    @property
+    def chave(self):
+        # Chave de idempotência opcional, informada por quem submete a transação
+        return getattr(self, "_chave", None)
+
 
 class Saque(Transacao):
-    def __init__(self, valor):
+    __slots__ = _slots("_valor", "_chave")
+
+    def __init__(self, valor, chave=None):
         self._valor = valor
+        self._chave = chave
 
     @property
     def valor(self):
         return self._valor
 
     def registrar(self, conta):
-        sucesso_transacao = conta.sacar(self.valor)
+        # Saldo, histórico e contador de saques mudam juntos, sob a trava da conta
+        with conta.trava:
+            resultado = conta.sacar(self.valor)
 
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
-            return True # Adicionado retorno para consistência
-        return False # Adicionado retorno para consistência
+            if resultado:
+                conta.historico.adicionar_transacao(self)
+                conta.saques_hoje.incrementar()
+            return resultado
 
 
 class Deposito(Transacao):
-    def __init__(self, valor):
+    __slots__ = _slots("_valor", "_chave")
+
+    def __init__(self, valor, chave=None):
         self._valor = valor
+        self._chave = chave
 
     @property
     def valor(self):
         return self._valor
 
     def registrar(self, conta):
-        sucesso_transacao = conta.depositar(self.valor)
+        with conta.trava:
+            resultado = conta.depositar(self.valor)
+
+            if resultado:
+                conta.historico.adicionar_transacao(self)
+            return resultado
+
+
+def travas_em_ordem(contas):
+    # Adquire as travas sempre na ordem (agência, número): duas transferências cruzadas não se travam
+    if len(contas) == 1:
+        return next(iter(contas)).trava
+    pilha = contextlib.ExitStack()
+    for conta in sorted(set(contas), key=lambda conta: (conta.agencia, conta.numero)):
+        pilha.enter_context(conta.trava)
+    return pilha
 
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
-            return True # Adicionado retorno para consistência
-        return False # Adicionado retorno para consistência
+
+class Transferencia(Transacao):
+    """Débito na conta de origem e crédito no destino, sob as travas das duas contas.
+
+    Cada conta recebe um lançamento no histórico (enviada/recebida) e os dois registros
+    vão juntos para o diário, então a recuperação aplica a transferência inteira ou nada.
+    Não passa pelos limites de saque de ContaCorrente: só o saldo da origem é conferido.
+    """
+
+    __slots__ = _slots("_valor", "_destino", "_chave")
+
+    def __init__(self, valor, destino, chave=None):
+        self._valor = valor
+        self._destino = destino
+        self._chave = chave
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @property
+    def destino(self):
+        return self._destino
+
+    def registrar(self, conta):
+        if not isinstance(self._destino, Conta) or self._destino is conta:
+            return notificar(Resultado.DESTINO_INVALIDO, conta)
+
+        with travas_em_ordem((conta, self._destino)), grupo_diario():
+            resultado = conta.transferir(self.valor, self._destino)
+
+            if resultado:
+                conta.historico.adicionar_transacao(self, CODIGOS_TRANSACAO["Transferencia enviada"])
+                self._destino.historico.adicionar_transacao(self, CODIGOS_TRANSACAO["Transferencia recebida"])
+            return resultado
+
+
+# ==================== REGISTRO (ÍNDICES EM MEMÓRIA) ====================
+
+ORDENS_CONTAS = {
+    "agencia": lambda conta: (conta.agencia, conta.numero),
+    "titular": lambda conta: (conta.cliente.nome, conta.agencia, conta.numero),
+    "saldo": lambda conta: (conta.saldo, conta.agencia, conta.numero),
+}
+
+
+def paginar(itens, cursor=None, limite=TAMANHO_PAGINA_CONTAS, filtro=None, chaves=None, decrescente=False):
+    """Devolve (página, próximo cursor); o cursor é None quando não há mais páginas.
+
+    itens é uma lista já na ordem da listagem. Sem chaves, o cursor é a posição na lista;
+    com chaves (lista ordenada paralela a itens), é a chave do último item da página e a
+    continuação sai de uma busca binária. Cada página custa O(log N + itens percorridos).
+    """
+    passo = -1 if decrescente else 1
+    if chaves is None:
+        posicao = cursor or 0
+    elif cursor is None:
+        posicao = len(itens) - 1 if decrescente else 0
+    elif decrescente:
+        posicao = bisect.bisect_left(chaves, tuple(cursor)) - 1
+    else:
+        posicao = bisect.bisect_right(chaves, tuple(cursor))
+
+    pagina = []
+    ultima = None
+    while 0 <= posicao < len(itens):
+        item = itens[posicao]
+        if filtro is None or filtro(item):
+            if len(pagina) == limite: # há ao menos mais um item: a listagem continua
+                return pagina, ultima + 1 if chaves is None else chaves[ultima]
+            pagina.append(item)
+            ultima = posicao
+        posicao += passo
+    return pagina, None
+
+
+class Registro:
+    # Índices em dicionário: CPF -> cliente e (agência, número) -> conta.
+    # Substituem as buscas lineares em listas; cada consulta custa O(1).
+    # As listagens usam a lista de contas na ordem de inclusão e, por ordem pedida, um
+    # índice ordenado (chaves, contas) criado no primeiro uso e mantido nas inclusões.
+    def __init__(self):
+        self._clientes = {}
+        self._contas = {}
+        self._ordem_inclusao = []
+        self._indices = {} # ordem -> (chaves ordenadas, contas na mesma ordem)
+        self._trava = threading.Lock() # só para inclusões; as consultas não precisam de trava
+        self.persistencia = None # Quando definida, cada cliente/conta criado é anotado no diário
+        self.alocador = AlocadorNumeros() # números de conta novos (Persistencia troca por um gravado em disco)
+
+    @property
+    def clientes(self):
+        return self._clientes.values()
+
+    @property
+    def contas(self):
+        return self._contas.values()
+
+    def pagina_contas(self, cursor=None, limite=TAMANHO_PAGINA_CONTAS, agencia=None, titular=None,
+                      saldo_minimo=None, saldo_maximo=None, ordem=None, decrescente=False):
+        """Página de contas filtrada por agência, titular (trecho do nome) e faixa de saldo.
+
+        ordem: None (ordem de inclusão), "agencia", "titular" ou "saldo". Devolve (contas, cursor).
+        Os saldos mudam a cada transação, então o índice por saldo é refeito na primeira página
+        de cada listagem; as páginas seguintes continuam a partir dele.
+        """
+        titular = titular.casefold() if titular else None
+
+        def filtro(conta):
+            return ((agencia is None or conta.agencia == agencia)
+                    and (titular is None or titular in conta.cliente.nome.casefold())
+                    and (saldo_minimo is None or conta.saldo >= saldo_minimo)
+                    and (saldo_maximo is None or conta.saldo <= saldo_maximo))
+
+        sem_filtro = agencia is None and titular is None and saldo_minimo is None and saldo_maximo is None
+        filtro = None if sem_filtro else filtro
+        if ordem is None:
+            return paginar(self._ordem_inclusao, cursor, limite, filtro)
+        with self._trava: # inclusões deslocam as listas do índice
+            chaves, contas = self._indice(ordem, refazer=ordem == "saldo" and cursor is None)
+            return paginar(contas, cursor, limite, filtro, chaves, decrescente)
+
+    def _indice(self, ordem, refazer=False):
+        indice = self._indices.get(ordem)
+        if indice is None or refazer:
+            chave = ORDENS_CONTAS[ordem]
+            contas = sorted(self._contas.values(), key=chave)
+            indice = self._indices[ordem] = ([chave(conta) for conta in contas], contas)
+        return indice
+
+    def adicionar_cliente(self, cliente):
+        with self._trava:
+            if cliente.cpf in self._clientes:
+                return False
+            self._clientes[cliente.cpf] = cliente
+            if self.persistencia:
+                self.persistencia.anotar_cliente(cliente)
+            return True
+
+    def adicionar_clientes(self, clientes):
+        """Inclui um bloco de clientes com uma única aquisição da trava; devolve os CPFs já existentes."""
+        existentes = []
+        with self._trava:
+            for cliente in clientes:
+                if cliente.cpf in self._clientes:
+                    existentes.append(cliente.cpf)
+                    continue
+                self._clientes[cliente.cpf] = cliente
+                if self.persistencia:
+                    self.persistencia.anotar_cliente(cliente)
+        return existentes
+
+    def adicionar_conta(self, conta):
+        chave = (conta.agencia, conta.numero)
+        with self._trava:
+            if chave in self._contas:
+                return False
+            self._contas[chave] = conta
+            self._ordem_inclusao.append(conta)
+            for ordem, (chaves, contas) in self._indices.items():
+                chave_ordem = ORDENS_CONTAS[ordem](conta)
+                posicao = bisect.bisect_right(chaves, chave_ordem) # por agência, quase sempre no fim
+                chaves.insert(posicao, chave_ordem)
+                contas.insert(posicao, conta)
+            if self.persistencia:
+                self.persistencia.anotar_conta(conta)
+            return True
+
+    def buscar_cliente(self, cpf):
+        return self._clientes.get(cpf)
+
+    def buscar_conta(self, numero, agencia=AGENCIA):
+        return self._contas.get((agencia, numero))
+
+
+class AlocadorNumeros:
+    """Números de conta por agência, distribuídos em blocos reservados de antemão.
+
+    proximo() só avança o iterador do bloco atual (next() de um range é atômico sob o GIL,
+    sem trava); a trava é usada apenas para reservar o bloco seguinte. Com um caminho, a
+    marca d'água (último número reservado por agência) fica em um arquivo JSON atualizado
+    sob flock, então processos que compartilham o diretório recebem blocos disjuntos e um
+    número nunca volta a ser usado depois de um reinício. devolver() (ao fechar a persistência)
+    devolve a sobra do bloco; só um encerramento sem fechar deixa lacunas na numeração.
+    """
+
+    def __init__(self, caminho=None, bloco=1000):
+        self._caminho = caminho
+        self._bloco = bloco
+        self._blocos = {} # agência -> iterador do bloco atual
+        self._fins = {} # agência -> último número do bloco atual
+        self._marcas = {} # agência -> último número reservado (sem arquivo)
+        self._minimos = {} # agência -> maior número já existente (contas carregadas)
+        self._trava = threading.Lock()
+
+    def proximo(self, agencia=AGENCIA):
+        try:
+            return next(self._blocos[agencia])
+        except (KeyError, StopIteration):
+            return self._proximo_com_reserva(agencia)
+
+    def _proximo_com_reserva(self, agencia):
+        with self._trava:
+            bloco = self._blocos.get(agencia)
+            if bloco is not None: # outra thread pode ter reservado enquanto esta esperava
+                numero = next(bloco, None)
+                if numero is not None:
+                    return numero
+            inicio, fim = self._reservar(agencia)
+            bloco = self._blocos[agencia] = iter(range(inicio, fim))
+            self._fins[agencia] = fim - 1
+            return next(bloco)
+
+    def _reservar(self, agencia):
+        def reservar(marcas):
+            inicio = max(marcas.get(agencia, 0), self._minimos.get(agencia, 0)) + 1
+            marcas[agencia] = inicio + self._bloco - 1
+            return inicio
+
+        inicio = self._atualizar_marcas(reservar)
+        return inicio, inicio + self._bloco
+
+    def devolver(self):
+        """Devolve a sobra dos blocos atuais: a numeração continua dela no próximo início.
+
+        A sobra de uma agência só volta se nenhum outro processo reservou um bloco depois.
+        """
+        with self._trava:
+            sobras = {} # agência -> (último número usado, último número reservado)
+            for agencia, bloco in self._blocos.items():
+                numero = next(bloco, None)
+                if numero is not None:
+                    sobras[agencia] = (numero - 1, self._fins[agencia])
+            self._blocos.clear()
+            if not sobras:
+                return
+
+            def recuar(marcas):
+                for agencia, (usado, reservado) in sobras.items():
+                    if marcas.get(agencia) == reservado:
+                        marcas[agencia] = usado
+
+            self._atualizar_marcas(recuar)
+
+    def _atualizar_marcas(self, atualizar):
+        # Aplica atualizar às marcas d'água; com arquivo, lê e regrava sob flock
+        if self._caminho is None:
+            return atualizar(self._marcas)
+
+        with open(self._caminho + ".trava", "ab") as trava:
+            if fcntl:
+                fcntl.flock(trava, fcntl.LOCK_EX) # liberado ao fechar o arquivo
+            marcas = self.marcas()
+            resultado = atualizar(marcas)
+            temporario = self._caminho + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(marcas, arquivo)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, self._caminho)
+        return resultado
+
+    def marcas(self):
+        """Último número reservado por agência."""
+        if self._caminho is None:
+            return dict(self._marcas)
+        try:
+            with open(self._caminho, encoding="utf-8") as arquivo:
+                return json.load(arquivo)
+        except FileNotFoundError:
+            return {}
+
+    def garantir_acima(self, agencia, numero):
+        # Contas que já existem (snapshot, diário, numeração antiga) nunca recebem o número de novo
+        with self._trava:
+            if numero > self._minimos.get(agencia, 0):
+                self._minimos[agencia] = numero
+                self._blocos.pop(agencia, None)
+
+
+# ==================== IDEMPOTÊNCIA ====================
+
+_PENDENTE = object() # chave reservada por uma thread que ainda está aplicando a transação
+
+
+class CacheIdempotencia:
+    """Resultados por chave de idempotência, com descarte LRU, validade (TTL) e teto de memória.
+
+    A primeira submissão de uma chave reserva a entrada e aplica a transação; repetições
+    concorrentes esperam por ela e recebem o mesmo resultado. Com uma Persistencia
+    associada, cada chave é anotada no diário (e no snapshot) e sobrevive ao reinício.
+    """
+
+    VARREDURA = 1024
+    BYTES_POR_ENTRADA = 220 # nó e slot do OrderedDict, tupla (resultado, expira_em) e float (medido com tracemalloc)
+
+    def __init__(self, capacidade=1_000_000, validade=86_400.0, limite_bytes=256 * 1024 * 1024):
+        self._entradas = OrderedDict() # chave -> (resultado, expira_em)
+        self._capacidade = capacidade
+        self._validade = validade
+        self._limite_bytes = limite_bytes
+        self._bytes = 0
+        self._inclusoes = 0
+        self._condicao = threading.Condition()
+        self.persistencia = None
+        self.acertos = self.faltas = self.esperas = self.expiradas = self.descartes = 0
+
+    def _tamanho(self, chave):
+        return self.BYTES_POR_ENTRADA + sys.getsizeof(chave) + sys.getsizeof(chave[-1])
+
+    def executar(self, chave, aplicar):
+        with self._condicao:
+            while True:
+                entrada = self._entradas.get(chave)
+                if entrada is None:
+                    break
+                resultado, expira_em = entrada
+                if resultado is _PENDENTE:
+                    self.esperas += 1
+                    self._condicao.wait()
+                elif expira_em <= time.time():
+                    self._remover(chave)
+                    self.expiradas += 1
+                    break
+                else:
+                    self.acertos += 1
+                    self._entradas.move_to_end(chave)
+                    return resultado
+            self.faltas += 1
+            self._incluir(chave, _PENDENTE, float("inf"))
+
+        try:
+            resultado = aplicar()
+        except BaseException:
+            with self._condicao:
+                self._remover(chave)
+                self._condicao.notify_all()
+            raise
+
+        with self._condicao:
+            self._entradas[chave] = (resultado, time.time() + self._validade)
+            self._condicao.notify_all()
+        return resultado
+
+    def anotar(self, chave, resultado):
+        if self.persistencia:
+            self.persistencia.anotar_idempotencia(chave, resultado, time.time() + self._validade)
+
+    def restaurar(self, chave, resultado, expira_em):
+        # Recuperação (snapshot e diário): entradas já vencidas não voltam
+        if expira_em > time.time():
+            with self._condicao:
+                if chave in self._entradas:
+                    self._remover(chave)
+                self._incluir(chave, resultado, expira_em)
+
+    def exportar(self):
+        agora = time.time()
+        with self._condicao:
+            return [
+                (chave, resultado.value, expira_em) for chave, (resultado, expira_em) in self._entradas.items()
+                if resultado is not _PENDENTE and expira_em > agora
+            ]
+
+    def limpar(self):
+        with self._condicao:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def _incluir(self, chave, resultado, expira_em):
+        self._entradas[chave] = (resultado, expira_em)
+        self._bytes += self._tamanho(chave)
+        # Fora dos limites, descarta já; senão, varre as vencidas a cada VARREDURA inclusões
+        self._inclusoes += 1
+        if (len(self._entradas) > self._capacidade or self._bytes > self._limite_bytes
+                or not self._inclusoes % self.VARREDURA):
+            self._descartar()
+
+    def _remover(self, chave):
+        del self._entradas[chave]
+        self._bytes -= self._tamanho(chave)
+
+    def _descartar(self):
+        # Vencidas primeiro (a frente do LRU), depois as menos usadas até caber nos limites
+        agora = time.time()
+        pendentes = 0
+        while len(self._entradas) > pendentes:
+            chave, (resultado, expira_em) = next(iter(self._entradas.items()))
+            cheio = len(self._entradas) > self._capacidade or self._bytes > self._limite_bytes
+            if resultado is _PENDENTE:
+                if not cheio:
+                    return
+                self._entradas.move_to_end(chave) # nunca descarta uma aplicação em andamento
+                pendentes += 1
+                continue
+            if expira_em <= agora:
+                self.expiradas += 1
+            elif cheio:
+                self.descartes += 1
+            else:
+                return
+            self._remover(chave)
+
+    def estatisticas(self):
+        with self._condicao:
+            return {
+                "entradas": len(self._entradas),
+                "bytes_estimados": self._bytes,
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "esperas": self.esperas,
+                "expiradas": self.expiradas,
+                "descartes": self.descartes,
+            }
+
+
+IDEMPOTENCIA = CacheIdempotencia()
+
+
+# ==================== EXECUÇÃO PARALELA ====================
+
+def _executar_particao(particao, resultados):
+    for indice, cliente, conta, transacao in particao:
+        resultados[indice] = cliente.realizar_transacao(conta, transacao)
+
+
+def executar_em_paralelo(operacoes, trabalhadores=8):
+    """Executa tuplas (cliente, conta, transacao) em um pool de threads.
+
+    As operações são particionadas pela conta: as de uma mesma conta ficam na mesma
+    thread, na ordem original, e contas diferentes andam em paralelo. Devolve os
+    resultados de realizar_transacao na ordem de entrada.
+    """
+    particoes = [[] for _ in range(trabalhadores)]
+    total = 0
+    for indice, (cliente, conta, transacao) in enumerate(operacoes):
+        particoes[hash((conta.agencia, conta.numero)) % trabalhadores].append((indice, cliente, conta, transacao))
+        total = indice + 1
+
+    resultados = [None] * total
+    with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+        futuros = [executor.submit(_executar_particao, particao, resultados) for particao in particoes if particao]
+        for futuro in futuros:
+            futuro.result() # propaga exceções das threads
+    return resultados
+
+
+# ==================== PERSISTÊNCIA (DIÁRIO + SNAPSHOT) ====================
+
+REGISTRO_CLIENTE = 1
+REGISTRO_CONTA = 2
+REGISTRO_TRANSACAO = 3
+REGISTRO_GRUPO = 4
+REGISTRO_IDEMPOTENCIA = 5
+# Clientes e contas: tipo + tamanho + JSON. Transações (a imensa maioria): registro binário fixo.
+# Grupo: tipo + tamanho + registros que só valem juntos (transferências e liquidações).
+FORMATO_CABECALHO = struct.Struct("<BI")
+FORMATO_TRANSACAO = struct.Struct("<B4sQBqd")
+
+
+_GRUPOS_DIARIO = threading.local()
+
+
+@contextlib.contextmanager
+def grupo_diario():
+    """Junta os registros de diário feitos nesta thread em um único registro de grupo.
+
+    Um grupo cortado no final do arquivo é descartado por inteiro na recuperação.
+    """
+    if getattr(_GRUPOS_DIARIO, "pendentes", None) is not None:
+        yield # já dentro de um grupo
+        return
+
+    _GRUPOS_DIARIO.pendentes = {}
+    try:
+        yield
+    finally:
+        pendentes, _GRUPOS_DIARIO.pendentes = _GRUPOS_DIARIO.pendentes, None
+        for diario, registros in pendentes.items():
+            diario._escrever_grupo(registros)
+
+
+class Diario:
+    """Write-ahead log somente de acréscimos, com commit em grupo.
+
+    O fsync é feito a cada registros_por_fsync registros ou, em segundo plano, no máximo
+    intervalo_fsync segundos depois do primeiro registro pendente. Quem precisa confirmar
+    uma operação chama sincronizar(), que só retorna com os registros já em disco; chamadas
+    simultâneas compartilham o mesmo fsync.
+    """
+
+    def __init__(self, caminho, registros_por_fsync=256, intervalo_fsync=0.01):
+        self._arquivo = open(caminho, "ab")
+        self._registros_por_fsync = registros_por_fsync
+        self._intervalo_fsync = intervalo_fsync
+        self._pendentes = 0
+        self._escritos = 0 # sequência do último registro escrito no buffer
+        self._duraveis = 0 # sequência do último registro já em disco
+        self._trava = threading.Lock() # contas diferentes anotam a partir de threads diferentes
+        self._trava_fsync = threading.Lock() # um fsync por vez; quem espera aproveita o próximo
+        self._pendencia = threading.Event() # há registros fora do disco
+        self._fechado = False
+        self.registros = 0
+        self._sincronizador = threading.Thread(target=self._sincronizar_periodicamente, name="diario", daemon=True)
+        self._sincronizador.start()
+
+    def _escrever(self, dados, registros=1):
+        pendentes = getattr(_GRUPOS_DIARIO, "pendentes", None)
+        if pendentes is not None:
+            pendentes.setdefault(self, []).append(dados)
+            return
+
+        with self._trava:
+            self._arquivo.write(dados)
+            self._pendentes += 1
+            self._escritos += 1
+            self.registros += registros
+            cheio = self._pendentes >= self._registros_por_fsync
+        self._pendencia.set()
+        if cheio:
+            self.sincronizar()
+
+    def _escrever_grupo(self, registros):
+        conteudo = b"".join(registros)
+        self._escrever(FORMATO_CABECALHO.pack(REGISTRO_GRUPO, len(conteudo)) + conteudo, len(registros))
+
+    def _escrever_json(self, tipo_registro, dados):
+        conteudo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self._escrever(FORMATO_CABECALHO.pack(tipo_registro, len(conteudo)) + conteudo)
+
+    def anotar_cliente(self, cliente):
+        self._escrever_json(REGISTRO_CLIENTE, {
+            "cpf": cliente.cpf, "nome": cliente.nome,
+            "data_nascimento": cliente.data_nascimento, "endereco": cliente.endereco,
+        })
+
+    def anotar_conta(self, conta):
+        self._escrever_json(REGISTRO_CONTA, {
+            "agencia": conta.agencia, "numero": conta.numero, "cpf": conta.cliente.cpf,
+            "limite": conta.limite, "limite_saques": conta.limite_saques,
+        })
+
+    def anotar_idempotencia(self, chave, resultado, expira_em):
+        self._escrever_json(REGISTRO_IDEMPOTENCIA, {"chave": chave, "resultado": resultado.value, "expira": expira_em})
+
+    def anotar_transacao(self, agencia, numero, codigo, centavos, timestamp):
+        self._escrever(FORMATO_TRANSACAO.pack(
+            REGISTRO_TRANSACAO, agencia.encode("ascii"), numero, codigo, centavos, timestamp
+        ))
+
+    @property
+    def pendente(self):
+        return self._duraveis < self._escritos
+
+    def _sincronizar_periodicamente(self):
+        # Garante o prazo de intervalo_fsync para registros que ninguém sincronizou
+        while True:
+            self._pendencia.wait()
+            time.sleep(self._intervalo_fsync)
+            self._pendencia.clear() # antes de conferir: uma escrita ou fechar() posterior volta a sinalizar
+            if self._fechado:
+                return
+            if self.pendente:
+                self.sincronizar()
+
+    def sincronizar(self):
+        """Retorna só depois que todos os registros escritos até aqui estiverem em disco."""
+        alvo = self._escritos
+        if self._duraveis >= alvo:
+            return
+        with self._trava_fsync:
+            if self._duraveis >= alvo: # o fsync de outra thread já cobriu estes registros
+                return
+            with self._trava:
+                alvo = self._escritos
+                self._arquivo.flush()
+                self._pendentes = 0
+                self._pendencia.clear()
+            os.fsync(self._arquivo.fileno()) # fora da trava: novas escritas seguem no buffer
+            self._duraveis = alvo
+
+    def fechar(self):
+        self.sincronizar()
+        with self._trava_fsync, self._trava:
+            self._fechado = True
+            self._arquivo.close()
+        self._pendencia.set()
+        self._sincronizador.join()
+
+
+def ler_diario(caminho):
+    """Gera (tipo_registro, dados) de um diário. Um registro final incompleto é ignorado."""
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    return _ler_registros(conteudo, 0, len(conteudo))
+
+
+def _ler_registros(conteudo, posicao, total):
+    tamanho_transacao = FORMATO_TRANSACAO.size
+    tamanho_cabecalho = FORMATO_CABECALHO.size
+    while posicao < total:
+        if conteudo[posicao] == REGISTRO_TRANSACAO:
+            if posicao + tamanho_transacao > total:
+                return
+            yield REGISTRO_TRANSACAO, FORMATO_TRANSACAO.unpack_from(conteudo, posicao)
+            posicao += tamanho_transacao
+        else:
+            if posicao + tamanho_cabecalho > total:
+                return
+            tipo_registro, tamanho = FORMATO_CABECALHO.unpack_from(conteudo, posicao)
+            inicio = posicao + tamanho_cabecalho
+            if inicio + tamanho > total:
+                return
+            if tipo_registro == REGISTRO_GRUPO:
+                yield from _ler_registros(conteudo, inicio, inicio + tamanho)
+            else:
+                yield tipo_registro, json.loads(conteudo[inicio:inicio + tamanho])
+            posicao = inicio + tamanho
+
+
+# Snapshot binário: cabeçalho | comprimentos dos campos dos clientes | textos (UTF-8) |
+# tabela de contas (linhas de tamanho fixo) | segmentos de histórico | idempotência (JSON)
+ASSINATURA_SNAPSHOT = b"SNAPBCO2"
+# assinatura, geração, clientes, contas, bytes dos textos, posição da idempotência
+CABECALHO_SNAPSHOT = struct.Struct("<8sqQQQQ")
+# agência, número, índice do cliente, limite, limite de saques, saldo, dia (ordinal) e quantidade
+# de saques, histórico mapeado, quantidade de transações, posição do segmento do histórico
+FORMATO_CONTA_SNAPSHOT = struct.Struct("<4sQIdIdIIBQQ")
+FORMATO_CAMINHO_SNAPSHOT = struct.Struct("<H") # segmento de conta mapeada: tamanho + caminho do arquivo
+CAMPOS_SNAPSHOT_CLIENTE = 4 # cpf, nome, data_nascimento, endereco
+BYTES_POR_TRANSACAO = 17 # colunas B + q + d de Historico, gravadas uma após a outra
+
+
+class SnapshotBinario:
+    """Leitura de um snapshot binário mapeado com mmap.
+
+    As tabelas de clientes e contas são lidas na abertura; o histórico de cada conta fica
+    no arquivo até o primeiro acesso (a linha da conta guarda a posição do segmento).
+    """
+
+    CONTAS_POR_LEITURA = 4096
+
+    def __init__(self, caminho):
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (assinatura, self.geracao, self.quantidade_clientes, self.quantidade_contas, tamanho_textos,
+         self._posicao_idempotencia) = CABECALHO_SNAPSHOT.unpack_from(self._mapa, 0)
+        if assinatura != ASSINATURA_SNAPSHOT:
+            raise ValueError(f"{caminho} não é um snapshot binário")
+        self._posicao_textos = CABECALHO_SNAPSHOT.size + 4 * CAMPOS_SNAPSHOT_CLIENTE * self.quantidade_clientes
+        self._posicao_contas = self._posicao_textos + tamanho_textos
+        self.ao_carregar = None # ao_carregar(conta, historico), a cada histórico lido do arquivo
+
+    def clientes(self):
+        # Tuplas (cpf, nome, data_nascimento, endereco), fatiadas de um único texto decodificado
+        comprimentos = array("I")
+        comprimentos.frombytes(self._mapa[CABECALHO_SNAPSHOT.size:self._posicao_textos])
+        texto = self._mapa[self._posicao_textos:self._posicao_contas].decode("utf-8")
+        limites = accumulate(comprimentos, initial=0)
+        inicio = next(limites)
+        for fim_cpf, fim_nome, fim_data, fim in zip(limites, limites, limites, limites):
+            yield (texto[inicio:fim_cpf], texto[fim_cpf:fim_nome], texto[fim_nome:fim_data],
+                   texto[fim_data:fim])
+            inicio = fim
+
+    def contas(self):
+        # Linhas da tabela de contas, lidas em blocos (sem copiar a tabela inteira)
+        tamanho = FORMATO_CONTA_SNAPSHOT.size
+        fim = self._posicao_contas + self.quantidade_contas * tamanho
+        for inicio in range(self._posicao_contas, fim, tamanho * self.CONTAS_POR_LEITURA):
+            with memoryview(self._mapa)[inicio:min(fim, inicio + tamanho * self.CONTAS_POR_LEITURA)] as bloco:
+                linhas = list(FORMATO_CONTA_SNAPSHOT.iter_unpack(bloco))
+            yield from linhas
+
+    def idempotencia(self):
+        # Tuplas (chave, resultado, expira_em); a chave vira lista no JSON, como no diário
+        for chave, resultado, expira_em in json.loads(self._mapa[self._posicao_idempotencia:]):
+            yield tuple(chave), resultado, expira_em
+
+    def segmento(self, pendente):
+        # Bytes do segmento como estão no arquivo (um novo snapshot os copia sem carregar o histórico)
+        if pendente.mapeado:
+            tamanho = FORMATO_CAMINHO_SNAPSHOT.size + FORMATO_CAMINHO_SNAPSHOT.unpack_from(self._mapa, pendente.posicao)[0]
+        else:
+            tamanho = pendente.quantidade * BYTES_POR_TRANSACAO
+        return self._mapa[pendente.posicao:pendente.posicao + tamanho]
+
+    def caminho_mapeado(self, pendente):
+        # Arquivo do HistoricoMapeado de um segmento mapeado
+        tamanho, = FORMATO_CAMINHO_SNAPSHOT.unpack_from(self._mapa, pendente.posicao)
+        inicio = pendente.posicao + FORMATO_CAMINHO_SNAPSHOT.size
+        return os.fsdecode(self._mapa[inicio:inicio + tamanho])
+
+    def colunas_numpy(self, np, pendente):
+        # Colunas (tipos, valores, datas) do segmento como visões do arquivo, sem carregar o histórico na conta
+        if pendente.mapeado:
+            return _colunas_registros(np, np.memmap(
+                self.caminho_mapeado(pendente), dtype=_dtype_registro(np), mode="r",
+                offset=HistoricoMapeado.CABECALHO.size, shape=(pendente.quantidade,)))
+        posicao, quantidade = pendente.posicao, pendente.quantidade
+        return (np.frombuffer(self._mapa, dtype=np.uint8, count=quantidade, offset=posicao),
+                np.frombuffer(self._mapa, dtype="<i8", count=quantidade, offset=posicao + quantidade),
+                np.frombuffer(self._mapa, dtype="<f8", count=quantidade, offset=posicao + 9 * quantidade))
+
+    def carregar_historico(self, conta, pendente):
+        posicao, quantidade = pendente.posicao, pendente.quantidade
+        if pendente.mapeado:
+            historico = HistoricoMapeado(self.caminho_mapeado(pendente), quantidade)
+        else:
+            historico = Historico()
+            historico._tipos.frombytes(self._mapa[posicao:posicao + quantidade])
+            posicao += quantidade
+            historico._valores.frombytes(self._mapa[posicao:posicao + 8 * quantidade])
+            posicao += 8 * quantidade
+            historico._datas.frombytes(self._mapa[posicao:posicao + 8 * quantidade])
+        if self.ao_carregar:
+            self.ao_carregar(conta, historico)
+        return historico
+
+
+class Persistencia:
+    """Diário (WAL) + snapshots periódicos em um diretório.
+
+    Cada snapshot guarda o estado completo e a geração do diário que ele cobre. Após o
+    snapshot um novo diário é aberto e os antigos são apagados, o que limita o replay da
+    recuperação às operações posteriores ao último snapshot.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_DADOS, registros_por_fsync=256, registros_por_snapshot=1_000_000,
+                 transacoes_para_mapear=1_000_000):
+        os.makedirs(os.path.join(diretorio, "historicos"), exist_ok=True)
+        self._diretorio = diretorio
+        self._registros_por_fsync = registros_por_fsync
+        self._registros_por_snapshot = registros_por_snapshot
+        # Contas com pelo menos esse número de transações passam a usar HistoricoMapeado no snapshot
+        self._transacoes_para_mapear = transacoes_para_mapear
+        self._registro = None
+        self._diario = None
+        self._geracao = 0
+        self._registros_recuperados = 0 # registros repetidos dos diários que o snapshot ainda não cobre
+        self._snapshot = None # SnapshotBinario de onde vêm os históricos ainda não carregados
+        self._historico_vazio = HistoricoVazio(self._acompanhar) # marcador das contas acompanhadas
+        self.caminho_numeracao = os.path.join(diretorio, "numeracao.json")
+
+    @property
+    def registros_desde_snapshot(self):
+        return self._registros_recuperados + (self._diario.registros if self._diario else 0)
+
+    @property
+    def caminho_snapshot(self):
+        return os.path.join(self._diretorio, "snapshot.bin")
+
+    def _caminho_diario(self, geracao):
+        return os.path.join(self._diretorio, f"diario.{geracao:08d}.wal")
+
+    def _caminho_historico(self, conta):
+        return os.path.join(self._diretorio, "historicos", f"{conta.agencia}-{conta.numero}.hist")
+
+    def _diarios(self):
+        geracoes = []
+        for nome in os.listdir(self._diretorio):
+            if nome.startswith("diario.") and nome.endswith(".wal"):
+                geracoes.append(int(nome.split(".")[1]))
+        return sorted(geracoes)
+
+    def carregar(self):
+        """Recupera o estado (snapshot + replay dos diários) e passa a anotar novas operações."""
+        registro = Registro()
+        geracao_snapshot = self._carregar_snapshot(registro)
+
+        geracoes = self._diarios()
+        for geracao in geracoes:
+            if geracao > geracao_snapshot:
+                self._registros_recuperados += self._repetir_diario(self._caminho_diario(geracao), registro)
+
+        maiores = {} # maior número existente por agência, para o alocador nunca repeti-lo
+        for conta in registro.contas:
+            self._acompanhar(conta)
+            if conta.numero > maiores.get(conta.agencia, 0):
+                maiores[conta.agencia] = conta.numero
+        if self._snapshot:
+            self._snapshot.ao_carregar = self._acompanhar
+        registro.alocador = AlocadorNumeros(self.caminho_numeracao)
+        for agencia, numero in maiores.items():
+            registro.alocador.garantir_acima(agencia, numero)
+
+        # Um diário novo a cada abertura: um final incompleto do anterior nunca é continuado
+        self._geracao = max([geracao_snapshot, *geracoes]) + 1
+        self._diario = Diario(self._caminho_diario(self._geracao), self._registros_por_fsync)
+        self._registro = registro
+        registro.persistencia = self
+        IDEMPOTENCIA.persistencia = self
+        return registro
+
+    def _carregar_snapshot(self, registro):
+        if not os.path.exists(self.caminho_snapshot):
+            return -1
+        snapshot = self._snapshot = SnapshotBinario(self.caminho_snapshot)
+        clientes = [PessoaFisica(nome, data_nascimento, cpf, endereco)
+                    for cpf, nome, data_nascimento, endereco in snapshot.clientes()]
+        registro.adicionar_clientes(clientes)
+
+        agencias = {}
+        for (agencia, numero, indice_cliente, limite, limite_saques, saldo, dia_saques, saques, mapeado,
+             quantidade, posicao) in snapshot.contas():
+            if agencia not in agencias:
+                agencias[agencia] = agencia.decode("ascii")
+            cliente = clientes[indice_cliente]
+            historico = HistoricoPendente(snapshot, posicao, quantidade, mapeado) if quantidade or mapeado else None
+            conta = ContaCorrente(numero, cliente, limite, limite_saques, agencias[agencia], historico)
+            conta._saldo = saldo
+            if dia_saques:
+                contador = conta._saques_hoje = ContadorDiario()
+                contador._dia, contador._quantidade = date.fromordinal(dia_saques), saques
+            registro.adicionar_conta(conta)
+            cliente.adicionar_conta(conta)
+
+        for chave, resultado, expira_em in snapshot.idempotencia():
+            IDEMPOTENCIA.restaurar(chave, Resultado(resultado), expira_em)
+
+        return snapshot.geracao
+
+    def _repetir_diario(self, caminho, registro):
+        contas = registro._contas
+        repetidos = 0
+        for tipo_registro, dados in ler_diario(caminho):
+            repetidos += 1
+            if tipo_registro == REGISTRO_TRANSACAO:
+                _, agencia, numero, codigo, centavos, timestamp = dados
+                contas[(agencia.decode("ascii"), numero)].restaurar_transacao(codigo, centavos, timestamp)
+            elif tipo_registro == REGISTRO_CLIENTE:
+                registro.adicionar_cliente(PessoaFisica(**dados))
+            elif tipo_registro == REGISTRO_CONTA:
+                cliente = registro.buscar_cliente(dados["cpf"])
+                conta = ContaCorrente(dados["numero"], cliente, dados["limite"], dados["limite_saques"],
+                                      agencia=dados["agencia"])
+                registro.adicionar_conta(conta)
+                cliente.adicionar_conta(conta)
+            elif tipo_registro == REGISTRO_IDEMPOTENCIA:
+                IDEMPOTENCIA.restaurar(tuple(dados["chave"]), Resultado(dados["resultado"]), dados["expira"])
+        return repetidos
+
+    def _acompanhar(self, conta, historico=None):
+        if historico is None:
+            # Históricos vazios ou ainda no snapshot passam a ser acompanhados quando forem criados/lidos
+            if conta._historico is HISTORICO_VAZIO:
+                conta._historico = self._historico_vazio
+            if not conta.historico_carregado:
+                return
+            historico = conta.historico
+        historico.observar(partial(self._anotar_transacao, conta.agencia, conta.numero))
+
+    def _anotar_transacao(self, agencia, numero, codigo, centavos, timestamp):
+        self._diario.anotar_transacao(agencia, numero, codigo, centavos, timestamp)
+
+    def anotar_cliente(self, cliente):
+        self._diario.anotar_cliente(cliente)
+
+    def anotar_conta(self, conta):
+        self._diario.anotar_conta(conta)
+        self._acompanhar(conta)
+
+    def anotar_idempotencia(self, chave, resultado, expira_em):
+        self._diario.anotar_idempotencia(chave, resultado, expira_em)
+
+    @property
+    def pendente(self):
+        return self._diario.pendente
+
+    def sincronizar(self):
+        self._diario.sincronizar()
+
+    def snapshot_se_necessario(self):
+        # Chamado em pontos seguros (entre operações), nunca no meio de uma transação
+        if self.registros_desde_snapshot >= self._registros_por_snapshot:
+            self.snapshot()
+
+    def _estado_historico(self, conta):
+        historico = conta.historico
+        if not isinstance(historico, HistoricoMapeado) and len(historico) >= self._transacoes_para_mapear:
+            conta.mapear_historico(self._caminho_historico(conta))
+            historico = conta.historico
+
+        if isinstance(historico, HistoricoMapeado):
+            # O arquivo mapeado já é o armazenamento; o snapshot guarda só até onde ele vale
+            historico.sincronizar()
+            return ("mapeado", historico.caminho, len(historico))
+        return ("colunas", historico._tipos.tobytes(), historico._valores.tobytes(), historico._datas.tobytes())
+
+    def _segmento_historico(self, conta):
+        # (mapeado, quantidade, bytes do segmento) de um histórico já carregado
+        estado = self._estado_historico(conta)
+        if estado[0] == "mapeado":
+            caminho = os.fsencode(estado[1])
+            return 1, estado[2], FORMATO_CAMINHO_SNAPSHOT.pack(len(caminho)) + caminho
+        return 0, len(estado[1]), b"".join(estado[1:])
+
+    def _gravar_snapshot(self, arquivo):
+        """Grava o snapshot binário; devolve os históricos pendentes copiados e as novas posições deles."""
+        clientes = list(self._registro.clientes)
+        contas = list(self._registro.contas)
+        bloco = SnapshotBinario.CONTAS_POR_LEITURA
+
+        def campos(inicio):
+            return [campo for cliente in clientes[inicio:inicio + bloco]
+                    for campo in (cliente.cpf, cliente.nome, cliente.data_nascimento, cliente.endereco)]
+
+        arquivo.write(bytes(CABECALHO_SNAPSHOT.size)) # preenchido ao final, com os tamanhos
+        for inicio in range(0, len(clientes), bloco):
+            arquivo.write(array("I", map(len, campos(inicio))).tobytes())
+        tamanho_textos = 0
+        for inicio in range(0, len(clientes), bloco):
+            tamanho_textos += arquivo.write("".join(campos(inicio)).encode("utf-8"))
+
+        # A tabela de contas é escrita em blocos na sua região; os segmentos, depois dela
+        indices = {id(cliente): indice for indice, cliente in enumerate(clientes)}
+        posicao_linhas = arquivo.tell()
+        posicao = posicao_linhas + len(contas) * FORMATO_CONTA_SNAPSHOT.size
+        pendentes, posicoes = [], array("Q")
+        for inicio in range(0, len(contas), bloco):
+            linhas, segmentos, posicao_segmentos = bytearray(), [], posicao
+            for conta in contas[inicio:inicio + bloco]:
+                if conta.historico_carregado:
+                    mapeado, quantidade, segmento = self._segmento_historico(conta)
+                elif conta._historico.__class__ is HistoricoVazio:
+                    mapeado, quantidade, segmento = 0, 0, b""
+                else:
+                    pendente = conta._historico
+                    mapeado, quantidade = pendente.mapeado, pendente.quantidade
+                    segmento = pendente.snapshot.segmento(pendente)
+                    pendentes.append(pendente)
+                    posicoes.append(posicao)
+                saques = conta._saques_hoje # sem criar o contador das contas que nunca sacaram
+                dia_saques = saques._dia.toordinal() if saques and saques._dia else 0
+                numero_saques = saques._quantidade if dia_saques else 0
+                linhas += FORMATO_CONTA_SNAPSHOT.pack(
+                    conta.agencia.encode("ascii"), conta.numero, indices[id(conta.cliente)], conta.limite,
+                    conta.limite_saques, conta.saldo, dia_saques, numero_saques, mapeado, quantidade, posicao,
+                )
+                segmentos.append(segmento)
+                posicao += len(segmento)
+            arquivo.seek(posicao_linhas)
+            posicao_linhas += arquivo.write(linhas)
+            arquivo.seek(posicao_segmentos)
+            arquivo.writelines(segmentos)
+
+        arquivo.seek(posicao)
+        arquivo.write(json.dumps(IDEMPOTENCIA.exportar(), ensure_ascii=False).encode("utf-8"))
+        arquivo.seek(0)
+        arquivo.write(CABECALHO_SNAPSHOT.pack(ASSINATURA_SNAPSHOT, self._geracao, len(clientes), len(contas),
+                                              tamanho_textos, posicao))
+        return pendentes, posicoes
+
+    def snapshot(self):
+        self._diario.fechar()
+        temporario = self.caminho_snapshot + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            pendentes, posicoes = self._gravar_snapshot(arquivo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho_snapshot) # troca atômica: ou o snapshot antigo, ou o novo
+
+        # Históricos ainda não lidos passam a apontar para o snapshot novo (o antigo é liberado)
+        self._snapshot = SnapshotBinario(self.caminho_snapshot)
+        self._snapshot.ao_carregar = self._acompanhar
+        for pendente, posicao in zip(pendentes, posicoes):
+            pendente.snapshot, pendente.posicao = self._snapshot, posicao
+
+        for geracao in self._diarios():
+            if geracao <= self._geracao:
+                os.remove(self._caminho_diario(geracao))
+
+        self._geracao += 1
+        self._diario = Diario(self._caminho_diario(self._geracao), self._registros_por_fsync)
+        self._registros_recuperados = 0
+
+    def fechar(self, snapshot=True):
+        if snapshot and self.registros_desde_snapshot:
+            self.snapshot()
+        self._diario.fechar()
+        if IDEMPOTENCIA.persistencia is self:
+            IDEMPOTENCIA.persistencia = None
+        if self._registro is not None:
+            self._registro.alocador.devolver() # as contas criadas já estão no diário
+
+        caminho = self._caminho_diario(self._geracao)
+        if os.path.getsize(caminho) == 0: # não deixa diários vazios acumulando entre sessões
+            os.remove(caminho)
+
+
+# ==================== EXTRATO (GERAÇÃO SOB DEMANDA) ====================
+
+class ExtratoRenderizado:
+    # Linhas já formatadas de uma conta e os totais acumulados até a última renderização
+    def __init__(self):
+        self.linhas = []
+        self.depositos = 0 # centavos
+        self.saques = 0 # centavos
+
+
+class CacheExtratos:
+    """Extratos formatados por conta, atualizados só com as transações novas.
+
+    Cada conta guarda o seu ExtratoRenderizado; este objeto controla o orçamento global
+    de linhas e descarta os extratos das contas usadas há mais tempo (LRU). Contas com
+    mais de linhas_por_conta transações não são guardadas e são formatadas sob demanda.
+    """
+
+    def __init__(self, limite_linhas=2_000_000, linhas_por_conta=100_000):
+        self._limite_linhas = limite_linhas
+        self._linhas_por_conta = linhas_por_conta
+        self._contas = OrderedDict() # (agência, número) -> conta, da menos para a mais recente
+        self._linhas = 0
+        self._trava = threading.Lock()
+        self.acertos = 0 # extrato já estava atualizado
+        self.parciais = 0 # só as transações novas foram formatadas
+        self.faltas = 0 # extrato montado do zero
+        self.descartes = 0
+
+    def _atualizar(self, conta):
+        chave = (conta.agencia, conta.numero)
+        extrato = conta._cache_extrato
+        if extrato is None:
+            self.faltas += 1
+            extrato = conta._cache_extrato = ExtratoRenderizado()
+        elif len(extrato.linhas) == len(conta.historico):
+            self.acertos += 1
+        else:
+            self.parciais += 1
+
+        renderizadas = len(extrato.linhas)
+        for codigo, centavos, _ in conta.historico.registros(renderizadas, len(conta.historico)):
+            if SINAIS_TRANSACAO[codigo] > 0:
+                extrato.depositos += centavos
+            else:
+                extrato.saques += centavos
+        extrato.linhas.extend(conta.historico.linhas(renderizadas, len(conta.historico)))
+        self._linhas += len(extrato.linhas) - renderizadas
+
+        self._contas[chave] = conta
+        self._contas.move_to_end(chave)
+        while self._linhas > self._limite_linhas and len(self._contas) > 1:
+            _, fria = self._contas.popitem(last=False)
+            self._linhas -= len(fria._cache_extrato.linhas)
+            fria._cache_extrato = None
+            self.descartes += 1
+        return extrato
+
+    def linhas(self, conta, inicio=0, fim=None):
+        if len(conta.historico) > self._linhas_por_conta:
+            return conta.historico.linhas(inicio, fim)
+        with self._trava:
+            return iter(self._atualizar(conta).linhas[inicio:fim])
+
+    def totais(self, conta):
+        """Totais (depósitos, saques) em reais, sem reformatar o histórico inteiro."""
+        if len(conta.historico) > self._linhas_por_conta:
+            depositos = saques = 0
+            for codigo, centavos, _ in conta.historico.registros():
+                if SINAIS_TRANSACAO[codigo] > 0:
+                    depositos += centavos
+                else:
+                    saques += centavos
+            return depositos / 100, saques / 100
+        with self._trava:
+            extrato = self._atualizar(conta)
+            return extrato.depositos / 100, extrato.saques / 100
+
+    def estatisticas(self):
+        return {
+            "acertos": self.acertos,
+            "parciais": self.parciais,
+            "faltas": self.faltas,
+            "descartes": self.descartes,
+            "contas": len(self._contas),
+            "linhas": self._linhas,
+        }
+
+
+CACHE_EXTRATOS = CacheExtratos()
+
+
+def pagina_extrato(conta, cursor=0, tamanho_pagina=None, usar_cache=True):
+    """Devolve (gerador de linhas, próximo cursor). O cursor é None quando não há mais páginas."""
+    total = len(conta.historico)
+    fim = total if tamanho_pagina is None else min(total, cursor + tamanho_pagina)
+    proximo_cursor = fim if fim < total else None
+    origem = CACHE_EXTRATOS.linhas if usar_cache else lambda conta, inicio, fim: conta.historico.linhas(inicio, fim)
+
+    def gerar():
+        if cursor == 0:
+            yield "\n================ EXTRATO ================\n"
+            if not total:
+                yield "Não foram realizadas movimentações.\n"
+        yield from origem(conta, cursor, fim)
+        if proximo_cursor is None:
+            yield f"\nSaldo:\t\tR$ {conta.saldo:.2f}\n"
+            yield "==========================================\n"
+
+    return gerar(), proximo_cursor
+
+
+def escrever_linhas(linhas, saida=None, linhas_por_escrita=1000):
+    # Agrupa as linhas em blocos para fazer uma única escrita por bloco (memória limitada ao bloco)
+    saida = saida or sys.stdout
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= linhas_por_escrita:
+            saida.write("".join(bloco))
+            bloco.clear()
+    if bloco:
+        saida.write("".join(bloco))
+
+
+# ==================== PROCESSAMENTO EM LOTE ====================
+
+TRANSACOES_LOTE = {
+    "d": Deposito, "deposito": Deposito, "s": Saque, "saque": Saque,
+    "t": Transferencia, "transferencia": Transferencia,
+}
+CAMPOS_RESULTADO = ["linha", "cpf", "conta", "tipo", "valor", "status", "motivo"]
+CAMPOS_LIQUIDACAO = ["linha", "cpf", "conta", "destino", "valor", "status", "motivo"]
+
+
+def ler_operacoes(arquivo, formato):
+    # Gera dicionários {cpf, conta, tipo, valor} sem carregar o arquivo inteiro
+    if formato == "jsonl":
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+    else:
+        yield from csv.DictReader(arquivo)
+
+
+def aplicar_operacao(registro, operacao):
+    """Aplica uma operação do lote e devolve (status, motivo)."""
+    tipo_transacao = TRANSACOES_LOTE.get(str(operacao.get("tipo", "")).lower())
+    if tipo_transacao is None:
+        return "falha", "tipo inválido"
+
+    try:
+        numero_conta = int(operacao["conta"])
+        valor = float(operacao["valor"])
+    except (KeyError, OverflowError, TypeError, ValueError): # OverflowError: conta = 1e999
+        return "falha", "conta ou valor inválido"
+
+    cliente = filtrar_cliente(str(operacao.get("cpf", "")), registro)
+    if not cliente:
+        return "falha", "cliente não encontrado"
+
+    conta = recuperar_conta_cliente(registro, cliente, numero_conta)
+    if not conta:
+        return "falha", "conta não encontrada"
+
+    if tipo_transacao is Transferencia:
+        destino = _conta_destino(registro, operacao)
+        if destino is None:
+            return "falha", "conta destino não encontrada"
+        transacao = Transferencia(valor, destino, operacao.get("chave") or None)
+    else:
+        transacao = tipo_transacao(valor, operacao.get("chave") or None)
+
+    resultado = cliente.realizar_transacao(conta, transacao)
+    return ("ok", "") if resultado else ("falha", resultado.value)
+
+
+def _conta_destino(registro, operacao):
+    try:
+        return registro.buscar_conta(int(operacao["destino"]), operacao.get("agencia_destino") or AGENCIA)
+    except (KeyError, OverflowError, TypeError, ValueError):
+        return None
+
+
+def liquidar_transferencias(registro, transferencias):
+    """Liquida um lote de transferências pelo saldo líquido de cada conta.
+
+    As transferências ({cpf, conta, destino, valor}) são validadas uma a uma e somadas por
+    conta; se o saldo de uma conta ficaria negativo, as suas últimas saídas são recusadas
+    até cobrir a diferença e a soma é refeita. Cada conta movimentada recebe um único lançamento (enviada ou recebida)
+    e a liquidação inteira vai para o diário como um grupo. Devolve (status, motivo) por
+    transferência, na ordem de entrada.
+    """
+    resultados = []
+    validas = [] # (índice, origem, destino, centavos)
+    for operacao in transferencias:
+        try:
+            numero_conta = int(operacao["conta"])
+            centavos = round(float(operacao["valor"]) * 100)
+        except (KeyError, OverflowError, TypeError, ValueError):
+            resultados.append(("falha", "conta ou valor inválido"))
+            continue
+
+        cliente = filtrar_cliente(str(operacao.get("cpf", "")), registro)
+        origem = recuperar_conta_cliente(registro, cliente, numero_conta) if cliente else None
+        destino = _conta_destino(registro, operacao)
+        if origem is None:
+            resultados.append(("falha", "conta não encontrada"))
+        elif destino is None or destino is origem:
+            resultados.append(("falha", Resultado.DESTINO_INVALIDO.value))
+        elif not 0 < centavos <= VALOR_MAXIMO * 100:
+            resultados.append(("falha", Resultado.VALOR_INVALIDO.value))
+        else:
+            validas.append((len(resultados), origem, destino, centavos))
+            resultados.append(("ok", ""))
+
+    contas = {conta for _, origem, destino, _ in validas for conta in (origem, destino)}
+    with travas_em_ordem(contas), grupo_diario():
+        recusadas = set()
+        while True:
+            liquido = dict.fromkeys(contas, 0)
+            for _, origem, destino, centavos in validas:
+                liquido[origem] -= centavos
+                liquido[destino] += centavos
+            faltas = {conta: round(conta.saldo * 100) + delta for conta, delta in liquido.items() if delta < 0}
+            faltas = {conta: falta for conta, falta in faltas.items() if falta < 0}
+            if not faltas:
+                break
+            # Cada volta recusa ao menos uma saída; créditos perdidos pelos destinos entram na volta seguinte
+            mantidas = []
+            for transferencia in reversed(validas):
+                indice, origem, _, centavos = transferencia
+                if faltas.get(origem, 0) < 0:
+                    faltas[origem] += centavos
+                    recusadas.add(indice)
+                else:
+                    mantidas.append(transferencia)
+            validas = mantidas[::-1]
+
+        for conta, delta in liquido.items():
+            if delta:
+                conta._saldo += delta / 100
+                codigo = "Transferencia recebida" if delta > 0 else "Transferencia enviada"
+                conta.historico.adicionar_transacao(Transferencia(abs(delta) / 100, None), CODIGOS_TRANSACAO[codigo])
+
+    for indice in recusadas:
+        resultados[indice] = ("falha", Resultado.SALDO_INSUFICIENTE.value)
+    return resultados
+
+
+def liquidar_arquivo(registro, entrada, saida):
+    """Liquida um CSV de transferências (cpf, conta, destino, valor) e grava o resultado de cada linha."""
+    inicio = time.perf_counter()
+    with open(entrada, newline="", encoding="utf-8") as arquivo:
+        transferencias = list(csv.DictReader(arquivo))
+    resultados = liquidar_transferencias(registro, transferencias)
+
+    with open(saida, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(CAMPOS_LIQUIDACAO)
+        escritor.writerows(
+            (linha, operacao.get("cpf"), operacao.get("conta"), operacao.get("destino"), operacao.get("valor"),
+             status, motivo)
+            for linha, (operacao, (status, motivo)) in enumerate(zip(transferencias, resultados), 1)
+        )
+    if registro.persistencia:
+        registro.persistencia.sincronizar()
+
+    segundos = time.perf_counter() - inicio
+    sucessos = sum(status == "ok" for status, _ in resultados)
+    return {
+        "total": len(resultados),
+        "sucessos": sucessos,
+        "falhas": len(resultados) - sucessos,
+        "segundos": segundos,
+        "operacoes_por_segundo": len(resultados) / segundos if segundos else 0.0,
+    }
+
+
+def processar_lote(registro, entrada, saida, tamanho_lote=TAMANHO_LOTE):
+    """Aplica um arquivo CSV/JSONL de operações e grava o resultado de cada registro em CSV.
+
+    O arquivo é lido e os resultados são gravados em blocos de tamanho_lote. Devolve o
+    relatório de vazão (total, sucessos, falhas, segundos e operações por segundo).
+    """
+    formato = "jsonl" if str(entrada).endswith((".jsonl", ".json")) else "csv"
+    total = sucessos = 0
+    inicio = time.perf_counter()
+
+    with open(entrada, newline="", encoding="utf-8") as arquivo_entrada, \
+            open(saida, "w", newline="", encoding="utf-8") as arquivo_saida, \
+            usando_notificador(NotificadorNulo()):
+        # O resultado de cada operação vai para o CSV; nenhuma mensagem por transação
+        escritor = csv.writer(arquivo_saida)
+        escritor.writerow(CAMPOS_RESULTADO)
+        operacoes = ler_operacoes(arquivo_entrada, formato)
+
+        while bloco := list(islice(operacoes, tamanho_lote)):
+            resultados = []
+            for operacao in bloco:
+                total += 1
+                status, motivo = aplicar_operacao(registro, operacao)
+                sucessos += status == "ok"
+                resultados.append((total, operacao.get("cpf"), operacao.get("conta"),
+                                   operacao.get("tipo"), operacao.get("valor"), status, motivo))
+            escritor.writerows(resultados)
+            if registro.persistencia:
+                registro.persistencia.snapshot_se_necessario()
+
+        if registro.persistencia:
+            registro.persistencia.sincronizar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "total": total,
+        "sucessos": sucessos,
+        "falhas": total - sucessos,
+        "segundos": segundos,
+        "operacoes_por_segundo": total / segundos if segundos else 0.0,
+    }
+
+
+def exibir_relatorio_lote(relatorio):
+    print("\n================ LOTE ================")
+    print(f"Operações:\t{relatorio['total']}")
+    print(f"Sucessos:\t{relatorio['sucessos']}")
+    print(f"Falhas:\t\t{relatorio['falhas']}")
+    print(f"Tempo:\t\t{relatorio['segundos']:.2f} s")
+    print(f"Vazão:\t\t{relatorio['operacoes_por_segundo']:,.0f} op/s")
+    print("======================================")
+
+
+# ==================== IMPORTAÇÃO DE CLIENTES ====================
+
+CAMPOS_CLIENTE = ("cpf", "nome", "data_nascimento", "endereco")
+CAMPOS_REJEITADO = ["linha", "cpf", "motivo"]
+TAMANHO_LOTE_CLIENTES = 50_000
+
+
+def normalizar_cpf(cpf):
+    return cpf.strip().replace(".", "").replace("-", "")
+
+
+def cpf_valido(cpf):
+    # Formato (11 dígitos, não todos iguais) e os dois dígitos verificadores
+    if len(cpf) != 11 or not (cpf.isascii() and cpf.isdigit()) or cpf == cpf[0] * 11:
+        return False
+    digitos = [int(digito) for digito in cpf]
+    for posicao in (9, 10):
+        soma = sum(digito * peso for digito, peso in zip(digitos, range(posicao + 1, 1, -1)))
+        if soma * 10 % 11 % 10 != digitos[posicao]:
+            return False
+    return True
+
+
+def validar_cpfs(cpfs):
+    """Valida uma lista de CPFs normalizados de uma vez e devolve uma lista de bool.
+
+    Com NumPy, os dígitos viram uma matriz (n, 11) e os verificadores saem de dois
+    produtos matriciais; sem NumPy, cada CPF passa por cpf_valido.
+    """
+    try:
+        np = _numpy()
+    except RuntimeError:
+        return [cpf_valido(cpf) for cpf in cpfs]
+
+    validos = np.zeros(len(cpfs), dtype=bool)
+    formato = [indice for indice, cpf in enumerate(cpfs) if len(cpf) == 11 and cpf.isascii() and cpf.isdigit()]
+    if not formato:
+        return validos.tolist()
+
+    texto = "".join([cpfs[indice] for indice in formato]).encode("ascii")
+    digitos = (np.frombuffer(texto, dtype=np.uint8).reshape(-1, 11) - ord("0")).astype(np.int32)
+    primeiro = (digitos[:, :9] @ np.arange(10, 1, -1)) * 10 % 11 % 10
+    segundo = (digitos[:, :10] @ np.arange(11, 1, -1)) * 10 % 11 % 10
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)
+    validos[formato] = (primeiro == digitos[:, 9]) & (segundo == digitos[:, 10]) & ~repetidos
+    return validos.tolist()
+
+
+def importar_clientes(registro, entrada, rejeitados=None, tamanho_lote=TAMANHO_LOTE_CLIENTES):
+    """Importa clientes de um CSV (cpf, nome, data_nascimento, endereco) em blocos.
+
+    Cada bloco tem os CPFs validados de uma vez, os repetidos descartados por conjunto
+    (no arquivo e no registro) e os PessoaFisica incluídos com Registro.adicionar_clientes.
+    As linhas recusadas vão para o CSV rejeitados, quando informado. Devolve o relatório.
+    """
+    total = importados = 0
+    motivos = {}
+    vistos = set()
+    inicio = time.perf_counter()
+
+    with contextlib.ExitStack() as pilha:
+        leitor = csv.reader(pilha.enter_context(open(entrada, newline="", encoding="utf-8")))
+        escritor = None
+        if rejeitados:
+            escritor = csv.writer(pilha.enter_context(open(rejeitados, "w", newline="", encoding="utf-8")))
+            escritor.writerow(CAMPOS_REJEITADO)
+
+        cabecalho = [campo.strip() for campo in next(leitor, ())]
+        try:
+            posicoes = [cabecalho.index(campo) for campo in CAMPOS_CLIENTE]
+        except ValueError:
+            raise ValueError(f"cabeçalho esperado: {','.join(CAMPOS_CLIENTE)}") from None
+        largura = max(posicoes) + 1
+
+        while bloco := list(islice(leitor, tamanho_lote)):
+            recusas = []
+            linhas = {}
+            novos = []
+            cpfs = [normalizar_cpf(linha[posicoes[0]]) if len(linha) >= largura else "" for linha in bloco]
+
+            for numero, (linha, cpf, valido) in enumerate(zip(bloco, cpfs, validar_cpfs(cpfs)), total + 2):
+                if len(linha) < largura:
+                    recusas.append((numero, "", "campos ausentes"))
+                elif not valido:
+                    recusas.append((numero, cpf, "cpf inválido"))
+                elif cpf in vistos:
+                    recusas.append((numero, cpf, "cpf repetido no arquivo"))
+                else:
+                    vistos.add(cpf)
+                    linhas[cpf] = numero
+                    _, nome, data_nascimento, endereco = (linha[posicao] for posicao in posicoes)
+                    novos.append(PessoaFisica(nome, data_nascimento, cpf, endereco))
+            total += len(bloco)
+
+            existentes = registro.adicionar_clientes(novos)
+            importados += len(novos) - len(existentes)
+            recusas += [(linhas[cpf], cpf, "cpf já cadastrado") for cpf in existentes]
+
+            for _, _, motivo in recusas:
+                motivos[motivo] = motivos.get(motivo, 0) + 1
+            if escritor:
+                escritor.writerows(sorted(recusas))
+            if registro.persistencia:
+                registro.persistencia.snapshot_se_necessario()
+
+    if registro.persistencia:
+        registro.persistencia.sincronizar()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "total": total,
+        "importados": importados,
+        "rejeitados": total - importados,
+        "motivos": motivos,
+        "segundos": segundos,
+        "linhas_por_minuto": total / segundos * 60 if segundos else 0.0,
+    }
+
+
+def exibir_relatorio_importacao(relatorio):
+    print("\n============ IMPORTAÇÃO ============")
+    print(f"Linhas:\t\t{relatorio['total']}")
+    print(f"Importados:\t{relatorio['importados']}")
+    print(f"Rejeitados:\t{relatorio['rejeitados']}")
+    for motivo, quantidade in sorted(relatorio["motivos"].items()):
+        print(f"  {motivo}:\t{quantidade}")
+    print(f"Tempo:\t\t{relatorio['segundos']:.2f} s")
+    print(f"Vazão:\t\t{relatorio['linhas_por_minuto']:,.0f} linhas/min")
+    print("====================================")
+
+
+# ==================== EXECUÇÃO EM PROCESSOS (SHARDS) ====================
+
+CAMPOS_OPERACAO = ("cpf", "conta", "tipo", "valor")
+
+
+def _trabalhador_shard(conexao):
+    # Cada processo é dono das contas do seu shard (objetos ContaCorrente e Historico próprios)
+    registro = Registro()
+    with usando_notificador(NotificadorNulo()):
+        while True:
+            comando, dados = conexao.recv()
+            if comando == "operacoes":
+                conexao.send([aplicar_operacao(registro, dict(zip(CAMPOS_OPERACAO, operacao))) for operacao in dados])
+            elif comando == "abrir_conta":
+                numero, cpf, nome, data_nascimento, endereco = dados
+                cliente = registro.buscar_cliente(cpf)
+                if cliente is None:
+                    cliente = PessoaFisica(nome, data_nascimento, cpf, endereco)
+                    registro.adicionar_cliente(cliente)
+                conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero)
+                conexao.send(registro.adicionar_conta(conta))
+                cliente.adicionar_conta(conta)
+            elif comando == "listar_contas":
+                conexao.send([(conta.agencia, conta.numero, conta.cliente.nome, conta.saldo) for conta in registro.contas])
+            elif comando == "parar":
+                conexao.close()
+                return
+
+
+class RoteadorShards:
+    """Distribui as contas entre processos pelo número (numero % shards).
+
+    As operações (cpf, conta, tipo, valor) são agrupadas por shard e enviadas em lote
+    pelos pipes; todos os lotes são enviados antes de qualquer resposta ser lida, então
+    os shards trabalham ao mesmo tempo. Consultas que envolvem todas as contas são
+    espalhadas para os shards e os resultados, reunidos no roteador.
+    """
+
+    def __init__(self, shards=4):
+        metodos = multiprocessing.get_all_start_methods()
+        contexto = multiprocessing.get_context("fork" if "fork" in metodos else "spawn")
+        self._conexoes = []
+        self._processos = []
+        for _ in range(shards):
+            conexao, conexao_filho = contexto.Pipe()
+            processo = contexto.Process(target=_trabalhador_shard, args=(conexao_filho,), daemon=True)
+            processo.start()
+            conexao_filho.close()
+            self._conexoes.append(conexao)
+            self._processos.append(processo)
+
+    @property
+    def shards(self):
+        return len(self._conexoes)
+
+    def _shard(self, numero_conta):
+        return int(numero_conta) % len(self._conexoes)
+
+    def abrir_conta(self, numero, cpf, nome, data_nascimento, endereco):
+        conexao = self._conexoes[self._shard(numero)]
+        conexao.send(("abrir_conta", (numero, cpf, nome, data_nascimento, endereco)))
+        return conexao.recv()
+
+    def executar(self, operacoes):
+        """Aplica operações (cpf, conta, tipo, valor) e devolve (status, motivo) na ordem de entrada."""
+        lotes = [[] for _ in self._conexoes]
+        posicoes = [[] for _ in self._conexoes]
+        for posicao, operacao in enumerate(operacoes):
+            try:
+                shard = self._shard(operacao[1])
+            except (TypeError, ValueError):
+                shard = 0 # o shard devolve "conta ou valor inválido"
+            lotes[shard].append(operacao)
+            posicoes[shard].append(posicao)
+
+        for conexao, lote in zip(self._conexoes, lotes):
+            if lote:
+                conexao.send(("operacoes", lote))
+
+        resultados = [None] * sum(len(lote) for lote in lotes)
+        for conexao, lote, posicoes_shard in zip(self._conexoes, lotes, posicoes):
+            if lote:
+                for posicao, resultado in zip(posicoes_shard, conexao.recv()):
+                    resultados[posicao] = resultado
+        return resultados
+
+    def listar_contas(self):
+        for conexao in self._conexoes:
+            conexao.send(("listar_contas", None))
+        contas = [conta for conexao in self._conexoes for conta in conexao.recv()]
+        return sorted(contas, key=lambda conta: (conta[0], conta[1]))
+
+    def fechar(self):
+        for conexao in self._conexoes:
+            conexao.send(("parar", None))
+            conexao.close()
+        for processo in self._processos:
+            processo.join()
+
+
+# ==================== RELATÓRIOS (NUMPY) ====================
+# NumPy é opcional: só é importado quando um relatório é pedido.
+
+FAIXAS_SALDO = (0, 100, 1_000, 10_000, 100_000, float("inf")) # em reais
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as erro:
+        raise RuntimeError("Os relatórios exigem NumPy (pip install numpy).") from erro
+    return numpy
+
+
+def _dtype_registro(np):
+    # Um registro de HistoricoMapeado (Historico.FORMATO) como dtype estruturado
+    return np.dtype([("tipo", "u1"), ("valor", "<i8"), ("data", "<f8")])
+
+
+def _colunas_registros(np, registros):
+    return registros["tipo"], registros["valor"], registros["data"]
+
+
+def _colunas_numpy(np, historico):
+    # Visões sem cópia sobre o armazenamento do histórico (arrays, arquivo mapeado ou segmento
+    # do snapshot); marcadores de históricos não carregados continuam na conta como estão
+    if historico.__class__ is HistoricoVazio:
+        return np.empty(0, np.uint8), np.empty(0, np.int64), np.empty(0, np.float64)
+    if historico.__class__ is HistoricoPendente:
+        return historico.snapshot.colunas_numpy(np, historico)
+    if isinstance(historico, HistoricoMapeado):
+        return _colunas_registros(np, np.frombuffer(historico._mapa, dtype=_dtype_registro(np), count=len(historico),
+                                                    offset=HistoricoMapeado.CABECALHO.size))
+    return (np.frombuffer(historico._tipos, dtype=np.uint8), np.frombuffer(historico._valores, dtype=np.int64),
+            np.frombuffer(historico._datas, dtype=np.float64))
+
+
+def exportar_arrays(registro):
+    """Exporta contas e históricos para arrays NumPy.
+
+    Contas: agencia (índice em "agencias"), numero e saldo em centavos.
+    Transações: conta (índice da conta), tipo (código), centavos e data (epoch).
+    """
+    np = _numpy()
+    contas = list(registro.contas)
+    agencias = sorted({conta.agencia for conta in contas})
+    indice_agencia = {agencia: indice for indice, agencia in enumerate(agencias)}
+
+    # _historico, não historico: um relatório não deve carregar o histórico de cada conta
+    colunas = [_colunas_numpy(np, conta._historico) for conta in contas]
+    tamanhos = np.fromiter((len(tipos) for tipos, _, _ in colunas), dtype=np.int64, count=len(contas))
+
+    def juntar(posicao, tipo):
+        return np.concatenate([coluna[posicao] for coluna in colunas]) if colunas else np.empty(0, dtype=tipo)
+
+    return {
+        "agencias": agencias,
+        "conta_agencia": np.fromiter((indice_agencia[conta.agencia] for conta in contas), dtype=np.int64, count=len(contas)),
+        "conta_numero": np.fromiter((conta.numero for conta in contas), dtype=np.int64, count=len(contas)),
+        "conta_saldo": np.fromiter((round(conta.saldo * 100) for conta in contas), dtype=np.int64, count=len(contas)),
+        "transacao_conta": np.repeat(np.arange(len(contas)), tamanhos),
+        "transacao_tipo": juntar(0, np.uint8),
+        "transacao_centavos": juntar(1, np.int64),
+        "transacao_data": juntar(2, np.float64),
+    }
+
+
+def relatorio_bancario(dados, top=10, faixas=FAIXAS_SALDO):
+    """Agregados do banco inteiro a partir de exportar_arrays, todos vetorizados."""
+    np = _numpy()
+    depositos = dados["transacao_tipo"] == CODIGOS_TRANSACAO["Deposito"]
+    agencia_transacao = dados["conta_agencia"][dados["transacao_conta"]]
+    por_agencia = np.bincount(agencia_transacao[depositos], weights=dados["transacao_centavos"][depositos],
+                              minlength=len(dados["agencias"]))
+
+    quantidades, _ = np.histogram(dados["conta_saldo"] / 100, bins=np.array(faixas, dtype=float))
+
+    saldos = dados["conta_saldo"]
+    maiores = np.argpartition(-saldos, top - 1)[:top] if len(saldos) > top else np.arange(len(saldos))
+    maiores = maiores[np.argsort(-saldos[maiores], kind="stable")]
+
+    # Dia local de cada transação (deslocamento UTC atual; mudanças de horário de verão são ignoradas)
+    deslocamento = time.localtime().tm_gmtoff
+    dias = np.floor((dados["transacao_data"] + deslocamento) / 86400).astype(np.int64)
+    dias_unicos, posicoes = np.unique(dias, return_inverse=True)
+    volume = np.bincount(posicoes, weights=dados["transacao_centavos"], minlength=len(dias_unicos))
+    quantidade_dia = np.bincount(posicoes, minlength=len(dias_unicos))
+    epoca = date(1970, 1, 1).toordinal()
+
+    return {
+        "depositos_por_agencia": {
+            agencia: float(total) / 100 for agencia, total in zip(dados["agencias"], por_agencia)
+        },
+        "distribuicao_saldos": [
+            (faixas[i], faixas[i + 1], int(quantidade)) for i, quantidade in enumerate(quantidades)
+        ],
+        "top_contas": [
+            (dados["agencias"][dados["conta_agencia"][i]], int(dados["conta_numero"][i]), int(saldos[i]) / 100)
+            for i in maiores
+        ],
+        "volume_diario": [
+            (date.fromordinal(epoca + int(dia)), float(total) / 100, int(quantidade))
+            for dia, total, quantidade in zip(dias_unicos, volume, quantidade_dia)
+        ],
+    }
+
+
+def exibir_relatorio_bancario(relatorio):
+    print("\n============== RELATÓRIO DO BANCO ==============")
+    print("Depósitos por agência:")
+    for agencia, total in relatorio["depositos_por_agencia"].items():
+        print(f"  {agencia}:\t\tR$ {total:,.2f}")
+    print("Distribuição de saldos:")
+    for inicio, fim, quantidade in relatorio["distribuicao_saldos"]:
+        print(f"  R$ {inicio:,.0f} a {'...' if fim == float('inf') else f'R$ {fim:,.0f}'}:\t{quantidade}")
+    print("Maiores saldos:")
+    for agencia, numero, saldo in relatorio["top_contas"]:
+        print(f"  {agencia} / {numero}:\tR$ {saldo:,.2f}")
+    print("Volume diário:")
+    for dia, total, quantidade in relatorio["volume_diario"]:
+        print(f"  {dia.strftime('%d-%m-%Y')}:\tR$ {total:,.2f} ({quantidade} transações)")
+    print("================================================")
+
+
+# ==================== INSTRUMENTAÇÃO (MÉTRICAS) ====================
+
+class HistogramaLatencia:
+    """Histograma log-linear no estilo HDR: 16 subdivisões por potência de 2 (erro < 6,25%).
+
+    Memória fixa, registro O(1) e percentis sem guardar as amostras.
+    """
+
+    SUBDIVISOES_BITS = 4
+
+    def __init__(self):
+        self._baldes = {}
+        self.contagem = 0
+        self.soma = 0
+        self.maximo = 0
+
+    def _balde(self, valor):
+        expoente = valor.bit_length()
+        if expoente <= self.SUBDIVISOES_BITS:
+            return valor
+        deslocamento = expoente - self.SUBDIVISOES_BITS - 1
+        return (deslocamento + 1 << self.SUBDIVISOES_BITS) + (valor >> deslocamento) - (1 << self.SUBDIVISOES_BITS)
+
+    def _limite_superior(self, balde):
+        if balde < 1 << self.SUBDIVISOES_BITS + 1:
+            return balde
+        deslocamento = (balde >> self.SUBDIVISOES_BITS) - 1
+        base = (balde & ((1 << self.SUBDIVISOES_BITS) - 1)) + (1 << self.SUBDIVISOES_BITS)
+        return ((base + 1) << deslocamento) - 1
+
+    def registrar(self, valor):
+        balde = self._balde(valor)
+        self._baldes[balde] = self._baldes.get(balde, 0) + 1
+        self.contagem += 1
+        self.soma += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, fracao):
+        alvo = fracao * self.contagem
+        acumulado = 0
+        for balde in sorted(self._baldes):
+            acumulado += self._baldes[balde]
+            if acumulado >= alvo:
+                return min(self._limite_superior(balde), self.maximo)
+        return self.maximo
+
+
+class Instrumentacao:
+    """Contadores, histogramas de latência e registro de operações lentas (opcional).
+
+    Desativada, não existe nenhum custo: os métodos originais ficam intactos. ativar()
+    troca os alvos por versões medidas e desativar() devolve os originais.
+    """
+
+    QUANTIS = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self, limite_lento_ms=50.0, operacoes_lentas=100):
+        self.ativa = False
+        self._limite_lento_ns = int(limite_lento_ms * 1e6)
+        self._histogramas = {}
+        self._falhas = {}
+        self._lentas = deque(maxlen=operacoes_lentas)
+        self._originais = []
+        self._trava = threading.Lock()
+
+    def _alvos(self):
+        modulo = sys.modules[__name__]
+        return [
+            (Cliente, "realizar_transacao"), (Saque, "registrar"), (Deposito, "registrar"), (Transferencia, "registrar"),
+            (Conta, "sacar"), (Conta, "depositar"), (ContaCorrente, "sacar"),
+            (Registro, "buscar_cliente"), (Registro, "buscar_conta"),
+            (modulo, "filtrar_cliente"), (modulo, "recuperar_conta_cliente"),
+        ]
+
+    def _medir(self, rotulo, funcao):
+        relogio = time.perf_counter_ns
+
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = relogio()
+            resultado = None
+            try:
+                resultado = funcao(*args, **kwargs)
+                return resultado
+            finally:
+                # Resultado de falha (ou False) conta como operação recusada; None das buscas, não
+                self.registrar(rotulo, relogio() - inicio, resultado is not None and not resultado)
+
+        return medida
+
+    def ativar(self):
+        if self.ativa:
+            return
+        for dono, nome in self._alvos():
+            original = vars(dono)[nome]
+            rotulo = f"{dono.__name__}.{nome}" if isinstance(dono, type) else nome
+            self._originais.append((dono, nome, original))
+            setattr(dono, nome, self._medir(rotulo, original))
+        if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+            # kill -USR1 <pid> grava as métricas em JSON no diretório de dados
+            signal.signal(signal.SIGUSR1, lambda *_: self.gravar_json())
+        self.ativa = True
+
+    def desativar(self):
+        for dono, nome, original in reversed(self._originais):
+            setattr(dono, nome, original)
+        self._originais.clear()
+        self.ativa = False
+
+    def registrar(self, rotulo, nanossegundos, falhou=False):
+        with self._trava:
+            histograma = self._histogramas.get(rotulo)
+            if histograma is None:
+                histograma = self._histogramas[rotulo] = HistogramaLatencia()
+                self._falhas[rotulo] = 0
+            histograma.registrar(nanossegundos)
+            self._falhas[rotulo] += falhou
+            if nanossegundos >= self._limite_lento_ns:
+                self._lentas.append((datetime.now().strftime(FORMATO_DATA), rotulo, nanossegundos / 1e6))
+
+    def exportar_json(self):
+        with self._trava:
+            return {
+                "operacoes": {
+                    rotulo: {
+                        "contagem": histograma.contagem,
+                        "falhas": self._falhas[rotulo],
+                        "soma_ms": histograma.soma / 1e6,
+                        "maximo_ms": histograma.maximo / 1e6,
+                        **{f"p{quantil * 100:g}_ms": histograma.percentil(quantil) / 1e6 for quantil in self.QUANTIS},
+                    }
+                    for rotulo, histograma in sorted(self._histogramas.items())
+                },
+                "operacoes_lentas": [
+                    {"data": data, "operacao": rotulo, "duracao_ms": duracao} for data, rotulo, duracao in self._lentas
+                ],
+            }
+
+    def exportar_prometheus(self):
+        linhas = [
+            "# HELP banco_operacoes_total Operações executadas.",
+            "# TYPE banco_operacoes_total counter",
+        ]
+        with self._trava:
+            itens = sorted(self._histogramas.items())
+            for rotulo, histograma in itens:
+                linhas.append(f'banco_operacoes_total{{operacao="{rotulo}"}} {histograma.contagem}')
+            linhas += ["# HELP banco_operacoes_falhas_total Operações recusadas.",
+                       "# TYPE banco_operacoes_falhas_total counter"]
+            for rotulo, _ in itens:
+                linhas.append(f'banco_operacoes_falhas_total{{operacao="{rotulo}"}} {self._falhas[rotulo]}')
+            linhas += ["# HELP banco_latencia_segundos Latência por operação.",
+                       "# TYPE banco_latencia_segundos summary"]
+            for rotulo, histograma in itens:
+                for quantil in self.QUANTIS:
+                    linhas.append(f'banco_latencia_segundos{{operacao="{rotulo}",quantile="{quantil}"}} '
+                                  f"{histograma.percentil(quantil) / 1e9:.9f}")
+                linhas.append(f'banco_latencia_segundos_sum{{operacao="{rotulo}"}} {histograma.soma / 1e9:.9f}')
+                linhas.append(f'banco_latencia_segundos_count{{operacao="{rotulo}"}} {histograma.contagem}')
+        return "\n".join(linhas) + "\n"
+
+    def gravar_json(self, caminho=None):
+        caminho = caminho or os.path.join(DIRETORIO_DADOS, "metricas.json")
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(self.exportar_json(), arquivo, ensure_ascii=False, indent=2)
+        return caminho
+
+
+INSTRUMENTACAO = Instrumentacao()
+
+
+# ==================== SERVIÇO DE REDE (ASYNCIO) ====================
+
+class ServicoBancario:
+    """Atende pedidos JSON, um por linha, sobre o mesmo modelo usado pelo menu.
+
+    Cada linha recebida gera exatamente uma linha de resposta, na mesma ordem; por isso
+    um cliente pode enviar vários pedidos sem esperar as respostas (pipelining).
+    Exemplo: {"id": 7, "op": "deposito", "cpf": "123", "conta": 1, "valor": 50.0}
+    """
+
+    RESPOSTAS_EM_ESPERA = 1024 # por conexão; acima disso a leitura espera o envio
+
+    def __init__(self, registro):
+        self._registro = registro
+        self._operacoes = {
+            "criar_cliente": self.criar_cliente,
+            "criar_conta": self.criar_conta,
+            "deposito": partial(self.movimentar, "d"),
+            "saque": partial(self.movimentar, "s"),
+            "transferencia": partial(self.movimentar, "t"),
+            "extrato": self.extrato,
+            "listar_contas": self.listar_contas,
+            "cache_extratos": self.cache_extratos,
+            "metricas": self.metricas,
+            "idempotencia": self.idempotencia,
+        }
+
+    def executar(self, pedido):
+        nome = pedido.get("op")
+        operacao = self._operacoes.get(nome) if isinstance(nome, str) else None
+        if operacao is None:
+            resposta = {"ok": False, "erro": "operação desconhecida"}
+        else:
+            try:
+                resposta = operacao(pedido)
+            except KeyError as erro:
+                resposta = {"ok": False, "erro": f"campo ausente: {erro.args[0]}"}
+            except (OverflowError, TypeError, ValueError): # OverflowError: int(1e999)
+                resposta = {"ok": False, "erro": "valor inválido"}
+
+        if "id" in pedido:
+            resposta["id"] = pedido["id"]
+        return resposta
+
+    def criar_cliente(self, pedido):
+        cliente = PessoaFisica(nome=pedido["nome"], data_nascimento=pedido["data_nascimento"],
+                               cpf=str(pedido["cpf"]), endereco=pedido["endereco"])
+        if not self._registro.adicionar_cliente(cliente):
+            return {"ok": False, "erro": "já existe cliente com esse CPF"}
+        return {"ok": True}
+
+    def criar_conta(self, pedido):
+        cliente = filtrar_cliente(str(pedido["cpf"]), self._registro)
+        if not cliente:
+            return {"ok": False, "erro": "cliente não encontrado"}
+
+        conta = ContaCorrente.nova_conta(cliente=cliente, numero=self._registro.alocador.proximo())
+        self._registro.adicionar_conta(conta)
+        cliente.adicionar_conta(conta)
+        return {"ok": True, "conta": conta.numero}
+
+    def movimentar(self, tipo, pedido):
+        status, motivo = aplicar_operacao(self._registro, {**pedido, "tipo": tipo})
+        if status != "ok":
+            return {"ok": False, "erro": motivo}
+        return {"ok": True, "saldo": self._registro.buscar_conta(int(pedido["conta"])).saldo}
+
+    def _conta_do_cliente(self, pedido):
+        cliente = filtrar_cliente(str(pedido["cpf"]), self._registro)
+        return recuperar_conta_cliente(self._registro, cliente, int(pedido["conta"])) if cliente else None
+
+    def extrato(self, pedido):
+        conta = self._conta_do_cliente(pedido)
+        if not conta:
+            return {"ok": False, "erro": "conta não encontrada"}
+
+        cursor = int(pedido.get("cursor", 0))
+        tamanho_pagina = int(pedido.get("tamanho_pagina", TAMANHO_PAGINA_EXTRATO))
+        fim = cursor + tamanho_pagina
+        depositos, saques = CACHE_EXTRATOS.totais(conta)
+        return {
+            "ok": True,
+            "linhas": [linha.rstrip("\n") for linha in CACHE_EXTRATOS.linhas(conta, cursor, fim)],
+            "proximo_cursor": fim if fim < len(conta.historico) else None,
+            "saldo": conta.saldo,
+            "total_depositos": depositos,
+            "total_saques": saques,
+        }
+
+    def cache_extratos(self, pedido):
+        return {"ok": True, **CACHE_EXTRATOS.estatisticas()}
+
+    def idempotencia(self, pedido):
+        return {"ok": True, **IDEMPOTENCIA.estatisticas()}
+
+    def metricas(self, pedido):
+        if not INSTRUMENTACAO.ativa:
+            return {"ok": False, "erro": "instrumentação desativada (use --instrumentar)"}
+        if pedido.get("formato") == "prometheus":
+            return {"ok": True, "prometheus": INSTRUMENTACAO.exportar_prometheus()}
+        return {"ok": True, **INSTRUMENTACAO.exportar_json()}
+
+    def listar_contas(self, pedido):
+        # Filtros e ordem opcionais; o cursor devolvido é repassado como veio (número ou lista)
+        ordem = pedido.get("ordem")
+        if ordem is not None and ordem not in ORDENS_CONTAS:
+            return {"ok": False, "erro": "ordem inválida"}
+        saldo_minimo, saldo_maximo = pedido.get("saldo_minimo"), pedido.get("saldo_maximo")
+        contas, proximo = self._registro.pagina_contas(
+            cursor=pedido.get("cursor"),
+            limite=int(pedido.get("limite", 100)),
+            agencia=pedido.get("agencia"),
+            titular=pedido.get("titular"),
+            saldo_minimo=None if saldo_minimo is None else float(saldo_minimo),
+            saldo_maximo=None if saldo_maximo is None else float(saldo_maximo),
+            ordem=ordem,
+            decrescente=bool(pedido.get("decrescente")),
+        )
+        return {
+            "ok": True,
+            "contas": [{"agencia": conta.agencia, "numero": conta.numero, "titular": conta.cliente.nome,
+                        "saldo": conta.saldo} for conta in contas],
+            "proximo_cursor": proximo,
+        }
+
+    def responder(self, linha):
+        """Executa uma linha do protocolo e devolve a linha de resposta, já codificada."""
+        try:
+            pedido = json.loads(linha)
+        except ValueError:
+            pedido = None
+        resposta = self.executar(pedido) if isinstance(pedido, dict) else {"ok": False, "erro": "JSON inválido"}
+        return json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    async def atender(self, leitor, escritor):
+        # Os pedidos são executados assim que chegam; as respostas seguem em lotes, cada lote
+        # após um único fsync (_enviar). A fila limita as respostas à espera do envio.
+        respostas = asyncio.Queue(self.RESPOSTAS_EM_ESPERA)
+        envio = asyncio.create_task(self._enviar(respostas, escritor))
+        try:
+            while linha := await leitor.readline():
+                await respostas.put(self.responder(linha))
+        except ConnectionError:
+            pass
+        finally:
+            await respostas.put(None) # fim da conexão
+            await envio
+            escritor.close()
+
+    async def _enviar(self, respostas, escritor):
+        persistencia = self._registro.persistencia
+        loop = asyncio.get_running_loop()
+        conectado = True
+        while True:
+            # Tudo o que foi executado enquanto o lote anterior era enviado forma o próximo lote
+            lote = [await respostas.get()]
+            while not respostas.empty():
+                lote.append(respostas.get_nowait())
+            fim = lote[-1] is None
+            if fim:
+                lote.pop()
+
+            if lote and conectado:
+                try:
+                    if persistencia and persistencia.pendente:
+                        # Só responde com as operações em disco; um fsync para o lote inteiro,
+                        # compartilhado também com as outras conexões
+                        await loop.run_in_executor(None, persistencia.sincronizar)
+                    escritor.writelines(lote)
+                    await escritor.drain()
+                except ConnectionError:
+                    conectado = False # o cliente saiu: as respostas restantes são descartadas
+            if persistencia:
+                persistencia.snapshot_se_necessario() # entre lotes: ponto seguro
+            if fim:
+                return
+
+
+async def servir(registro, host="127.0.0.1", porta=8765):
+    servico = ServicoBancario(registro)
+    servidor = await asyncio.start_server(servico.atender, host, porta)
+
+    parar = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sinal, parar.set)
+
+    print(f"Serviço bancário em {host}:{porta}", file=sys.stderr, flush=True)
+    async with servidor:
+        await parar.wait()
+
+
+def executar_servico(host="127.0.0.1", porta=8765):
+    persistencia = Persistencia(DIRETORIO_DADOS)
+    registro = persistencia.carregar()
+    # O cliente recebe o resultado na resposta; o terminal do servidor não recebe mensagens por operação
+    with usando_notificador(NotificadorNulo()):
+        try:
+            asyncio.run(servir(registro, host, porta))
+        finally:
+            persistencia.fechar()
+
+
+# ==================== MODO ROTEIRO (NÃO INTERATIVO) ====================
+
+CAMPOS_ROTEIRO = ("linha", "comando", "resultado", "valor")
+LINHAS_POR_ESCRITA = 4096
+
+
+def _conta_do_cliente(registro, cpf, numero):
+    # (conta, None) ou (None, código do erro): a conta precisa pertencer ao cliente do CPF
+    cliente = registro.buscar_cliente(cpf)
+    if cliente is None:
+        return None, "cliente_nao_encontrado"
+    conta = registro.buscar_conta(int(numero))
+    if conta is None or conta.cliente is not cliente:
+        return None, "conta_nao_encontrada"
+    return conta, None
+
+
+def _roteiro_movimento(classe):
+    def executar(registro, cpf, numero, valor):
+        conta, erro = _conta_do_cliente(registro, cpf, numero)
+        if erro:
+            return erro, ""
+        return conta.cliente.realizar_transacao(conta, classe(float(valor))).value, f"{conta.saldo:.2f}"
+    return executar
+
+
+def _roteiro_transferencia(registro, cpf, numero, destino, valor):
+    conta, erro = _conta_do_cliente(registro, cpf, numero)
+    if erro:
+        return erro, ""
+    transferencia = Transferencia(float(valor), registro.buscar_conta(int(destino)))
+    return conta.cliente.realizar_transacao(conta, transferencia).value, f"{conta.saldo:.2f}"
+
+
+def _roteiro_extrato(registro, cpf, numero):
+    conta, erro = _conta_do_cliente(registro, cpf, numero)
+    return (erro, "") if erro else ("ok", f"{conta.saldo:.2f}")
+
+
+def _roteiro_novo_cliente(registro, cpf, nome, data_nascimento, endereco):
+    cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
+    return ("cliente_criado" if registro.adicionar_cliente(cliente) else "cliente_existente"), ""
+
+
+def _roteiro_nova_conta(registro, cpf):
+    cliente = registro.buscar_cliente(cpf)
+    if cliente is None:
+        return "cliente_nao_encontrado", ""
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=registro.alocador.proximo())
+    registro.adicionar_conta(conta)
+    cliente.adicionar_conta(conta)
+    return "conta_criada", str(conta.numero)
+
+
+# comando -> (função, quantidade de argumentos, divisão dos argumentos); nu aceita aspas (nome, endereço)
+COMANDOS_ROTEIRO = {
+    "d": (_roteiro_movimento(Deposito), 3, str.split),
+    "s": (_roteiro_movimento(Saque), 3, str.split),
+    "tr": (_roteiro_transferencia, 4, str.split),
+    "e": (_roteiro_extrato, 2, str.split),
+    "nu": (_roteiro_novo_cliente, 4, shlex.split),
+    "nc": (_roteiro_nova_conta, 1, str.split),
+}
+
+
+def executar_roteiro(registro, entrada, saida, persistencia=None):
+    """Executa comandos de texto, um por linha, sem menu nem prompts; devolve quantos executou.
+
+    Comandos: d|s <cpf> <conta> <valor>, tr <cpf> <conta> <destino> <valor>, e <cpf> <conta>,
+    nu <cpf> "<nome>" <data_nascimento> "<endereço>", nc <cpf> e q (encerra). Linhas vazias e
+    iniciadas por # são ignoradas. A saída é TSV (CAMPOS_ROTEIRO), uma linha por comando; o
+    valor é o saldo após a operação ou o número da conta criada.
+    """
+    pendentes = ["\t".join(CAMPOS_ROTEIRO) + "\n"]
+    executados = 0
+    with usando_notificador(NotificadorNulo()):
+        for numero_linha, linha in enumerate(entrada, 1):
+            partes = linha.split(None, 1)
+            if not partes or partes[0].startswith("#"):
+                continue
+            comando = partes[0]
+            if comando == "q":
+                break
+
+            despacho = COMANDOS_ROTEIRO.get(comando)
+            if despacho is None:
+                resultado, valor = "comando_invalido", ""
+            else:
+                funcao, quantidade, dividir = despacho
+                try:
+                    argumentos = dividir(partes[1]) if len(partes) > 1 else [] # shlex: aspas sem par
+                    if len(argumentos) != quantidade:
+                        raise ValueError
+                    resultado, valor = funcao(registro, *argumentos)
+                except ValueError:
+                    resultado, valor = "argumentos_invalidos", ""
+            pendentes.append(f"{numero_linha}\t{comando}\t{resultado}\t{valor}\n")
+            executados += 1
+
+            if len(pendentes) >= LINHAS_POR_ESCRITA:
+                if persistencia:
+                    persistencia.sincronizar() # nenhum resultado sai antes de estar em disco
+                saida.writelines(pendentes)
+                pendentes.clear()
+                if persistencia:
+                    persistencia.snapshot_se_necessario() # entre comandos: ponto seguro
+    if persistencia:
+        persistencia.sincronizar()
+    saida.writelines(pendentes)
+    saida.flush()
+    return executados
+
+
+def executar_roteiro_arquivo(caminho, destino=None):
+    # caminho "-" lê da entrada padrão; sem destino, os resultados vão para a saída padrão
+    persistencia = Persistencia(DIRETORIO_DADOS)
+    registro = persistencia.carregar()
+    with contextlib.ExitStack() as pilha:
+        entrada = sys.stdin if caminho == "-" else pilha.enter_context(open(caminho, encoding="utf-8"))
+        saida = pilha.enter_context(open(destino, "w", encoding="utf-8")) if destino else sys.stdout
+        try:
+            executar_roteiro(registro, entrada, saida, persistencia)
+        finally:
+            persistencia.fechar()
 
 
 # ==================== FUNÇÕES DE INTERAÇÃO (MAIN) ====================
 
-def menu():
-    menu = """\n
+# Texto do menu já sem indentação (dedent feito uma vez, na carga do módulo)
+MENU = textwrap.dedent("""\n
     ================ MENU ================
     [d]\tDepositar
     [s]\tSacar
     [e]\tExtrato
+    [tr]\tTransferir
     [nc]\tNova conta
     [lc]\tListar contas
     [nu]\tNovo usuário
+    [ic]\tImportar clientes
+    [lt]\tProcessar lote
+    [lq]\tLiquidar transferências
+    [rb]\tRelatório do banco
+    [mt]\tMétricas
     [q]\tSair
-    => """
-    return input(textwrap.dedent(menu))
+    => """)
+
+
+def menu():
+    return input(MENU)
 
-def recuperar_conta_cliente(cliente, numero_conta):
-    contas_do_cliente = cliente.contas
-    conta_encontrada = [conta for conta in contas_do_cliente if conta.numero == numero_conta]
-    return conta_encontrada[0] if conta_encontrada else None
+def recuperar_conta_cliente(registro, cliente, numero_conta):
+    conta = registro.buscar_conta(numero_conta)
+    # A conta só é devolvida se pertencer ao cliente informado
+    return conta if conta is not None and conta.cliente is cliente else None
 
 
-def depositar_operacao(clientes):
+def depositar_operacao(registro):
     cpf = input("Informe o CPF do cliente: ")
-    cliente = filtrar_cliente(cpf, clientes)
+    cliente = filtrar_cliente(cpf, registro)
 
     if not cliente:
         print("\n@@@ Cliente não encontrado! @@@")
         return
 
     numero_conta = int(input("Informe o número da conta: "))
-    conta = recuperar_conta_cliente(cliente, numero_conta)
+    conta = recuperar_conta_cliente(registro, cliente, numero_conta)
 
     if not conta:
         print("\n@@@ Conta não encontrada para este cliente! @@@")
@@ -231,16 +3146,16 @@ def depositar_operacao(clientes):
     cliente.realizar_transacao(conta, deposito)
 
 
-def sacar_operacao(clientes):
+def sacar_operacao(registro):
     cpf = input("Informe o CPF do cliente: ")
-    cliente = filtrar_cliente(cpf, clientes)
+    cliente = filtrar_cliente(cpf, registro)
 
     if not cliente:
         print("\n@@@ Cliente não encontrado! @@@")
         return
 
     numero_conta = int(input("Informe o número da conta: "))
-    conta = recuperar_conta_cliente(cliente, numero_conta)
+    conta = recuperar_conta_cliente(registro, cliente, numero_conta)
 
     if not conta:
         print("\n@@@ Conta não encontrada para este cliente! @@@")
@@ -251,39 +3166,112 @@ def sacar_operacao(clientes):
     cliente.realizar_transacao(conta, saque)
 
 
-def exibir_extrato_operacao(clientes):
+def transferir_operacao(registro):
     cpf = input("Informe o CPF do cliente: ")
-    cliente = filtrar_cliente(cpf, clientes)
+    cliente = filtrar_cliente(cpf, registro)
+
+    if not cliente:
+        print("\n@@@ Cliente não encontrado! @@@")
+        return
+
+    numero_conta = int(input("Informe o número da conta de origem: "))
+    conta = recuperar_conta_cliente(registro, cliente, numero_conta)
+
+    if not conta:
+        print("\n@@@ Conta não encontrada para este cliente! @@@")
+        return
+
+    destino = registro.buscar_conta(int(input("Informe o número da conta de destino: ")))
+    valor = float(input("Informe o valor da transferência: "))
+    transferencia = Transferencia(valor, destino)
+    cliente.realizar_transacao(conta, transferencia)
+
+
+def exibir_extrato_operacao(registro):
+    cpf = input("Informe o CPF do cliente: ")
+    cliente = filtrar_cliente(cpf, registro)
 
     if not cliente:
         print("\n@@@ Cliente não encontrado! @@@")
         return
 
     numero_conta = int(input("Informe o número da conta: "))
-    conta = recuperar_conta_cliente(cliente, numero_conta)
+    conta = recuperar_conta_cliente(registro, cliente, numero_conta)
 
     if not conta:
         print("\n@@@ Conta não encontrada para este cliente! @@@")
         return
 
-    print("\n================ EXTRATO ================")
-    transacoes = conta.historico.transacoes
+    cursor = 0
+    while cursor is not None:
+        linhas, cursor = pagina_extrato(conta, cursor, TAMANHO_PAGINA_EXTRATO)
+        escrever_linhas(linhas)
+        if cursor is not None and input("\n[Enter] Próxima página | [q] Voltar ao menu: ").strip() == "q":
+            break
 
-    extrato_str = ""
-    if not transacoes:
-        extrato_str = "Não foram realizadas movimentações."
-    else:
-        for transacao in transacoes:
-            extrato_str += f"{transacao['tipo']}:\tR$ {transacao['valor']:.2f} ({transacao['data']})\n"
 
-    print(extrato_str)
-    print(f"\nSaldo:\t\tR$ {conta.saldo:.2f}")
-    print("==========================================")
+def processar_lote_operacao(registro):
+    entrada = input("Informe o arquivo de operações (.csv ou .jsonl): ")
+    saida = input("Informe o arquivo de resultados (.csv): ")
+
+    try:
+        relatorio = processar_lote(registro, entrada, saida)
+    except OSError as erro:
+        print(f"\n@@@ Não foi possível processar o lote: {erro} @@@")
+        return
+
+    exibir_relatorio_lote(relatorio)
+
+
+def liquidar_transferencias_operacao(registro):
+    entrada = input("Informe o arquivo de transferências (.csv com cpf, conta, destino, valor): ")
+    saida = input("Informe o arquivo de resultados (.csv): ")
+
+    try:
+        relatorio = liquidar_arquivo(registro, entrada, saida)
+    except OSError as erro:
+        print(f"\n@@@ Não foi possível liquidar as transferências: {erro} @@@")
+        return
+
+    exibir_relatorio_lote(relatorio)
+
+
+def importar_clientes_operacao(registro):
+    entrada = input("Informe o arquivo de clientes (.csv): ")
+    rejeitados = input("Informe o arquivo de rejeitados (.csv, vazio para não gravar): ").strip()
+
+    try:
+        relatorio = importar_clientes(registro, entrada, rejeitados or None)
+    except (OSError, ValueError) as erro:
+        print(f"\n@@@ Não foi possível importar os clientes: {erro} @@@")
+        return
+
+    exibir_relatorio_importacao(relatorio)
+
 
+def relatorio_operacao(registro):
+    try:
+        relatorio = relatorio_bancario(exportar_arrays(registro))
+    except RuntimeError as erro:
+        print(f"\n@@@ {erro} @@@")
+        return
+
+    exibir_relatorio_bancario(relatorio)
+
+
+def metricas_operacao():
+    if not INSTRUMENTACAO.ativa:
+        print("\n@@@ Instrumentação desativada. Inicie com --instrumentar ou BANCO_INSTRUMENTACAO=1. @@@")
+        return
 
-def criar_cliente(clientes):
+    print("\n================ MÉTRICAS ================")
+    print(INSTRUMENTACAO.exportar_prometheus(), end="")
+    print(f"\n=== Métricas gravadas em {INSTRUMENTACAO.gravar_json()} ===")
+
+
+def criar_cliente(registro):
     cpf = input("Informe o CPF (somente número): ")
-    cliente = filtrar_cliente(cpf, clientes)
+    cliente = filtrar_cliente(cpf, registro)
 
     if cliente:
         print("\n@@@ Já existe cliente com esse CPF! @@@")
@@ -294,71 +3282,122 @@ def criar_cliente(clientes):
     endereco = input("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
 
     cliente = PessoaFisica(nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco)
-    clientes.append(cliente)
+    registro.adicionar_cliente(cliente)
+    if registro.persistencia:
+        registro.persistencia.sincronizar()
 
     print("=== Cliente criado com sucesso! ===")
 
-def filtrar_cliente(cpf, clientes):
-    clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf]
-    return clientes_filtrados[0] if clientes_filtrados else None
+def filtrar_cliente(cpf, registro):
+    return registro.buscar_cliente(cpf)
 
 
-def criar_conta_operacao(numero_conta, clientes, contas):
+def criar_conta_operacao(registro):
     cpf = input("Informe o CPF do cliente: ")
-    cliente = filtrar_cliente(cpf, clientes)
+    cliente = filtrar_cliente(cpf, registro)
 
     if not cliente:
         print("\n@@@ Cliente não encontrado, fluxo de criação de conta encerrado! @@@")
         return
 
-    conta = ContaCorrente.nova_conta(cliente=cliente, numero=numero_conta)
-    contas.append(conta)
+    # O número só é alocado depois de encontrar o cliente: uma tentativa falha não o gasta
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=registro.alocador.proximo())
+    registro.adicionar_conta(conta)
     cliente.adicionar_conta(conta) # Adiciona a conta ao cliente
+    if registro.persistencia:
+        registro.persistencia.sincronizar()
 
-    print("\n=== Conta criada com sucesso! ===")
+    print(f"\n=== Conta criada com sucesso! Agência: {conta.agencia}, número: {conta.numero} ===")
 
 
-def listar_contas_operacao(contas):
-    if not contas:
+def listar_contas_operacao(registro):
+    if not registro.contas:
         print("\n@@@ Nenhuma conta cadastrada. @@@")
         return
 
-    for conta in contas:
-        # Usando o __str__ que você adicionou em ContaCorrente, que é mais Pythonic
-        print("=" * 100)
-        print(textwrap.dedent(str(conta)))
+    cursor = None
+    while True:
+        contas, cursor = registro.pagina_contas(cursor, TAMANHO_PAGINA_CONTAS)
+        # Uma escrita por página, com o __str__ de ContaCorrente (modelo já sem indentação)
+        sys.stdout.write("".join(f"{'=' * 100}\n{conta}\n" for conta in contas))
+        if cursor is None or input("\n[Enter] Próxima página | [q] Voltar ao menu: ").strip() == "q":
+            break
 
 
 def main():
-    clientes = []
-    contas = []
-    
+    persistencia = Persistencia(DIRETORIO_DADOS)
+    registro = persistencia.carregar()
+
     while True:
+        persistencia.sincronizar() # a operação anterior só é confirmada depois de ir para o disco
+        persistencia.snapshot_se_necessario()
+        NOTIFICADOR.descarregar() # mensagens da operação anterior, antes do menu
         opcao = menu()
 
         if opcao == "d":
-            depositar_operacao(clientes)
+            depositar_operacao(registro)
 
         elif opcao == "s":
-            sacar_operacao(clientes)
+            sacar_operacao(registro)
 
         elif opcao == "e":
-            exibir_extrato_operacao(clientes)
+            exibir_extrato_operacao(registro)
+
+        elif opcao == "tr":
+            transferir_operacao(registro)
 
         elif opcao == "nu":
-            criar_cliente(clientes)
+            criar_cliente(registro)
+
+        elif opcao == "ic":
+            importar_clientes_operacao(registro)
 
         elif opcao == "nc":
-            numero_conta = len(contas) + 1
-            criar_conta_operacao(numero_conta, clientes, contas)
+            criar_conta_operacao(registro)
 
         elif opcao == "lc":
-            listar_contas_operacao(contas)
+            listar_contas_operacao(registro)
+
+        elif opcao == "lt":
+            processar_lote_operacao(registro)
+
+        elif opcao == "lq":
+            liquidar_transferencias_operacao(registro)
+
+        elif opcao == "rb":
+            relatorio_operacao(registro)
+
+        elif opcao == "mt":
+            metricas_operacao()
 
         elif opcao == "q":
+            persistencia.fechar()
             break
 
         else:
             print("Operação inválida, por favor selecione novamente a operação desejada.")
 
-main()
\ No newline at end of file
+def argumentos():
+    parser = argparse.ArgumentParser(description="Sistema bancário em POO")
+    parser.add_argument("--servir", action="store_true", help="atende pedidos pela rede em vez de abrir o menu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--instrumentar", action="store_true", default=INSTRUMENTAR,
+                        help="mede latência e contagem das operações (também via BANCO_INSTRUMENTACAO=1)")
+    parser.add_argument("--roteiro", metavar="ARQUIVO",
+                        help="executa os comandos do arquivo (- para a entrada padrão) em vez de abrir o menu")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="resultados do roteiro (padrão: saída padrão)")
+    return parser.parse_args()
+
+
+# Protegido para que o módulo possa ser importado (ex.: pelos benchmarks) sem abrir o menu
+if __name__ == "__main__":
+    args = argumentos()
+    if args.instrumentar:
+        INSTRUMENTACAO.ativar()
+    if args.servir:
+        executar_servico(args.host, args.porta)
+    elif args.roteiro:
+        executar_roteiro_arquivo(args.roteiro, args.saida)
+    else:
+        main()
@@ -0,0 +1 @@
+"""Benchmarks dos sistemas bancários. Execute a partir da raiz: python -m benchmarks.<nome>"""
@@ -0,0 +1,116 @@
+"""Suíte de benchmarks das três implementações, com comparação contra uma linha de base JSON.
+
+    python -m benchmarks                          # roda e compara com benchmarks/baseline.json
+    python -m benchmarks --salvar-baseline        # grava o resultado como nova linha de base
+    python -m benchmarks --drivers poo --operacoes 500000 --falhar-em-regressao
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from .carga import gerar_carga, percentil
+from .drivers import DRIVERS, silenciado
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def medir(classe_driver, carga):
+    # Tempo e latências em uma passada; pico de memória em outra (o tracemalloc distorce o tempo)
+    driver = classe_driver()
+    driver.preparar(carga)
+    latencias = []
+    with silenciado(driver.modulo) as entrada:
+        executar = driver.operacoes(carga, entrada)
+        relogio = time.perf_counter_ns
+        inicio = relogio()
+        for operacao in carga.operacoes:
+            antes = relogio()
+            executar(*operacao)
+            latencias.append(relogio() - antes)
+        total = relogio() - inicio
+
+    tracemalloc.start()
+    driver = classe_driver()
+    driver.preparar(carga)
+    with silenciado(driver.modulo) as entrada:
+        executar = driver.operacoes(carga, entrada)
+        for operacao in carga.operacoes:
+            executar(*operacao)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencias.sort()
+    return {
+        "ops_por_segundo": len(latencias) / (total / 1e9),
+        "p50_us": percentil(latencias, 0.50) / 1e3,
+        "p90_us": percentil(latencias, 0.90) / 1e3,
+        "p99_us": percentil(latencias, 0.99) / 1e3,
+        "pico_memoria_kib": pico / 1024,
+    }
+
+
+def comparar(resultados, baseline, tolerancia):
+    """Devolve as regressões: vazão menor ou p99 maior que a linha de base além da tolerância."""
+    regressoes = []
+    for nome, atual in resultados.items():
+        anterior = baseline.get("resultados", {}).get(nome)
+        if not anterior:
+            continue
+        if atual["ops_por_segundo"] < anterior["ops_por_segundo"] * (1 - tolerancia):
+            regressoes.append(f"{nome}: vazão {atual['ops_por_segundo']:,.0f} < {anterior['ops_por_segundo']:,.0f} op/s")
+        if atual["p99_us"] > anterior["p99_us"] * (1 + tolerancia):
+            regressoes.append(f"{nome}: p99 {atual['p99_us']:.1f} > {anterior['p99_us']:.1f} µs")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drivers", nargs="+", choices=sorted(DRIVERS), default=sorted(DRIVERS))
+    parser.add_argument("--clientes", type=int, default=1_000)
+    parser.add_argument("--operacoes", type=int, default=100_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="variação aceita (0.10 = 10%%)")
+    parser.add_argument("--falhar-em-regressao", action="store_true", help="sai com código 1 se houver regressão")
+    args = parser.parse_args()
+
+    carga = gerar_carga(args.clientes, args.operacoes, semente=args.semente)
+    resultados = {nome: medir(DRIVERS[nome], carga) for nome in args.drivers}
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    anteriores = baseline.get("resultados", {})
+    print(f"{'driver':>10} {'op/s':>12} {'p50 µs':>9} {'p90 µs':>9} {'p99 µs':>9} {'pico KiB':>10} {'vs base':>9}")
+    for nome, resultado in resultados.items():
+        anterior = anteriores.get(nome)
+        variacao = f"{resultado['ops_por_segundo'] / anterior['ops_por_segundo'] - 1:+.1%}" if anterior else "-"
+        print(f"{nome:>10} {resultado['ops_por_segundo']:>12,.0f} {resultado['p50_us']:>9.1f} "
+              f"{resultado['p90_us']:>9.1f} {resultado['p99_us']:>9.1f} {resultado['pico_memoria_kib']:>10,.0f} "
+              f"{variacao:>9}")
+
+    if args.salvar_baseline:
+        args.baseline.write_text(json.dumps({
+            "parametros": {"clientes": args.clientes, "operacoes": args.operacoes, "semente": args.semente},
+            "python": platform.python_version(),
+            "resultados": resultados,
+        }, indent=2) + "\n")
+        print(f"\nLinha de base gravada em {args.baseline}")
+        return
+
+    if baseline and baseline.get("parametros") != {"clientes": args.clientes, "operacoes": args.operacoes,
+                                                   "semente": args.semente}:
+        print("\nAtenção: a linha de base foi gravada com outros parâmetros de carga.")
+
+    regressoes = comparar(resultados, baseline, args.tolerancia)
+    for regressao in regressoes:
+        print(f"REGRESSÃO {regressao}")
+    if regressoes and args.falhar_em_regressao:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
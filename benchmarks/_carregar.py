@@ -0,0 +1,37 @@
+"""Carrega os scripts dos desafios como módulos (os nomes das pastas/arquivos não são importáveis)."""
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+SCRIPTS = {
+    "desafio": RAIZ / "Desafio - Conta Bancária" / "desafio.py",
+    "desafio2": RAIZ / "Desafio 2 - Sistema Bancário Otimizado" / "desafio2.py",
+    "poo": RAIZ / "Desafio 3 - Sistema Bancário em POO com Python" / "desafio-versão-Poo.py",
+}
+
+
+def carregar(nome, variante=None, ambiente=None):
+    """Carrega o script uma vez por variante; ambiente vale só durante a carga (constantes lidas do os.environ)."""
+    nome_modulo = f"bancario_{nome}" + (f"_{variante}" if variante else "")
+    if nome_modulo in sys.modules:
+        return sys.modules[nome_modulo]
+
+    caminho = SCRIPTS[nome]
+    spec = importlib.util.spec_from_file_location(nome_modulo, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    # Registrado antes de executar para que pickle/multiprocessing encontrem as classes
+    sys.modules[nome_modulo] = modulo
+    anteriores = {chave: os.environ.get(chave) for chave in ambiente or {}}
+    os.environ.update(ambiente or {})
+    try:
+        spec.loader.exec_module(modulo)
+    finally:
+        for chave, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(chave)
+            else:
+                os.environ[chave] = valor
+    return modulo
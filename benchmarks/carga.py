@@ -0,0 +1,91 @@
+"""Gerador de carga sintética com semente, e o que os benchmarks compartilham: criação de
+clientes e contas, memória residente e percentis.
+"""
+import random
+from dataclasses import dataclass, field
+
+MISTURA_PADRAO = {"d": 0.5, "s": 0.3, "e": 0.2}
+
+
+@dataclass
+class Carga:
+    # clientes[i] é dono da conta i + 1; operacoes são (tipo, índice do cliente, valor)
+    clientes: list = field(default_factory=list)
+    operacoes: list = field(default_factory=list)
+
+
+def gerar_carga(clientes=1_000, operacoes=100_000, mistura=None, semente=42):
+    mistura = mistura or MISTURA_PADRAO
+    aleatorio = random.Random(semente)
+    carga = Carga()
+
+    for indice in range(clientes):
+        carga.clientes.append((
+            f"{aleatorio.randrange(10**10, 10**11):011d}",
+            f"Cliente {indice}",
+            f"{aleatorio.randint(1, 28):02d}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1950, 2005)}",
+            f"Rua {aleatorio.randint(1, 999)}, {aleatorio.randint(1, 9999)} - Centro - Cidade/UF",
+        ))
+
+    # CPFs sorteados podem repetir; a carga precisa de um cliente distinto por conta
+    vistos = set()
+    for indice, (cpf, *resto) in enumerate(carga.clientes):
+        while cpf in vistos:
+            cpf = f"{aleatorio.randrange(10**10, 10**11):011d}"
+        vistos.add(cpf)
+        carga.clientes[indice] = (cpf, *resto)
+
+    tipos, pesos = zip(*mistura.items())
+    for tipo in aleatorio.choices(tipos, pesos, k=operacoes):
+        valor = round(aleatorio.uniform(1, 600), 2) if tipo != "e" else 0.0
+        carga.operacoes.append((tipo, aleatorio.randrange(clientes), valor))
+    return carga
+
+
+def criar_contas(poo, quantidade, registro=None, nome="Cliente", agencias=None, classe=None, **opcoes):
+    """Cria um cliente com uma conta para cada número de 1 a quantidade (CPF = número com 11 dígitos).
+
+    Com registro, clientes e contas são incluídos nele. nome aceita {numero}; agencias reparte as
+    contas entre as agências 0001..agencias; opcoes vão para a classe da conta. Devolve as contas.
+    """
+    classe = classe or poo.ContaCorrente
+    contas = []
+    for numero in range(1, quantidade + 1):
+        cliente = poo.PessoaFisica(nome.format(numero=numero), "01-01-1990", f"{numero:011d}", "Rua A, 1")
+        if agencias:
+            opcoes["agencia"] = f"{numero % agencias + 1:04d}"
+        conta = classe(numero, cliente, **opcoes)
+        if registro is not None:
+            registro.adicionar_cliente(cliente)
+            registro.adicionar_conta(conta)
+        cliente.adicionar_conta(conta)
+        contas.append(conta)
+    return contas
+
+
+def popular(poo, quantidade):
+    registro = poo.Registro()
+    criar_contas(poo, quantidade, registro)
+    return registro
+
+
+def _status_mib(campo):
+    with open("/proc/self/status") as status:
+        for linha in status:
+            if linha.startswith(campo):
+                return int(linha.split()[1]) / 1024
+    return float("nan")
+
+
+def memoria_residente_mib():
+    # VmRSS (Linux); as páginas de arquivos mapeados só entram quando acessadas
+    return _status_mib("VmRSS:")
+
+
+def memoria_maxima_mib():
+    # VmHWM: pico de RSS do processo desde o início
+    return _status_mib("VmHWM:")
+
+
+def percentil(ordenados, fracao):
+    return ordenados[min(len(ordenados) - 1, int(fracao * len(ordenados)))]
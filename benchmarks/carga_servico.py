@@ -0,0 +1,117 @@
+"""Gerador de carga para o serviço asyncio (--servir): latência p50/p99 e pedidos por segundo.
+
+Por padrão sobe uma instância local em um diretório de dados temporário; use --sem-servidor
+para medir uma instância já em execução.
+
+    python -m benchmarks.carga_servico --conexoes 100 --pedidos 2000 --janela 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from ._carregar import SCRIPTS
+from .carga import percentil
+
+
+async def conectar(host, porta, tentativas=100):
+    for _ in range(tentativas):
+        try:
+            return await asyncio.open_connection(host, porta)
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise ConnectionError(f"serviço não respondeu em {host}:{porta}")
+
+
+async def pedir(leitor, escritor, pedido):
+    escritor.write(json.dumps(pedido).encode() + b"\n")
+    await escritor.drain()
+    return json.loads(await leitor.readline())
+
+
+async def sessao(host, porta, indice, pedidos, janela, latencias):
+    leitor, escritor = await conectar(host, porta)
+    cpf = f"9{indice:010d}"
+    await pedir(leitor, escritor, {"op": "criar_cliente", "cpf": cpf, "nome": f"Carga {indice}",
+                                   "data_nascimento": "01-01-1990", "endereco": "Rua A, 1"})
+    conta = (await pedir(leitor, escritor, {"op": "criar_conta", "cpf": cpf}))["conta"]
+
+    aleatorio = random.Random(indice)
+    enviados = []  # instantes de envio, na ordem (as respostas chegam na mesma ordem)
+    vagas = asyncio.Semaphore(janela)
+
+    async def enviar():
+        for numero in range(pedidos):
+            sorteio = aleatorio.random()
+            if sorteio < 0.6:
+                pedido = {"op": "deposito", "cpf": cpf, "conta": conta, "valor": 10.0}
+            elif sorteio < 0.9:
+                pedido = {"op": "saque", "cpf": cpf, "conta": conta, "valor": 5.0}
+            else:
+                pedido = {"op": "extrato", "cpf": cpf, "conta": conta, "tamanho_pagina": 10}
+            pedido["id"] = numero
+            await vagas.acquire()
+            enviados.append(time.perf_counter())
+            escritor.write(json.dumps(pedido).encode() + b"\n")
+            await escritor.drain()
+
+    async def receber():
+        for numero in range(pedidos):
+            resposta = json.loads(await leitor.readline())
+            latencias.append(time.perf_counter() - enviados[numero])
+            assert resposta["id"] == numero
+            vagas.release()
+
+    await asyncio.gather(enviar(), receber())
+    escritor.close()
+
+
+async def gerar_carga(args):
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        sessao(args.host, args.porta, indice, args.pedidos, args.janela, latencias)
+        for indice in range(args.conexoes)
+    ))
+    return latencias, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--conexoes", type=int, default=50)
+    parser.add_argument("--pedidos", type=int, default=2_000, help="pedidos por conexão")
+    parser.add_argument("--janela", type=int, default=16, help="pedidos em voo por conexão (pipelining)")
+    parser.add_argument("--sem-servidor", action="store_true")
+    args = parser.parse_args()
+
+    servidor = None
+    with tempfile.TemporaryDirectory() as dados:
+        if not args.sem_servidor:
+            ambiente = {**os.environ, "BANCO_DADOS": dados}
+            servidor = subprocess.Popen(
+                [sys.executable, str(SCRIPTS["poo"]), "--servir", "--host", args.host, "--porta", str(args.porta)],
+                env=ambiente,
+            )
+        try:
+            latencias, segundos = asyncio.run(gerar_carga(args))
+        finally:
+            if servidor:
+                servidor.terminate()
+                servidor.wait()
+
+    latencias.sort()
+    print(f"pedidos:   {len(latencias):,} em {args.conexoes} conexões (janela {args.janela})")
+    print(f"vazão:     {len(latencias) / segundos:,.0f} pedidos/s")
+    print(f"p50:       {percentil(latencias, 0.50) * 1e3:.2f} ms")
+    print(f"p99:       {percentil(latencias, 0.99) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
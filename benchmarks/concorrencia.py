@@ -0,0 +1,89 @@
+"""Contenção nas travas por conta e vazão de executar_em_paralelo.
+
+Cada cenário confere ao final que saldo e histórico batem com as operações aceitas.
+
+    python -m benchmarks.concorrencia --operacoes 200000 --threads 1 2 4 8
+"""
+import argparse
+import random
+import threading
+import time
+
+from ._carregar import carregar
+from .carga import popular
+
+
+def conferir(contas, deposito_inicial):
+    for conta in contas:
+        saldo = deposito_inicial
+        for transacao in conta.historico.transacoes[1:]:
+            saldo += transacao["valor"] * (1 if transacao["tipo"] == "Deposito" else -1)
+        if abs(saldo - conta.saldo) > 1e-6:
+            raise AssertionError(f"conta {conta.numero}: saldo {conta.saldo} diverge do histórico ({saldo})")
+
+
+def preparar(poo, quantidade_contas, deposito_inicial):
+    registro = popular(poo, quantidade_contas)
+    for conta in registro.contas:
+        conta.cliente.realizar_transacao(conta, poo.Deposito(deposito_inicial))
+    return registro
+
+
+def gerar_operacoes(poo, contas, quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    operacoes = []
+    for _ in range(quantidade):
+        conta = aleatorio.choice(contas)
+        transacao = poo.Saque(1.0) if aleatorio.random() < 0.5 else poo.Deposito(1.0)
+        operacoes.append((conta.cliente, conta, transacao))
+    return operacoes
+
+
+def martelar(operacoes, threads):
+    # Threads disputando as mesmas contas (sem particionar), para medir a contenção nas travas
+    fatias = [operacoes[i::threads] for i in range(threads)]
+    barreira = threading.Barrier(threads)
+
+    def trabalhar(fatia):
+        barreira.wait()
+        for cliente, conta, transacao in fatia:
+            cliente.realizar_transacao(conta, transacao)
+
+    trabalhadores = [threading.Thread(target=trabalhar, args=(fatia,)) for fatia in fatias]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    parser.add_argument("--contas", type=int, default=1_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    deposito_inicial = 1_000_000.0
+    print(f"{'cenário':>34} {'threads':>8} {'op/s':>12}")
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        for cenario, quantidade_contas in (("uma conta disputada", 1), (f"{args.contas} contas", args.contas)):
+            for threads in args.threads:
+                for modo in ("travas", "executor"):
+                    registro = preparar(poo, quantidade_contas, deposito_inicial)
+                    contas = list(registro.contas)
+                    operacoes = gerar_operacoes(poo, contas, args.operacoes)
+
+                    inicio = time.perf_counter()
+                    if modo == "travas":
+                        martelar(operacoes, threads)
+                    else:
+                        poo.executar_em_paralelo(operacoes, threads)
+                    segundos = time.perf_counter() - inicio
+
+                    conferir(contas, deposito_inicial)
+                    print(f"{cenario + ' / ' + modo:>34} {threads:>8} {args.operacoes / segundos:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
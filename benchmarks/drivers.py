@@ -0,0 +1,141 @@
+"""Drivers que aplicam uma Carga às três implementações pelas funções existentes.
+
+input() e print() são substituídos no módulo de cada script (nomes globais do módulo
+têm precedência sobre os builtins), os resultados vão para o notificador nulo do script
+(quando ele tem um) e a saída padrão vai para os.devnull.
+"""
+import contextlib
+import os
+from collections import deque
+
+from ._carregar import carregar
+
+
+class EntradaRoteirizada:
+    # Responde aos input() com as respostas enfileiradas; sem respostas, "q" (volta ao menu)
+    def __init__(self):
+        self.respostas = deque()
+
+    def __call__(self, mensagem=""):
+        return self.respostas.popleft() if self.respostas else "q"
+
+    def responder(self, *respostas):
+        self.respostas.extend(str(resposta) for resposta in respostas)
+
+
+def notificador_nulo(modulo):
+    # O modelo POO usa uma classe de notificador; desafio2, uma função; desafio.py não tem notificador
+    if hasattr(modulo, "NotificadorNulo"):
+        return modulo.NotificadorNulo()
+    return getattr(modulo, "notificador_nulo", None)
+
+
+@contextlib.contextmanager
+def silenciado(modulo):
+    entrada = EntradaRoteirizada()
+    modulo.input = entrada
+    modulo.print = lambda *args, **kwargs: None
+    notificador = notificador_nulo(modulo)
+    anterior = modulo.definir_notificador(notificador) if notificador else None
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            yield entrada
+    finally:
+        if anterior is not None:
+            modulo.definir_notificador(anterior)
+        del modulo.input
+        del modulo.print
+
+
+class DriverDesafio:
+    """desafio.py: uma única conta, estado passado entre depositar/sacar/exibir_extrato."""
+
+    nome = "desafio"
+
+    def preparar(self, carga):
+        self.modulo = carregar("desafio")
+        self.saldo, self.extrato, self.numero_saques = 0, "", 0
+
+    def operacoes(self, carga, entrada):
+        modulo = self.modulo
+
+        def executar(tipo, _, valor):
+            if tipo == "d":
+                self.saldo, self.extrato = modulo.depositar(self.saldo, valor, self.extrato)
+            elif tipo == "s":
+                self.saldo, self.extrato, self.numero_saques = modulo.sacar(
+                    saldo=self.saldo, valor=valor, extrato=self.extrato, limite=500,
+                    numero_saques=self.numero_saques, limite_saques=3,
+                )
+            else:
+                modulo.exibir_extrato(self.saldo, self.extrato)
+
+        return executar
+
+
+class DriverDesafio2:
+    """desafio2.py: usuários e contas criados pelos fluxos de cadastro (criar_usuario/criar_conta)."""
+
+    nome = "desafio2"
+
+    def preparar(self, carga):
+        self.modulo = carregar("desafio2")
+        self.usuarios, self.contas = {}, {}
+        with silenciado(self.modulo) as entrada:
+            for numero, (cpf, nome, data_nascimento, endereco) in enumerate(carga.clientes, 1):
+                entrada.responder(cpf, nome, data_nascimento, endereco)
+                self.modulo.criar_usuario(self.usuarios)
+                entrada.responder(cpf)
+                conta = self.modulo.criar_conta(self.modulo.AGENCIA, numero, self.usuarios)
+                self.contas[(conta["agencia"], conta["numero_conta"])] = conta
+
+    def operacoes(self, carga, entrada):
+        modulo, contas = self.modulo, self.contas
+
+        def executar(tipo, cliente, valor):
+            conta = modulo.filtrar_conta(cliente + 1, contas)
+            if tipo == "d":
+                modulo.depositar(conta, valor)
+            elif tipo == "s":
+                modulo.sacar(conta=conta, valor=valor, limite=500, limite_saques=3)
+            else:
+                modulo.exibir_extrato(conta)
+
+        return executar
+
+
+class DriverPoo:
+    """desafio-versão-Poo.py: cadastro por criar_cliente/criar_conta_operacao e operações pelo modelo."""
+
+    nome = "poo"
+
+    def preparar(self, carga):
+        self.modulo = carregar("poo")
+        self.registro = self.modulo.Registro()
+        with silenciado(self.modulo) as entrada:
+            # O alocador em memória numera as contas 1, 2, 3... na ordem dos clientes
+            for cpf, nome, data_nascimento, endereco in carga.clientes:
+                entrada.responder(cpf, nome, data_nascimento, endereco)
+                self.modulo.criar_cliente(self.registro)
+                entrada.responder(cpf)
+                self.modulo.criar_conta_operacao(self.registro)
+
+    def operacoes(self, carga, entrada):
+        modulo, registro = self.modulo, self.registro
+        cpfs = [cliente[0] for cliente in carga.clientes]
+
+        def executar(tipo, cliente, valor):
+            if tipo == "e":
+                # Fluxo completo do menu: CPF e conta pelo input(), primeira página do extrato
+                entrada.responder(cpfs[cliente], cliente + 1)
+                modulo.exibir_extrato_operacao(registro)
+                return
+            cliente_encontrado = modulo.filtrar_cliente(cpfs[cliente], registro)
+            conta = modulo.recuperar_conta_cliente(registro, cliente_encontrado, cliente + 1)
+            transacao = modulo.Deposito(valor) if tipo == "d" else modulo.Saque(valor)
+            cliente_encontrado.realizar_transacao(conta, transacao)
+
+        return executar
+
+
+DRIVERS = {driver.nome: driver for driver in (DriverDesafio, DriverDesafio2, DriverPoo)}
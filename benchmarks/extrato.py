@@ -0,0 +1,54 @@
+"""Tempo e pico de memória do extrato sob demanda em históricos grandes.
+
+O tempo por transação deve ficar constante (linear no total) e o pico de memória
+limitado ao bloco de escrita, independentemente do tamanho do histórico.
+
+    python -m benchmarks.extrato --transacoes 10000 100000 1000000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from ._carregar import carregar
+from .carga import criar_contas
+
+
+def popular(poo, quantidade):
+    conta, = criar_contas(poo, 1)
+    deposito = poo.Deposito(10.0)
+    for _ in range(quantidade):
+        conta.historico.adicionar_transacao(deposito)
+    return conta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transacoes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--tamanho-pagina", type=int, default=None,
+                        help="mede apenas a primeira página com este tamanho")
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    print(f"{'transações':>12} {'tempo (s)':>10} {'ns/linha':>9} {'pico (KiB)':>11}")
+    with open(os.devnull, "w") as saida:
+        for quantidade in args.transacoes:
+            conta = popular(poo, quantidade)
+
+            inicio = time.perf_counter()
+            linhas, _ = poo.pagina_extrato(conta, 0, args.tamanho_pagina, usar_cache=False)
+            poo.escrever_linhas(linhas, saida)
+            segundos = time.perf_counter() - inicio
+
+            # Segunda passada só para o pico de memória (o tracemalloc distorce o tempo)
+            tracemalloc.start()
+            linhas, _ = poo.pagina_extrato(conta, 0, args.tamanho_pagina, usar_cache=False)
+            poo.escrever_linhas(linhas, saida)
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            escritas = min(quantidade, args.tamanho_pagina or quantidade)
+            print(f"{quantidade:>12,} {segundos:>10.2f} {segundos / escritas * 1e9:>9.0f} {pico / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Memória e tempo de inserção do Historico colunar contra a lista de dicionários original.
+
+    python -m benchmarks.historico --entradas 1000000 5000000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from ._carregar import carregar
+
+
+class HistoricoLista:
+    # Implementação original (um dicionário e um strftime por transação), usada como referência
+    def __init__(self):
+        self._transacoes = []
+
+    def adicionar_transacao(self, transacao):
+        self._transacoes.append(
+            {
+                "tipo": transacao.__class__.__name__,
+                "valor": transacao.valor,
+                "data": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
+            }
+        )
+
+
+def medir(fabrica, transacoes):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    historico = fabrica()
+    for transacao in transacoes:
+        historico.adicionar_transacao(transacao)
+    segundos = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return segundos, memoria
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entradas", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--sem-lista", action="store_true", help="não mede a implementação original")
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    # Os mesmos objetos são reutilizados: mede-se apenas o custo do armazenamento
+    amostra = [poo.Deposito(150.75), poo.Saque(42.10)]
+
+    print(f"{'entradas':>12} {'implementação':>14} {'tempo (s)':>10} {'MiB':>9} {'bytes/entrada':>14}")
+    for quantidade in args.entradas:
+        transacoes = [amostra[i % 2] for i in range(quantidade)]
+        implementacoes = [("colunar", poo.Historico)]
+        if not args.sem_lista:
+            implementacoes.append(("lista", HistoricoLista))
+        for nome, fabrica in implementacoes:
+            segundos, memoria = medir(fabrica, transacoes)
+            print(f"{quantidade:>12,} {nome:>14} {segundos:>10.2f} {memoria / 2**20:>9.1f} "
+                  f"{memoria / quantidade:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""HistoricoMapeado: vazão de acréscimos, leituras aleatórias de intervalos e memória residente.
+
+    python -m benchmarks.historico_mapeado --transacoes 50000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from ._carregar import carregar
+from .carga import memoria_residente_mib
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transacoes", type=int, default=5_000_000)
+    parser.add_argument("--leituras", type=int, default=10_000)
+    parser.add_argument("--tamanho-intervalo", type=int, default=50)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "conta.hist")
+        historico = poo.HistoricoMapeado(caminho)
+        rss_inicial = memoria_residente_mib()
+
+        inicio = time.perf_counter()
+        agora = time.time()
+        for indice in range(args.transacoes):
+            historico.restaurar(indice & 1, 1000 + indice % 977, agora + indice)
+        historico.sincronizar()
+        segundos = time.perf_counter() - inicio
+        print(f"acréscimos:  {args.transacoes / segundos:>12,.0f} registros/s "
+              f"({os.path.getsize(caminho) / 2**20:,.0f} MiB em disco)")
+        historico.fechar()
+
+        # Reabre o arquivo: nada é carregado até a primeira leitura
+        historico = poo.HistoricoMapeado(caminho)
+        aleatorio = random.Random(42)
+        inicios = [aleatorio.randrange(0, args.transacoes - args.tamanho_intervalo) for _ in range(args.leituras)]
+        inicio = time.perf_counter()
+        for posicao in inicios:
+            for _ in historico.linhas(posicao, posicao + args.tamanho_intervalo):
+                pass
+        segundos = time.perf_counter() - inicio
+        print(f"intervalos:  {segundos / args.leituras * 1e6:>12,.1f} µs por página de {args.tamanho_intervalo} linhas")
+        print(f"RSS:         {memoria_residente_mib() - rss_inicial:>12,.1f} MiB acima do início")
+        historico.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Cache de idempotência com milhões de chaves: vazão de faltas e acertos, memória e descartes.
+
+    python -m benchmarks.idempotencia --chaves 2000000 --capacidade 1000000
+"""
+import argparse
+import time
+
+from ._carregar import carregar
+from .carga import memoria_maxima_mib
+from .concorrencia import preparar
+
+
+def medir_cache(poo, chaves, capacidade):
+    cache = poo.CacheIdempotencia(capacidade=capacidade)
+    resultado = poo.Resultado.DEPOSITO_REALIZADO
+    aplicar = lambda: resultado # noqa: E731
+    memoria_antes = memoria_maxima_mib()
+
+    inicio = time.perf_counter()
+    for indice in range(chaves):
+        cache.executar(("0001", indice % 10_000, f"pedido-{indice}"), aplicar)
+    faltas = time.perf_counter() - inicio
+
+    # Repete as chaves mais recentes (ainda no cache): todas devem ser acertos
+    repetidas = range(chaves - min(chaves, capacidade), chaves)
+    inicio = time.perf_counter()
+    for indice in repetidas:
+        cache.executar(("0001", indice % 10_000, f"pedido-{indice}"), aplicar)
+    acertos = time.perf_counter() - inicio
+
+    estatisticas = cache.estatisticas()
+    assert estatisticas["acertos"] == len(repetidas)
+    print(f"{'faltas (novas chaves)':<28}{chaves / faltas:>14,.0f} op/s")
+    print(f"{'acertos (repetições)':<28}{len(repetidas) / acertos:>14,.0f} op/s")
+    print(f"{'entradas no cache':<28}{estatisticas['entradas']:>14,}")
+    print(f"{'descartes (LRU)':<28}{estatisticas['descartes']:>14,}")
+    print(f"{'memória estimada':<28}{estatisticas['bytes_estimados'] / 2**20:>14,.0f} MiB")
+    print(f"{'pico de RSS (acréscimo)':<28}{memoria_maxima_mib() - memoria_antes:>14,.0f} MiB")
+
+
+def medir_transacoes(poo, operacoes):
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        registro = preparar(poo, 1_000, 0.0)
+        contas = list(registro.contas)
+        for nome, chave in (("depósitos sem chave", None), ("depósitos com chave", "pedido-{}")):
+            poo.IDEMPOTENCIA.limpar()
+            inicio = time.perf_counter()
+            for indice in range(operacoes):
+                conta = contas[indice % len(contas)]
+                conta.cliente.realizar_transacao(conta, poo.Deposito(1.0, chave and chave.format(indice)))
+            print(f"{nome:<28}{operacoes / (time.perf_counter() - inicio):>14,.0f} op/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=2_000_000)
+    parser.add_argument("--capacidade", type=int, default=1_000_000)
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    medir_cache(poo, args.chaves, args.capacidade)
+    medir_transacoes(poo, args.operacoes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Vazão da importação de clientes (importar_clientes) e da validação de CPFs em bloco.
+
+    python -m benchmarks.importacao --linhas 1000000
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from ._carregar import carregar
+
+
+def gerar_cpf(aleatorio):
+    digitos = [aleatorio.randrange(10) for _ in range(9)]
+    for posicao in (9, 10):
+        soma = sum(digito * peso for digito, peso in zip(digitos, range(posicao + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    return "".join(map(str, digitos))
+
+
+def gerar_arquivo(caminho, linhas, invalidos=0.05, repetidos=0.05, semente=42):
+    aleatorio = random.Random(semente)
+    gerados = []
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["cpf", "nome", "data_nascimento", "endereco"])
+        for numero in range(linhas):
+            sorteio = aleatorio.random()
+            if sorteio < repetidos and gerados:
+                cpf = aleatorio.choice(gerados)
+            elif sorteio < repetidos + invalidos:
+                cpf = f"{aleatorio.randrange(10**10, 10**11):011d}"
+            else:
+                cpf = gerar_cpf(aleatorio)
+                gerados.append(cpf)
+            escritor.writerow([cpf, f"Cliente {numero}", "01-01-1990", f"Rua {numero}, 1 - Centro - Cidade/UF"])
+    return gerados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--tamanho-lote", type=int, default=50_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "clientes.csv")
+        gerados = gerar_arquivo(entrada, args.linhas)
+
+        amostra = gerados[:200_000]
+        for nome, validar in (("em bloco", poo.validar_cpfs), ("um a um", lambda cpfs: list(map(poo.cpf_valido, cpfs)))):
+            inicio = time.perf_counter()
+            validos = validar(amostra)
+            segundos = time.perf_counter() - inicio
+            assert all(validos)
+            print(f"validação {nome:<10}{len(amostra) / segundos:>14,.0f} CPFs/s")
+
+        registro = poo.Registro()
+        relatorio = poo.importar_clientes(registro, entrada, os.path.join(pasta, "rejeitados.csv"),
+                                          args.tamanho_lote)
+
+    assert len(registro.clientes) == relatorio["importados"]
+    poo.exibir_relatorio_importacao(relatorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Inicialização a partir do snapshot binário: tempo até a primeira operação e memória residente.
+
+Os históricos ficam no arquivo até o primeiro acesso; "completo" lê todos logo após abrir
+(o custo que a carga antiga, com tudo em memória, tinha na inicialização).
+
+    python -m benchmarks.inicializacao --contas 10000000 --transacoes-por-conta 20
+"""
+import argparse
+import multiprocessing
+import random
+import tempfile
+import time
+from array import array
+
+from ._carregar import carregar
+from .carga import criar_contas, memoria_residente_mib
+
+
+def gerar_estado(poo, diretorio, contas, transacoes_por_conta):
+    persistencia = poo.Persistencia(diretorio, registros_por_snapshot=float("inf"))
+    registro = persistencia.carregar()
+    registro.persistencia = None # o estado vai direto para o snapshot, sem passar pelo diário
+
+    agora = time.time()
+    tipos = array("B", [0] * transacoes_por_conta)
+    valores = array("q", [2_500] * transacoes_por_conta)
+    datas = array("d", [agora - transacoes_por_conta + indice for indice in range(transacoes_por_conta)])
+    for conta in criar_contas(poo, contas, registro, nome="Cliente {numero}"):
+        conta.historico._tipos.extend(tipos)
+        conta.historico._valores.extend(valores)
+        conta.historico._datas.extend(datas)
+        conta._saldo = transacoes_por_conta * 25.0
+
+    registro.persistencia = persistencia
+    inicio = time.perf_counter()
+    persistencia.snapshot()
+    segundos = time.perf_counter() - inicio
+    persistencia.fechar(snapshot=False)
+    return segundos
+
+
+def iniciar(diretorio, completo, saida):
+    # Processo novo (spawn): a memória medida é só a do estado carregado
+    poo = carregar("poo")
+    memoria_inicial = memoria_residente_mib()
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        inicio = time.perf_counter()
+        registro = poo.Persistencia(diretorio).carregar()
+        if completo:
+            for conta in registro.contas:
+                conta.historico
+        pronto = time.perf_counter() - inicio
+
+        conta = registro.buscar_conta(random.Random(42).randint(1, len(registro.contas)))
+        inicio = time.perf_counter()
+        conta.cliente.realizar_transacao(conta, poo.Deposito(10.0))
+        primeira = time.perf_counter() - inicio
+        carregados = sum(conta.historico_carregado for conta in registro.contas)
+        registro.persistencia.fechar(snapshot=False)
+    saida.send((pronto, primeira, memoria_residente_mib() - memoria_inicial, carregados))
+    saida.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contas", type=int, default=10_000_000)
+    parser.add_argument("--transacoes-por-conta", type=int, default=20)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as diretorio:
+        segundos = gerar_estado(poo, diretorio, args.contas, args.transacoes_por_conta)
+        print(f"snapshot gravado em {segundos:.2f} s ({args.contas:,} contas)")
+        print(f"{'carga':<14}{'pronto (s)':>12}{'1ª operação (ms)':>18}{'RSS (MiB)':>11}{'históricos lidos':>18}")
+        for nome, completo in (("preguiçosa", False), ("completo", True)):
+            conexao, conexao_filho = contexto.Pipe(duplex=False)
+            processo = contexto.Process(target=iniciar, args=(diretorio, completo, conexao_filho))
+            processo.start()
+            pronto, primeira, memoria, carregados = conexao.recv()
+            processo.join()
+            print(f"{nome:<14}{pronto:>12.2f}{primeira * 1e3:>18.2f}{memoria:>11,.0f}{carregados:>18,}")
+
+
+if __name__ == "__main__":
+    main()
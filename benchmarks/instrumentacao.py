@@ -0,0 +1,45 @@
+"""Custo da instrumentação: mesmas operações com ela desativada, ativada e desativada de novo.
+
+    python -m benchmarks.instrumentacao --operacoes 200000
+"""
+import argparse
+import time
+
+from ._carregar import carregar
+from .concorrencia import gerar_operacoes, preparar
+
+
+def executar(operacoes):
+    inicio = time.perf_counter()
+    for cliente, conta, transacao in operacoes:
+        cliente.realizar_transacao(conta, transacao)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    parser.add_argument("--contas", type=int, default=1_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        registro = preparar(poo, args.contas, 1_000_000.0)
+        operacoes = gerar_operacoes(poo, list(registro.contas), args.operacoes)
+
+        desativada = executar(operacoes)
+        poo.INSTRUMENTACAO.ativar()
+        ativada = executar(operacoes)
+        poo.INSTRUMENTACAO.desativar()
+        depois = executar(operacoes)
+
+    print(f"{'cenário':<22}{'tempo (s)':>12}{'op/s':>14}")
+    for nome, tempo in (("desativada", desativada), ("ativada", ativada), ("desativada de novo", depois)):
+        print(f"{nome:<22}{tempo:>12.3f}{args.operacoes / tempo:>14,.0f}")
+    print(f"\nsobrecarga ativada: {(ativada / desativada - 1) * 100:+.1f}%")
+    resumo = poo.INSTRUMENTACAO.exportar_json()["operacoes"]["Cliente.realizar_transacao"]
+    print(f"realizar_transacao: p50 {resumo['p50_ms'] * 1000:.1f} µs, p99 {resumo['p99_ms'] * 1000:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
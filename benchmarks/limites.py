@@ -0,0 +1,55 @@
+"""Custo dos limites de saque (valor em 24h e velocidade) por operação, com milhões de contas.
+
+Os limites são verificados só na conta do saque: o custo não cresce com o número de contas.
+"janela + balde" liga os dois limites com tetos que nenhum saque atinge, para medir o caminho
+em que o saque é aceito (o de rejeição é mais curto).
+
+    python -m benchmarks.limites --contas 1000000 --saques 1000000
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from ._carregar import carregar
+from .carga import criar_contas
+
+
+def medir(poo, classe, contas, saques):
+    registro = criar_contas(poo, contas, classe=classe, limite_saques=1_000_000)
+    for conta in registro:
+        conta._saldo = 1_000_000.0
+
+    aleatorio = random.Random(42)
+    sorteadas = [aleatorio.choice(registro) for _ in range(saques)]
+    resultados = Counter()
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        inicio = time.perf_counter()
+        for conta in sorteadas:
+            resultados[conta.cliente.realizar_transacao(conta, poo.Saque(100.0)).value] += 1
+        segundos = time.perf_counter() - inicio
+    return saques / segundos, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=100_000)
+    parser.add_argument("--saques", type=int, default=500_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+
+    class SemLimites(poo.ContaCorrente):
+        POLITICA_LIMITES = poo.PoliticaLimites(saques_por_dia=None)
+
+    class JanelaEBalde(poo.ContaCorrente):
+        POLITICA_LIMITES = poo.PoliticaLimites(saques_por_dia=None, valor_por_24h=10**12, saques_por_minuto=10**6)
+
+    print(f"{'política':<16}{'saques/s':>12}  resultados")
+    for nome, classe in (("sem limites", SemLimites), ("janela + balde", JanelaEBalde), ("padrão", poo.ContaCorrente)):
+        vazao, resultados = medir(poo, classe, args.contas, args.saques)
+        print(f"{nome:<16}{vazao:>12,.0f}  {dict(resultados)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Custo por página da listagem de contas: primeira página e página perto do fim.
+
+No POO o cursor é retomado por posição (ordem de inclusão) ou por busca binária no índice
+ordenado; no desafio2 a listagem é um gerador que continua de onde parou.
+
+    python -m benchmarks.listagem --contas 1000000
+"""
+import argparse
+import time
+
+from ._carregar import carregar
+from .carga import popular
+
+
+def medir_poo(poo, registro, ordem, tamanho_pagina):
+    inicio = time.perf_counter()
+    _, cursor = registro.pagina_contas(None, tamanho_pagina, ordem=ordem)
+    primeira = time.perf_counter() - inicio
+
+    # Cursor da penúltima página, montado como o serviço o receberia
+    contas = list(registro.contas)
+    if ordem is None:
+        cursor = len(contas) - 2 * tamanho_pagina
+    else:
+        cursor = sorted(map(poo.ORDENS_CONTAS[ordem], contas))[-2 * tamanho_pagina]
+    inicio = time.perf_counter()
+    registro.pagina_contas(cursor, tamanho_pagina, ordem=ordem)
+    return primeira, time.perf_counter() - inicio
+
+
+def medir_desafio2(desafio2, contas, ordem, tamanho_pagina):
+    inicio = time.perf_counter()
+    paginas = desafio2.paginas_contas(contas, tamanho_pagina, ordem=ordem)
+    next(paginas)
+    primeira = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    restantes = sum(1 for _ in paginas)
+    return primeira, (time.perf_counter() - inicio) / max(restantes, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=1_000_000)
+    parser.add_argument("--tamanho-pagina", type=int, default=50)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    registro = popular(poo, args.contas)
+    for numero, conta in enumerate(registro.contas):
+        conta._saldo = float(numero * 7919 % 10_000)
+
+    desafio2 = carregar("desafio2")
+    usuario = {"nome": "Cliente", "cpf": "00000000001"}
+    contas = {}
+    for numero in range(1, args.contas + 1):
+        conta = contas[(desafio2.AGENCIA, numero)] = desafio2.nova_conta(desafio2.AGENCIA, numero, usuario)
+        conta["saldo"] = float(numero * 7919 % 10_000)
+
+    print(f"{args.contas:,} contas, páginas de {args.tamanho_pagina}")
+    print(f"{'implementação':<15}{'ordem':<10}{'1ª página (ms)':>16}{'página seguinte (ms)':>22}")
+    for ordem in (None, "agencia", "titular", "saldo"):
+        primeira, seguinte = medir_poo(poo, registro, ordem, args.tamanho_pagina)
+        print(f"{'poo':<15}{ordem or 'inclusão':<10}{primeira * 1e3:>16.3f}{seguinte * 1e3:>22.3f}")
+    for ordem in (None, "agencia", "saldo"):
+        primeira, seguinte = medir_desafio2(desafio2, contas, ordem, args.tamanho_pagina)
+        print(f"{'desafio2':<15}{ordem or 'inclusão':<10}{primeira * 1e3:>16.3f}{seguinte * 1e3:>22.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Vazão do processamento em lote (processar_lote) sobre um arquivo sintético de operações.
+
+    python -m benchmarks.lote --clientes 10000 --operacoes 1000000 --formato jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+
+from ._carregar import carregar
+from .carga import popular
+
+
+def gerar_arquivo(caminho, formato, clientes, operacoes, semente=42):
+    aleatorio = random.Random(semente)
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo) if formato == "csv" else None
+        if escritor:
+            escritor.writerow(["cpf", "conta", "tipo", "valor"])
+        for _ in range(operacoes):
+            numero = aleatorio.randint(1, clientes)
+            # Dois depósitos para cada saque, para que a maioria dos saques tenha saldo
+            tipo = "s" if aleatorio.random() < 1 / 3 else "d"
+            valor = round(aleatorio.uniform(1, 400), 2)
+            if escritor:
+                escritor.writerow([f"{numero:011d}", numero, tipo, valor])
+            else:
+                arquivo.write(json.dumps({"cpf": f"{numero:011d}", "conta": numero,
+                                          "tipo": tipo, "valor": valor}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--operacoes", type=int, default=1_000_000)
+    parser.add_argument("--formato", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--tamanho-lote", type=int, default=10_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    registro = popular(poo, args.clientes)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, f"operacoes.{args.formato}")
+        saida = os.path.join(pasta, "resultados.csv")
+        gerar_arquivo(entrada, args.formato, args.clientes, args.operacoes)
+        relatorio = poo.processar_lote(registro, entrada, saida, args.tamanho_lote)
+
+    poo.exibir_relatorio_lote(relatorio)
+
+
+if __name__ == "__main__":
+    main()
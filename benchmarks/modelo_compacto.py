@@ -0,0 +1,62 @@
+"""Modelo compacto (__slots__) contra o modelo com __dict__: memória por conta e acesso a atributos.
+
+O mesmo script é carregado duas vezes, com BANCO_MODELO_COMPACTO=1 e =0.
+
+    python -m benchmarks.modelo_compacto --contas 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+from ._carregar import carregar
+from .carga import popular
+
+VARIANTES = {"com __dict__": "0", "__slots__": "1"}
+
+
+def memoria_por_conta(poo, contas):
+    tracemalloc.start()
+    registro = popular(poo, contas)
+    atual = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del registro
+    return atual / contas
+
+
+def memoria_por_transacao(poo, quantidade):
+    # Objetos Saque/Deposito vivos ao mesmo tempo (lotes e filas de operações os mantêm em listas)
+    tracemalloc.start()
+    transacoes = [poo.Deposito(float(indice), f"pedido-{indice}") for indice in range(quantidade)]
+    atual = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del transacoes
+    return atual / quantidade
+
+
+def acesso_atributos(poo, leituras):
+    # Seis leituras por conta pelas properties públicas, como fazem extrato, relatórios e listagens
+    registro = popular(poo, 1_000)
+    contas = list(registro.contas) * (leituras // 1_000)
+    inicio = time.perf_counter()
+    for conta in contas:
+        conta.saldo, conta.numero, conta.agencia, conta.limite, conta.historico, conta.cliente.nome
+    return (time.perf_counter() - inicio) / len(contas) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=200_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--leituras", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    print(f"{'modelo':<16}{'bytes/conta':>14}{'bytes/transação':>18}{'ns/conta':>12}")
+    for nome, valor in VARIANTES.items():
+        poo = carregar("poo", f"compacto_{valor}", {"BANCO_MODELO_COMPACTO": valor})
+        assert poo.MODELO_COMPACTO == (valor == "1")
+        print(f"{nome:<16}{memoria_por_conta(poo, args.contas):>14,.0f}"
+              f"{memoria_por_transacao(poo, args.transacoes):>18,.0f}{acesso_atributos(poo, args.leituras):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Alocação de números de conta: vazão por thread e por processo, sem números repetidos.
+
+Os processos compartilham o mesmo arquivo de marca d'água (reserva de blocos sob flock).
+
+    python -m benchmarks.numeracao --numeros 1000000 --threads 4 --processos 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from ._carregar import carregar
+
+
+def alocar(caminho, quantidade, bloco, saida=None):
+    poo = carregar("poo")
+    alocador = poo.AlocadorNumeros(caminho, bloco)
+    numeros = [alocador.proximo() for _ in range(quantidade)]
+    if saida is not None:
+        saida.send(numeros)
+        saida.close()
+    return numeros
+
+
+def conferir(numeros, esperados):
+    if len(numeros) != esperados or len(set(numeros)) != esperados:
+        raise AssertionError(f"{esperados - len(set(numeros))} número(s) repetido(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--numeros", type=int, default=1_000_000)
+    parser.add_argument("--bloco", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--processos", type=int, default=4)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    print(f"{'cenário':<32}{'números/s':>14}")
+    with tempfile.TemporaryDirectory() as pasta:
+        alocador = poo.AlocadorNumeros(os.path.join(pasta, "threads.json"), args.bloco)
+        numeros = []
+        por_thread = args.numeros // args.threads
+
+        def trabalhar():
+            numeros.extend([alocador.proximo() for _ in range(por_thread)])
+
+        threads = [threading.Thread(target=trabalhar) for _ in range(args.threads)]
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        segundos = time.perf_counter() - inicio
+        conferir(numeros, por_thread * args.threads)
+        print(f"{f'{args.threads} threads, um alocador':<32}{len(numeros) / segundos:>14,.0f}")
+
+        caminho = os.path.join(pasta, "processos.json")
+        por_processo = args.numeros // args.processos
+        contexto = multiprocessing.get_context()
+        conexoes, processos = [], []
+        inicio = time.perf_counter()
+        for _ in range(args.processos):
+            conexao, conexao_filho = contexto.Pipe(duplex=False)
+            processo = contexto.Process(target=alocar, args=(caminho, por_processo, args.bloco, conexao_filho))
+            processo.start()
+            conexoes.append(conexao)
+            processos.append(processo)
+        numeros = [numero for conexao in conexoes for numero in conexao.recv()]
+        for processo in processos:
+            processo.join()
+        segundos = time.perf_counter() - inicio
+        conferir(numeros, por_processo * args.processos)
+        print(f"{f'{args.processos} processos, um arquivo':<32}{len(numeros) / segundos:>14,.0f}")
+
+        # Reinício: um alocador novo sobre o mesmo arquivo começa acima de tudo o que foi entregue
+        reinicio = poo.AlocadorNumeros(caminho, args.bloco).proximo()
+        if reinicio <= max(numeros):
+            raise AssertionError("número reutilizado após reinício")
+        print(f"marca d'água após reinício: {reinicio - 1:,} (maior entregue: {max(numeros):,})")
+
+
+if __name__ == "__main__":
+    main()
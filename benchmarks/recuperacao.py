@@ -0,0 +1,117 @@
+"""Escrita no diário (commit em grupo), tempo de recuperação (snapshot + replay) e queda do processo.
+
+A verificação de queda encerra um processo com os._exit logo após as confirmações e
+confere que tudo o que foi confirmado volta na recuperação.
+
+    python -m benchmarks.recuperacao --transacoes 10000000 --contas 100000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from ._carregar import carregar
+from .carga import criar_contas
+
+
+def gerar_estado(poo, diretorio, contas, transacoes, registros_por_fsync):
+    persistencia = poo.Persistencia(diretorio, registros_por_fsync=registros_por_fsync,
+                                    registros_por_snapshot=float("inf"))
+    registro = persistencia.carregar()
+    todas = criar_contas(poo, contas, registro)
+
+    aleatorio = random.Random(42)
+    deposito = poo.Deposito(25.0)
+    inicio = time.perf_counter()
+    for _ in range(transacoes):
+        # Só o histórico é exercitado: o diário é alimentado pelo observador do Historico
+        aleatorio.choice(todas).historico.adicionar_transacao(deposito)
+    persistencia.sincronizar()
+    segundos = time.perf_counter() - inicio
+    persistencia.fechar(snapshot=False)
+    return segundos
+
+
+def derrubar(diretorio, depositos, sincronizar, saida):
+    # Processo novo (spawn): confirma as operações e morre sem fechar nada
+    poo = carregar("poo")
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        registro = poo.Persistencia(diretorio).carregar()
+        servico = poo.ServicoBancario(registro)
+        respostas = [
+            servico.executar({"op": "criar_cliente", "cpf": "12345678901", "nome": "Cliente",
+                              "data_nascimento": "01-01-1990", "endereco": "Rua A, 1"}),
+            servico.executar({"op": "criar_conta", "cpf": "12345678901"}),
+        ]
+        numero = respostas[-1]["conta"]
+        respostas += [servico.executar({"op": "deposito", "cpf": "12345678901", "conta": numero, "valor": 10.0})
+                      for _ in range(depositos)]
+        if sincronizar:
+            registro.persistencia.sincronizar() # o que o serviço faz antes de responder
+        else:
+            time.sleep(0.1) # sem confirmação explícita: vale o prazo do fsync em segundo plano
+    saida.send((numero, sum(resposta["ok"] for resposta in respostas)))
+    saida.close()
+    os._exit(1)
+
+
+def verificar_queda(poo, depositos=3):
+    contexto = multiprocessing.get_context("spawn")
+    for sincronizar in (True, False):
+        with tempfile.TemporaryDirectory() as diretorio:
+            conexao, conexao_filho = contexto.Pipe(duplex=False)
+            processo = contexto.Process(target=derrubar, args=(diretorio, depositos, sincronizar, conexao_filho))
+            processo.start()
+            numero, confirmadas = conexao.recv()
+            processo.join()
+
+            persistencia = poo.Persistencia(diretorio)
+            registro = persistencia.carregar()
+            conta = registro.buscar_conta(numero)
+            recuperadas = (registro.buscar_cliente("12345678901") is not None) + (conta is not None)
+            recuperadas += len(conta.historico) if conta else 0
+            persistencia.fechar(snapshot=False)
+            modo = "sincronizar()" if sincronizar else "prazo do fsync"
+            print(f"queda ({modo}): {recuperadas} de {confirmadas} operações confirmadas recuperadas")
+            assert recuperadas == confirmadas, "operação confirmada perdida na queda"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=10_000)
+    parser.add_argument("--transacoes", type=int, default=1_000_000)
+    parser.add_argument("--registros-por-fsync", type=int, default=256)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    with tempfile.TemporaryDirectory() as diretorio:
+        segundos = gerar_estado(poo, diretorio, args.contas, args.transacoes, args.registros_por_fsync)
+        tamanho = sum(os.path.getsize(os.path.join(diretorio, nome)) for nome in os.listdir(diretorio))
+        print(f"escrita:     {args.transacoes / segundos:>12,.0f} registros/s "
+              f"({args.registros_por_fsync} registros por fsync)")
+
+        inicio = time.perf_counter()
+        persistencia = poo.Persistencia(diretorio)
+        registro = persistencia.carregar()
+        replay = time.perf_counter() - inicio
+        print(f"replay:      {args.transacoes / replay:>12,.0f} registros/s "
+              f"({tamanho / 2**20 / replay:.1f} MiB/s, {replay:.2f} s)")
+
+        inicio = time.perf_counter()
+        persistencia.snapshot()
+        print(f"snapshot:    {time.perf_counter() - inicio:>12.2f} s")
+        persistencia.fechar(snapshot=False)
+
+        inicio = time.perf_counter()
+        registro = poo.Persistencia(diretorio).carregar()
+        print(f"do snapshot: {time.perf_counter() - inicio:>12.2f} s "
+              f"({len(registro.contas):,} contas)")
+        registro.persistencia.fechar(snapshot=False)
+
+    verificar_queda(poo)
+
+
+if __name__ == "__main__":
+    main()
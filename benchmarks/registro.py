@@ -0,0 +1,57 @@
+"""Custo de busca por CPF e por conta no Registro, de 1 mil a 10 milhões de clientes.
+
+    python -m benchmarks.registro --tamanhos 1000 100000 10000000
+"""
+import argparse
+import random
+import time
+
+from ._carregar import carregar
+from .carga import popular
+
+
+def filtrar_linear(cpf, clientes):
+    # Busca antiga (lista completa a cada chamada), usada como referência
+    clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf]
+    return clientes_filtrados[0] if clientes_filtrados else None
+
+
+def medir(funcao, argumentos):
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcao(argumento)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--consultas", type=int, default=100_000)
+    parser.add_argument("--limite-linear", type=int, default=10_000,
+                        help="maior tamanho em que a busca linear antiga também é medida")
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    aleatorio = random.Random(42)
+
+    print(f"{'clientes':>12} {'cpf (ns)':>10} {'conta (ns)':>11} {'linear (ns)':>13}")
+    for tamanho in args.tamanhos:
+        registro = popular(poo, tamanho)
+        cpfs = [f"{aleatorio.randint(1, tamanho):011d}" for _ in range(args.consultas)]
+        numeros = [aleatorio.randint(1, tamanho) for _ in range(args.consultas)]
+
+        ns_cpf = medir(lambda cpf: poo.filtrar_cliente(cpf, registro), cpfs)
+        ns_conta = medir(registro.buscar_conta, numeros)
+
+        linear = "-"
+        if tamanho <= args.limite_linear:
+            clientes = list(registro.clientes)
+            amostra = cpfs[:max(1, min(len(cpfs), 1_000_000 // tamanho))]
+            linear = f"{medir(lambda cpf: filtrar_linear(cpf, clientes), amostra):.0f}"
+
+        print(f"{tamanho:>12,} {ns_cpf:>10.0f} {ns_conta:>11.0f} {linear:>13}")
+        del registro
+
+
+if __name__ == "__main__":
+    main()
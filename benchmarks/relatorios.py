@@ -0,0 +1,99 @@
+"""Relatórios vetorizados (NumPy) contra um laço em Python puro sobre os mesmos objetos.
+
+    python -m benchmarks.relatorios --contas 1000000 --transacoes 50000000
+"""
+import argparse
+import heapq
+import time
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+
+from ._carregar import carregar
+from .carga import criar_contas
+
+
+def popular(poo, contas, transacoes, agencias=4, semente=42):
+    # As colunas do histórico são preenchidas em bloco: montar 50M transações uma a uma levaria horas
+    gerador = np.random.default_rng(semente)
+    por_conta = transacoes // contas
+    agora = time.time()
+    registro = poo.Registro()
+    for conta in criar_contas(poo, contas, registro, agencias=agencias):
+        tipos = gerador.integers(0, 2, por_conta, dtype=np.uint8)
+        valores = gerador.integers(100, 100_000, por_conta, dtype=np.int64)
+        datas = np.sort(agora - gerador.uniform(0, 30 * 86400, por_conta))
+        conta.historico._tipos.frombytes(tipos.tobytes())
+        conta.historico._valores.frombytes(valores.tobytes())
+        conta.historico._datas.frombytes(datas.tobytes())
+        conta._saldo = float(np.sum(np.where(tipos == 0, valores, -valores))) / 100
+    return registro
+
+
+def relatorio_python(poo, registro, top=10, faixas=None):
+    faixas = faixas or poo.FAIXAS_SALDO
+    deposito = poo.CODIGOS_TRANSACAO["Deposito"]
+    deslocamento = time.localtime().tm_gmtoff
+    por_agencia = defaultdict(int)
+    distribuicao = [0] * (len(faixas) - 1)
+    volume = defaultdict(lambda: [0, 0])
+    saldos = []
+
+    for conta in registro.contas:
+        saldo = round(conta.saldo * 100)
+        saldos.append((saldo, conta.agencia, conta.numero))
+        for faixa in range(len(faixas) - 1):
+            ultima = faixa == len(faixas) - 2
+            if faixas[faixa] <= saldo / 100 < faixas[faixa + 1] or (ultima and saldo / 100 == faixas[-1]):
+                distribuicao[faixa] += 1
+                break
+        for codigo, centavos, timestamp in conta.historico.registros():
+            if codigo == deposito:
+                por_agencia[conta.agencia] += centavos
+            dia = volume[int((timestamp + deslocamento) // 86400)]
+            dia[0] += centavos
+            dia[1] += 1
+
+    epoca = date(1970, 1, 1).toordinal()
+    return {
+        "depositos_por_agencia": {agencia: total / 100 for agencia, total in sorted(por_agencia.items())},
+        "distribuicao_saldos": [(faixas[i], faixas[i + 1], quantidade) for i, quantidade in enumerate(distribuicao)],
+        "top_contas": [(agencia, numero, saldo / 100) for saldo, agencia, numero in heapq.nlargest(top, saldos)],
+        "volume_diario": [(date.fromordinal(epoca + dia), total / 100, quantidade)
+                          for dia, (total, quantidade) in sorted(volume.items())],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=100_000)
+    parser.add_argument("--transacoes", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    registro = popular(poo, args.contas, args.transacoes)
+
+    inicio = time.perf_counter()
+    dados = poo.exportar_arrays(registro)
+    exportacao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    vetorizado = poo.relatorio_bancario(dados)
+    calculo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    referencia = relatorio_python(poo, registro)
+    laco = time.perf_counter() - inicio
+
+    iguais = (vetorizado["depositos_por_agencia"] == referencia["depositos_por_agencia"]
+              and vetorizado["distribuicao_saldos"] == referencia["distribuicao_saldos"]
+              and [c[2] for c in vetorizado["top_contas"]] == [c[2] for c in referencia["top_contas"]]
+              and vetorizado["volume_diario"] == referencia["volume_diario"])
+    print(f"exportação:   {exportacao:8.2f} s")
+    print(f"vetorizado:   {calculo:8.2f} s")
+    print(f"Python puro:  {laco:8.2f} s ({laco / (exportacao + calculo):.1f}x)")
+    print(f"resultados iguais: {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Modo roteiro (comandos de texto, sem menu) das três implementações: sessões de 1 milhão de comandos.
+
+Para comparação, o mesmo tipo de sessão também é repetida pelo menu interativo do modelo POO
+(respostas do input() enfileiradas), em uma amostra menor.
+
+    python -m benchmarks.roteiro --clientes 10000 --comandos 1000000
+"""
+import argparse
+import io
+import os
+import random
+import shlex
+import tempfile
+import time
+
+from ._carregar import carregar
+from .drivers import silenciado
+
+
+def gerar_sessao(clientes, comandos, semente=42, cpf_conta=True):
+    # Cadastro (nu + nc) e depois depósitos, saques e extratos sorteados; uma conta por cliente
+    aleatorio = random.Random(semente)
+    linhas = []
+    for numero in range(1, clientes + 1):
+        cpf = f"{numero:011d}"
+        linhas.append(f'nu {cpf} "Cliente {numero}" 01-01-1990 "Rua A, {numero}"\n')
+        linhas.append(f"nc {cpf}\n")
+    for _ in range(comandos):
+        numero = aleatorio.randint(1, clientes)
+        conta = f"{numero:011d} {numero} " if cpf_conta else ""
+        sorteio = aleatorio.random()
+        if sorteio < 0.6:
+            linhas.append(f"d {conta}{aleatorio.randint(1, 1000)}\n")
+        elif sorteio < 0.9:
+            linhas.append(f"s {conta}{aleatorio.randint(1, 500)}\n")
+        else:
+            linhas.append(f"e {conta}".rstrip() + "\n")
+    return linhas
+
+
+def medir(executar, linhas):
+    with open(os.devnull, "w") as saida:
+        inicio = time.perf_counter()
+        executados = executar(linhas, saida)
+        return executados / (time.perf_counter() - inicio)
+
+
+def menu_poo(poo, diretorio, linhas):
+    # A mesma sessão pelo main() interativo: cada comando vira a opção do menu + as respostas dos prompts
+    # (os extratos da amostra cabem em uma página, então não há prompt de paginação)
+    entrada_menu = []
+    for linha in linhas:
+        comando, argumentos = linha.split(None, 1)
+        entrada_menu += [comando, *shlex.split(argumentos)]
+    poo.DIRETORIO_DADOS = diretorio
+    with silenciado(poo) as entrada:
+        entrada.responder(*entrada_menu)
+        inicio = time.perf_counter()
+        poo.main()
+        segundos = time.perf_counter() - inicio
+    if entrada.respostas:
+        raise AssertionError("o menu encerrou antes do fim da sessão")
+    return len(linhas) / segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clientes", type=int, default=10_000)
+    parser.add_argument("--comandos", type=int, default=1_000_000)
+    parser.add_argument("--amostra-menu", type=int, default=50_000, help="comandos repetidos pelo menu interativo")
+    args = parser.parse_args()
+
+    desafio, desafio2, poo = carregar("desafio"), carregar("desafio2"), carregar("poo")
+    sessao = gerar_sessao(args.clientes, args.comandos)
+    print(f"{'implementação':<28}{'comandos/s':>14}{'1M comandos (s)':>18}")
+
+    def linha(nome, vazao):
+        print(f"{nome:<28}{vazao:>14,.0f}{1_000_000 / vazao:>18.1f}")
+
+    linha("desafio (roteiro)", medir(desafio.executar_roteiro, gerar_sessao(1, args.comandos, cpf_conta=False)[2:]))
+    linha("desafio2 (roteiro)", medir(desafio2.executar_roteiro, sessao))
+    linha("poo (roteiro, memória)", medir(lambda linhas, saida: poo.executar_roteiro(poo.Registro(), linhas, saida),
+                                          sessao))
+    with tempfile.TemporaryDirectory() as diretorio:
+        persistencia = poo.Persistencia(diretorio)
+        registro = persistencia.carregar()
+        linha("poo (roteiro, diário)", medir(
+            lambda linhas, saida: poo.executar_roteiro(registro, linhas, saida, persistencia), sessao))
+        persistencia.fechar(snapshot=False)
+
+    amostra = gerar_sessao(min(args.clientes, args.amostra_menu // 10), args.amostra_menu, semente=7)
+    with tempfile.TemporaryDirectory() as diretorio:
+        linha("poo (menu interativo)", menu_poo(poo, diretorio, amostra))
+
+    # Conferência: a saída do roteiro é TSV com uma linha por comando executado
+    saida = io.StringIO()
+    executados = poo.executar_roteiro(poo.Registro(), sessao[:1000], saida)
+    assert len(saida.getvalue().splitlines()) == executados + 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Vazão do RoteadorShards com 1, 2, 4 e 8 processos trabalhadores.
+
+A escala depende dos núcleos disponíveis (os.cpu_count() é exibido no início).
+
+    python -m benchmarks.shards --contas 100000 --operacoes 2000000 --shards 1 2 4 8
+"""
+import argparse
+import os
+import random
+import time
+
+from ._carregar import carregar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=10_000)
+    parser.add_argument("--operacoes", type=int, default=1_000_000)
+    parser.add_argument("--tamanho-lote", type=int, default=50_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    aleatorio = random.Random(42)
+    operacoes = []
+    for _ in range(args.operacoes):
+        numero = aleatorio.randint(1, args.contas)
+        tipo = "s" if aleatorio.random() < 1 / 3 else "d"
+        operacoes.append((f"{numero:011d}", numero, tipo, 10.0))
+
+    print(f"núcleos: {os.cpu_count()}")
+    print(f"{'shards':>7} {'op/s':>12} {'contas listadas':>16}")
+    for shards in args.shards:
+        roteador = poo.RoteadorShards(shards)
+        try:
+            for numero in range(1, args.contas + 1):
+                roteador.abrir_conta(numero, f"{numero:011d}", "Cliente", "01-01-1990", "Rua A, 1")
+
+            inicio = time.perf_counter()
+            for posicao in range(0, len(operacoes), args.tamanho_lote):
+                roteador.executar(operacoes[posicao:posicao + args.tamanho_lote])
+            segundos = time.perf_counter() - inicio
+
+            listadas = len(roteador.listar_contas())
+        finally:
+            roteador.fechar()
+        print(f"{shards:>7} {args.operacoes / segundos:>12,.0f} {listadas:>16,}")
+
+
+if __name__ == "__main__":
+    main()
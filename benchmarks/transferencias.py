@@ -0,0 +1,62 @@
+"""Transferências uma a uma (Transferencia) contra a liquidação por saldo líquido.
+
+    python -m benchmarks.transferencias --contas 10000 --transferencias 500000
+"""
+import argparse
+import random
+import time
+
+from ._carregar import carregar
+from .carga import popular
+
+
+def preparar(poo, quantidade_contas, deposito_inicial=1_000.0):
+    registro = popular(poo, quantidade_contas)
+    for conta in registro.contas:
+        conta.cliente.realizar_transacao(conta, poo.Deposito(deposito_inicial))
+    return registro
+
+
+def gerar_transferencias(contas, quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    transferencias = []
+    for _ in range(quantidade):
+        origem, destino = aleatorio.sample(contas, 2)
+        transferencias.append({"cpf": origem.cliente.cpf, "conta": origem.numero,
+                               "destino": destino.numero, "valor": aleatorio.randint(1, 100)})
+    return transferencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contas", type=int, default=10_000)
+    parser.add_argument("--transferencias", type=int, default=500_000)
+    args = parser.parse_args()
+
+    poo = carregar("poo")
+    print(f"{'modo':<22}{'transf/s':>14}{'aceitas':>12}{'lançamentos':>14}")
+    with poo.usando_notificador(poo.NotificadorNulo()):
+        for modo in ("uma a uma", "saldo líquido"):
+            registro = preparar(poo, args.contas)
+            contas = list(registro.contas)
+            transferencias = gerar_transferencias(contas, args.transferencias)
+            total_antes = sum(conta.saldo for conta in contas)
+            lancamentos_antes = sum(len(conta.historico) for conta in contas)
+
+            inicio = time.perf_counter()
+            if modo == "uma a uma":
+                resultados = [poo.aplicar_operacao(registro, {**transferencia, "tipo": "t"})
+                              for transferencia in transferencias]
+            else:
+                resultados = poo.liquidar_transferencias(registro, transferencias)
+            segundos = time.perf_counter() - inicio
+
+            if abs(sum(conta.saldo for conta in contas) - total_antes) > 1e-3:
+                raise AssertionError(f"{modo}: o total de saldos mudou")
+            aceitas = sum(status == "ok" for status, _ in resultados)
+            lancamentos = sum(len(conta.historico) for conta in contas) - lancamentos_antes
+            print(f"{modo:<22}{args.transferencias / segundos:>14,.0f}{aceitas:>12,}{lancamentos:>14,}")
+
+
+if __name__ == "__main__":
+    main()